@@ -1,9 +1,20 @@
-from django.db.models import Count
-from projects.models import Project
-from sitemanage.models import Activity, SiteVisitor
-
+from collections import defaultdict
 
-def build_dashboard_context(user):
+from common.cache import get_project_versions
+from projects.models import Project
+from projects.stats import STATUS_FIELDS, get_project_stats
+from sitemanage.asof import activities_as_of, stats_as_of
+from sitemanage.models import Activity
+from sitemanage.scurve import compute_s_curve, get_s_curve
+from finance.evm import evm_summary, latest_evm_periods
+
+
+def build_dashboard_context(user, as_of=None):
+    """
+    Dashboard numbers for the user's projects. With `as_of` (a past date)
+    activity counts, statuses and S-curves are rebuilt as of that day
+    (sitemanage.asof) instead of read from the live rollup.
+    """
     is_super = user.is_superuser
 
     # Projects
@@ -11,30 +22,32 @@ def build_dashboard_context(user):
     if not is_super:
         projects = projects.filter(participants__user=user).distinct()
 
-    # Activities
-    activities = Activity.objects.filter(is_active=True)
-    if not is_super:
-        activities = activities.filter(project__participants__user=user).distinct()
-
-    # Visitors
-    visitors = SiteVisitor.objects.filter(is_active=True)
-    if not is_super:
-        visitors = visitors.filter(project__participants__user=user).distinct()
-
-    # Aggregate activity counts per status
-    activity_stats = activities.values("status").annotate(count=Count("id"))
-
-    # Calculate totals including Pending
-    total_activities = activities.count()
-    completed_all = activities.filter(status="Completed").count()
-    in_progress_all = activities.filter(status="In Progress").count()
-    delayed_all = activities.filter(status="Delayed").count()
-    pending_all = total_activities - (completed_all + in_progress_all + delayed_all)
-
-    # Create status_counts dict
-    status_counts = {a["status"]: a["count"] for a in activity_stats}
-    if pending_all > 0:
-        status_counts["Pending"] = pending_all
+    # Per-project numbers come from the ProjectStats rollup
+    projects = list(projects)
+    stats = get_project_stats([project.id for project in projects])
+    activity_stats = stats_as_of([project.id for project in projects], as_of) if as_of else stats
+    evm_periods = latest_evm_periods([project.id for project in projects])
+
+    activities_by_project = defaultdict(list)
+    activities = Activity.objects.filter(project__in=projects, is_active=True).leaves()
+    if as_of:
+        for activity in activities_as_of(activities, as_of):
+            activities_by_project[activity.project_id].append(
+                {"id": activity.id, "name": activity.name, "status": activity.status}
+            )
+    else:
+        for activity in activities.values("id", "name", "status", "project_id"):
+            activities_by_project[activity.pop("project_id")].append(activity)
+
+    # Activity counts per status over all projects
+    status_counts = {}
+    for status, field in STATUS_FIELDS.items():
+        count = sum(getattr(activity_stats[project.id], field) for project in projects)
+        if count > 0:
+            status_counts[status] = count
+
+    total_activities = sum(activity_stats[project.id].activities_total for project in projects)
+    completed_all = status_counts.get(Activity.STATUS_COMPLETED, 0)
 
     activity_labels = list(status_counts.keys())
     activity_counts = list(status_counts.values())
@@ -45,15 +58,14 @@ def build_dashboard_context(user):
     # Projects Overview
     projects_overview = []
     for project in projects:
-        project_activities = activities.filter(project=project)
-        total = project_activities.count()
+        project_stats = activity_stats[project.id]
+        total = project_stats.activities_total
+        completed = project_stats.activities_completed
+        in_progress = project_stats.activities_in_progress
+        delayed = project_stats.activities_delayed
+        pending = project_stats.activities_pending
 
-        completed = project_activities.filter(status="Completed").count()
-        in_progress = project_activities.filter(status="In Progress").count()
-        delayed = project_activities.filter(status="Delayed").count()
-        pending = total - (completed + in_progress + delayed)
-
-        completion_rate = round((completed / total) * 100, 1) if total else 0
+        completion_rate = project_stats.percent_of_activities(completed)
 
         projects_overview.append({
             "id": project.id,
@@ -68,20 +80,33 @@ def build_dashboard_context(user):
             "completion_rate": completion_rate,
 
             "completed_pct": completion_rate,
-            "in_progress_pct": round((in_progress / total) * 100, 1) if total else 0,
-            "delayed_pct": round((delayed / total) * 100, 1) if total else 0,
-            "pending_pct": round((pending / total) * 100, 1) if total else 0,
+            "in_progress_pct": project_stats.percent_of_activities(in_progress),
+            "delayed_pct": project_stats.percent_of_activities(delayed),
+            "pending_pct": project_stats.percent_of_activities(pending),
+
+            "activities": activities_by_project[project.id],
 
-            "activities": list(project_activities.values("id", "name", "status")),
+            "evm": evm_summary(project, evm_periods.get(project.id)),
         })
 
     # Auto-sort projects: most delayed first, then lowest completion
     projects_overview.sort(key=lambda p: (-p["delayed"], p["completion_rate"]))
 
+    # Planned vs actual S-curves (cached per project data version; past dates are not cached)
+    versions = {} if as_of else get_project_versions([project.id for project in projects])
+    progress_curves = [
+        {
+            "id": p["id"], "name": p["name"],
+            **(compute_s_curve(p["id"], today=as_of) if as_of else get_s_curve(p["id"], version=versions[p["id"]])),
+        }
+        for p in projects_overview
+    ]
+
     return {
-        "total_projects": projects.count(),
+        "as_of": as_of,
+        "total_projects": len(projects),
         "total_activities": total_activities,
-        "total_visitors": visitors.count(),
+        "total_visitors": sum(stats[project.id].visitors_count for project in projects),
         "completion_rate": round((completed_all / total_activities) * 100, 1) if total_activities else 0,
 
         "activity_labels": activity_labels,
@@ -89,6 +114,7 @@ def build_dashboard_context(user):
         "activity_data": activity_data,  # for chart legend
 
         "projects_overview": projects_overview,
+        "progress_curves": progress_curves,
 
         "reports_children": {
             "project": is_super or user.has_perm("reports.view_projectreport"),
@@ -5,6 +5,7 @@ from django.contrib.auth.decorators import login_required
 from django.db.models import Count
 from accounts import models
 from accounts.utils.dashboard import build_dashboard_context
+from sitemanage.asof import parse_as_of
 from projects.models import Project
 from sitemanage.models import Activity, SiteVisitor
 from .forms import LoginForm
@@ -35,7 +36,7 @@ def dashboard(request):
     Dashboard view with permission check.
     Only users with 'access_dashboard' can view.
     """
-    context = build_dashboard_context(request.user)
+    context = build_dashboard_context(request.user, parse_as_of(request.GET.get("as_of")))
     return render(request, "accounts/dashboard/dashboard.html", context)
 
 
@@ -0,0 +1,108 @@
+"""
+Incremental finance export for external consumers (e.g. the accounting system).
+
+Payment certificates and fund transactions created, updated or soft-deleted
+since a consumer's stored cursor are exported as JSON lines or CSV, one row
+per change:
+
+- `operation` is "upsert" (with the row's API fields) or "delete" (a
+  soft-deleted row: id, project and updated_at only);
+- rows of each feed come in (updated_at, id) order, as in the site sync
+  (api.sync), with the same safety lag for still-open transactions.
+
+A cursor belongs to the whole feed, not to a user: every export covers all
+projects, soft-deleted ones included, so their rows still reach the consumer
+(as deletes). Reading never moves the stored cursor. The consumer acknowledges an export
+once it has been processed (POST /api/finance-export/, or automatically at
+the end of `manage.py export_finance_changes`), so a failed import is simply
+exported again.
+"""
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from finance.models import ExportCursor, FundTransaction, PaymentCertificate
+
+from .serializers import FundTransactionSerializer, PaymentCertificateSerializer
+from .sync import SAFETY_LAG, changed_rows, decode_cursor
+
+FEEDS = {
+    "payment_certificates": (PaymentCertificate, PaymentCertificateSerializer),
+    "fund_transactions": (FundTransaction, FundTransactionSerializer),
+}
+
+FORMATS = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+DEFAULT_LIMIT = 5000
+
+
+def read_changes(positions, limit=DEFAULT_LIMIT):
+    """
+    Return (rows, positions, has_more): export rows of all projects after
+    `positions` ({feed: [updated_at, id]}), limited to `limit` rows per feed.
+    """
+    positions = dict(positions)
+    upper_bound = timezone.now() - SAFETY_LAG
+    rows = []
+    has_more = False
+
+    for feed, (model, serializer_class) in FEEDS.items():
+        queryset = model.objects.filter(updated_at__lte=upper_bound)
+        changed, more = changed_rows(queryset, positions.get(feed), limit)
+        has_more = has_more or more
+
+        upserted = iter(serializer_class([row for row in changed if row.is_active], many=True).data)
+        for row in changed:
+            if row.is_active:
+                rows.append({"feed": feed, "operation": "upsert", **next(upserted)})
+            else:
+                rows.append({
+                    "feed": feed,
+                    "operation": "delete",
+                    "id": row.pk,
+                    "project": row.project_id,
+                    "updated_at": row.updated_at.isoformat(),
+                })
+        if changed:
+            positions[feed] = [changed[-1].updated_at.isoformat(), changed[-1].pk]
+
+    return rows, positions, has_more
+
+
+def render(rows, fmt):
+    """Export rows as JSON lines or CSV (columns of both feeds, blank where absent)."""
+    if fmt == "jsonl":
+        return "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in rows)
+
+    columns = ["feed", "operation"]
+    for _model, serializer_class in FEEDS.values():
+        columns += [name for name in serializer_class.Meta.fields if name not in columns]
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=columns, restval="")
+    writer.writeheader()
+    writer.writerows(rows)
+    return output.getvalue()
+
+
+def get_positions(consumer):
+    cursor = ExportCursor.objects.filter(consumer=consumer).first()
+    return cursor.positions if cursor else {}
+
+
+def acknowledge(consumer, positions, exported_rows=0):
+    """Store the consumer's position after it processed an export."""
+    ExportCursor.objects.update_or_create(
+        consumer=consumer,
+        defaults={"positions": positions, "exported_rows": exported_rows},
+    )
+
+
+def parse_cursor(cursor):
+    """Positions of an opaque cursor handed out by the endpoint (InvalidSyncCursor if malformed)."""
+    return decode_cursor(cursor, FEEDS)
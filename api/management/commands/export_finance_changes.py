@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import export
+
+
+class Command(BaseCommand):
+    help = (
+        "Export payment certificate and fund transaction changes since a consumer's cursor "
+        "(JSON lines or CSV), then store the new cursor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("consumer", help="Name of the consuming system, e.g. accounting")
+        parser.add_argument("--format", choices=sorted(export.FORMATS), default="jsonl")
+        parser.add_argument("--output", help="File to write (default: standard output)")
+        parser.add_argument("--batch-size", type=int, default=export.DEFAULT_LIMIT)
+        parser.add_argument("--no-commit", action="store_true", help="Do not move the consumer's cursor")
+
+    def handle(self, *args, **options):
+        consumer = options["consumer"].strip()
+        if not consumer:
+            raise CommandError("A consumer name is required.")
+
+        positions = export.get_positions(consumer)
+        rows = []
+        has_more = True
+        while has_more:
+            batch, positions, has_more = export.read_changes(positions, limit=options["batch_size"])
+            rows += batch
+
+        content = export.render(rows, options["format"])
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as handle:
+                handle.write(content)
+        else:
+            sys.stdout.write(content)
+
+        if not options["no_commit"]:
+            export.acknowledge(consumer, positions, len(rows))
+        self.stderr.write(self.style.SUCCESS(
+            f"{len(rows)} change(s) exported for {consumer}"
+            + ("" if options["no_commit"] else "; cursor stored.")
+        ))
@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ApiCursorPagination(CursorPagination):
+    """
+    Cursor pagination for bulk consumers.
+
+    Ordering defaults to the primary key so cursors are stable while rows are
+    added; views may override `ordering` with any unique, indexed ordering.
+    """
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    ordering = "id"
@@ -0,0 +1,13 @@
+from rest_framework.permissions import DjangoModelPermissions
+
+
+class DjangoModelViewPermissions(DjangoModelPermissions):
+    """
+    Same model permissions as the HTML views: reading requires
+    `<app>.view_<model>`.
+    """
+    perms_map = {
+        **DjangoModelPermissions.perms_map,
+        "GET": ["%(app_label)s.view_%(model_name)s"],
+        "HEAD": ["%(app_label)s.view_%(model_name)s"],
+    }
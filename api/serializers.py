@@ -0,0 +1,183 @@
+from rest_framework import serializers
+
+from compliance.models import Compliance
+from finance.models import FundTransaction, PaymentCertificate
+from projects.models import Project
+from quality.models import MaterialTest
+from resources.models import Equipment, Manpower
+from sitemanage.models import Activity, ProgressLog, SiteProjectImage, SiteVisitor
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for `?fields=a,b,c` sparse fieldsets.
+
+    `query_plan` maps a serializer field to the select_related paths it needs,
+    so views only join the relations that the requested fields actually use.
+    """
+    query_plan = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.requested_fields(self.context.get("request"))
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request):
+        if request is None:
+            return None
+        raw = request.query_params.get("fields", "")
+        names = {name.strip() for name in raw.split(",") if name.strip()}
+        return names or None
+
+    @classmethod
+    def select_related_for(cls, request):
+        requested = cls.requested_fields(request)
+        paths = set()
+        for field_name, relations in cls.query_plan.items():
+            if requested is None or field_name in requested:
+                paths.update(relations)
+        return sorted(paths)
+
+
+# ---------------- Projects ----------------
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    client_name = serializers.CharField(source="client.name", read_only=True)
+
+    query_plan = {"client_name": ["client"]}
+
+    class Meta:
+        model = Project
+        fields = [
+            "id", "project_code", "project_name", "location",
+            "client", "client_name",
+            "contract_sum", "contract_duration_months",
+            "contract_signing_date", "site_possession_date",
+            "mobilization_start", "mobilization_end",
+            "commencement_date", "practical_completion_date",
+            "delay_status", "defects_liability_period_days",
+            "defects_start", "defects_end",
+            "created_at", "updated_at",
+        ]
+
+
+# ---------------- Site Management ----------------
+class ActivitySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    category_name = serializers.CharField(source="category.name", read_only=True, default=None)
+
+    query_plan = {"category_name": ["category"]}
+
+    class Meta:
+        model = Activity
+        fields = [
+            "id", "project", "category", "category_name",
+            "parent", "wbs_level",
+            "name", "description",
+            "planned_start", "planned_end",
+            "actual_start", "actual_end",
+            "progress_percent", "status", "weight",
+            "latest_log", "latest_remarks", "latest_log_date",
+            "early_start", "early_finish", "late_start", "late_finish", "total_float",
+            "created_at", "updated_at",
+        ]
+
+
+class ProgressLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    project = serializers.IntegerField(source="activity.project_id", read_only=True)
+
+    query_plan = {"project": ["activity"]}
+
+    class Meta:
+        model = ProgressLog
+        fields = [
+            "id", "activity", "project",
+            "date", "progress_percent", "remarks",
+            "created_at", "updated_at",
+        ]
+
+
+class SiteProjectImageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = SiteProjectImage
+        fields = [
+            "id", "project", "activity",
+            "image", "image_date", "figure_name",
+            "created_at", "updated_at",
+        ]
+
+
+class SiteVisitorSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = SiteVisitor
+        fields = [
+            "id", "project", "document_name", "document_file", "visit_date",
+            "created_at", "updated_at",
+        ]
+
+
+# ---------------- Finance ----------------
+class PaymentCertificateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = PaymentCertificate
+        fields = [
+            "id", "project", "certificate_no",
+            "certified_amount", "date_certified",
+            "amount_paid", "amount_from", "amount_to",
+            "payment_date", "pv_no",
+            "created_at", "updated_at",
+        ]
+
+
+class FundTransactionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = FundTransaction
+        fields = [
+            "id", "project", "date", "payee", "type",
+            "description", "amount_paid", "balance_after",
+            "pv_or_receipt_no", "remarks",
+            "created_at", "updated_at",
+        ]
+
+
+# ---------------- Resources ----------------
+class EquipmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Equipment
+        fields = [
+            "id", "project", "name", "category",
+            "quantity", "condition", "delivery_date",
+            "created_at",
+        ]
+
+
+class ManpowerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Manpower
+        fields = ["id", "project", "role", "count", "start_date", "created_at"]
+
+
+# ---------------- Quality & Compliance ----------------
+class MaterialTestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = MaterialTest
+        fields = [
+            "id", "project", "material_type", "test_date",
+            "result", "consultant", "report_file",
+            "created_at",
+        ]
+
+
+class ComplianceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    authority_name = serializers.CharField(source="authority.name", read_only=True)
+
+    query_plan = {"authority_name": ["authority"]}
+
+    class Meta:
+        model = Compliance
+        fields = [
+            "id", "project", "authority", "authority_name",
+            "registration_no", "status", "expiry_date",
+            "created_at",
+        ]
@@ -0,0 +1,113 @@
+"""
+Change feed for site clients (tablets) mirroring their projects.
+
+The client stores the opaque cursor returned by each call and sends it back
+on the next one. Each feed is read in (updated_at, id) order, so a cursor is
+just the last position seen per feed. Rows with is_active=False are returned
+as tombstones (id only) so clients can drop them locally.
+"""
+import base64
+import datetime
+import json
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from sitemanage.models import Activity, ProgressLog, SiteProjectImage, SiteVisitor
+
+from .serializers import (
+    ActivitySerializer,
+    ProgressLogSerializer,
+    SiteProjectImageSerializer,
+    SiteVisitorSerializer,
+)
+
+# Rows written in still-open transactions can carry an updated_at slightly in
+# the past by the time they commit; never hand out positions newer than this.
+SAFETY_LAG = datetime.timedelta(seconds=5)
+
+FEEDS = {
+    "activities": (Activity, ActivitySerializer, "project"),
+    "progress_logs": (ProgressLog, ProgressLogSerializer, "activity__project"),
+    "site_images": (SiteProjectImage, SiteProjectImageSerializer, "project"),
+    "site_visitors": (SiteVisitor, SiteVisitorSerializer, "project"),
+}
+
+
+class InvalidSyncCursor(Exception):
+    pass
+
+
+def encode_cursor(positions):
+    payload = json.dumps(positions, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, feeds=FEEDS):
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        positions = {}
+        for feed, (stamp, pk) in raw.items():
+            if feed not in feeds:
+                continue
+            parsed = parse_datetime(stamp)
+            if parsed is None:
+                raise ValueError(stamp)
+            positions[feed] = [stamp, int(pk)]
+        return positions
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidSyncCursor(cursor)
+
+
+def changed_rows(queryset, position, limit):
+    """
+    Up to `limit` rows of `queryset` after `position` ([updated_at, id] or
+    None) in (updated_at, id) order, and whether more rows follow.
+    """
+    if position:
+        stamp = parse_datetime(position[0])
+        queryset = queryset.filter(Q(updated_at__gt=stamp) | Q(updated_at=stamp, id__gt=position[1]))
+    rows = list(queryset.order_by("updated_at", "id")[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def build_changes(projects, cursor, limit, request=None):
+    """
+    Return (changes, next_cursor, has_more) for the given project queryset.
+
+    At most `limit` rows are read per feed; `has_more` tells the client to
+    call again immediately with the new cursor.
+    """
+    positions = decode_cursor(cursor)
+    upper_bound = timezone.now() - SAFETY_LAG
+    changes = {}
+    has_more = False
+
+    for feed, (model, serializer_class, project_field) in FEEDS.items():
+        queryset = model.objects.filter(
+            **{f"{project_field}__in": projects},
+            updated_at__lte=upper_bound,
+        )
+        related = serializer_class.select_related_for(request)
+        if related:
+            queryset = queryset.select_related(*related)
+
+        rows, more = changed_rows(queryset, positions.get(feed), limit)
+        has_more = has_more or more
+
+        upserted = [row for row in rows if row.is_active]
+        deleted = [row.pk for row in rows if not row.is_active]
+        changes[feed] = {
+            "upserted": serializer_class(upserted, many=True, context={"request": request}).data,
+            "deleted": deleted,
+        }
+
+        if rows:
+            last = rows[-1]
+            positions[feed] = [last.updated_at.isoformat(), last.pk]
+
+    return changes, encode_cursor(positions), has_more
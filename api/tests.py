@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import Permission, User
+from django.urls import reverse
+from django.utils import timezone
+
+from common.testing import TestCase, create_project
+from finance.models import ExportCursor, FundTransaction
+from projects.models import Project
+
+from . import export
+from .sync import encode_cursor
+
+
+class FinanceExportTests(TestCase):
+    """The export cursor belongs to the feed: every project, whoever reads it."""
+
+    def setUp(self):
+        super().setUp()
+        self.project = create_project("P-001")
+        self.closed = create_project("P-002")
+        for project, day in [(self.project, 1), (self.closed, 2)]:
+            FundTransaction.objects.create(
+                project=project, date=date(2025, 3, day), payee="Supplier", type=FundTransaction.CREDIT,
+                description="Advance", amount_paid=100, pv_or_receipt_no=f"PV-{day}",
+            )
+        FundTransaction.objects.filter(project=self.closed).soft_delete()
+        Project.objects.filter(pk=self.closed.pk).soft_delete()
+        # Out of the safety lag
+        FundTransaction.objects.update(updated_at=timezone.now() - timedelta(minutes=1))
+
+        self.viewer = User.objects.create_user("viewer")
+        self.viewer.user_permissions.set(Permission.objects.filter(
+            content_type__app_label="finance",
+            codename__in=["view_paymentcertificate", "view_fundtransaction"],
+        ))
+
+    def test_moving_a_cursor_requires_the_export_permission(self):
+        self.client.force_login(self.viewer)
+        url = reverse("api:finance_export")
+        self.assertEqual(self.client.get(url, {"consumer": "accounting"}).status_code, 403)
+        response = self.client.post(url, {"consumer": "accounting", "cursor": encode_cursor({})})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ExportCursor.objects.exists())
+
+    def test_export_covers_soft_deleted_projects(self):
+        self.viewer.user_permissions.add(Permission.objects.get(codename="change_exportcursor"))
+        self.client.force_login(self.viewer)  # a participant of no project
+        response = self.client.get(reverse("api:finance_export"), {"consumer": "accounting"})
+        self.assertEqual(response.status_code, 200)
+        rows, _positions, _has_more = export.read_changes({})
+        self.assertEqual(
+            [(row["project"], row["operation"]) for row in rows],
+            [(self.project.pk, "upsert"), (self.closed.pk, "delete")],
+        )
+        self.assertEqual(response["X-Export-Rows"], "2")
+
+
+class ProjectFilterTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = create_project("P-001")
+        self.client.force_login(User.objects.create_superuser("admin"))
+
+    def test_project_must_be_an_id(self):
+        url = reverse("api:project-list")
+        results = self.client.get(url, {"project": self.project.pk}).json()["results"]
+        self.assertEqual([row["id"] for row in results], [self.project.pk])
+        response = self.client.get(url, {"project": "abc"})
+        self.assertEqual((response.status_code, response.json()), (400, {"detail": "Invalid project."}))
+
+    def test_sync_project_must_be_an_id(self):
+        url = reverse("api:sync")
+        self.assertEqual(self.client.get(url, {"project": self.project.pk}).status_code, 200)
+        response = self.client.get(url, {"project": "abc"})
+        self.assertEqual((response.status_code, response.json()), (400, {"detail": "Invalid project."}))
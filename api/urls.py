@@ -0,0 +1,22 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from . import views
+
+app_name = "api"
+
+router = DefaultRouter()
+router.register("projects", views.ProjectViewSet, basename="project")
+router.register("activities", views.ActivityViewSet, basename="activity")
+router.register("progress-logs", views.ProgressLogViewSet, basename="progresslog")
+router.register("payment-certificates", views.PaymentCertificateViewSet, basename="paymentcertificate")
+router.register("fund-transactions", views.FundTransactionViewSet, basename="fundtransaction")
+router.register("equipment", views.EquipmentViewSet, basename="equipment")
+router.register("manpower", views.ManpowerViewSet, basename="manpower")
+router.register("material-tests", views.MaterialTestViewSet, basename="materialtest")
+router.register("compliance", views.ComplianceViewSet, basename="compliance")
+
+urlpatterns = [
+    path("sync/", views.SyncView.as_view(), name="sync"),
+    path("finance-export/", views.FinanceExportView.as_view(), name="finance_export"),
+    path("", include(router.urls)),
+]
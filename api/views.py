@@ -0,0 +1,247 @@
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
+from rest_framework import status, viewsets
+from rest_framework.exceptions import ParseError, PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from compliance.models import Compliance
+from finance.models import FundTransaction, PaymentCertificate
+from projects.models import Project
+from quality.models import MaterialTest
+from resources.models import Equipment, Manpower
+from sitemanage.models import Activity, ProgressLog
+
+from .serializers import (
+    ActivitySerializer,
+    ComplianceSerializer,
+    EquipmentSerializer,
+    FundTransactionSerializer,
+    ManpowerSerializer,
+    MaterialTestSerializer,
+    PaymentCertificateSerializer,
+    ProgressLogSerializer,
+    ProjectSerializer,
+)
+from . import export
+from .sync import InvalidSyncCursor, build_changes, encode_cursor
+
+
+# ---------------- Helpers ----------------
+def get_allowed_projects(user):
+    """Return active projects the user can access."""
+    if user.is_superuser or user.is_staff:
+        return Project.objects.filter(is_active=True)
+    return Project.objects.filter(
+        is_active=True,
+        participants__user=user,
+        participants__is_active=True
+    ).distinct()
+
+
+def filter_by_allowed_projects(queryset, user, project_field="project"):
+    """Filter queryset by allowed projects"""
+    if user.is_superuser or user.is_staff:
+        return queryset
+    return queryset.filter(**{f"{project_field}__in": get_allowed_projects(user)})
+
+
+# ---------------- Base ----------------
+class ProjectScopedViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only endpoint scoped to the projects the user can see in the UI.
+
+    `?project=<id>` narrows the result to one project; `?fields=` selects a
+    sparse fieldset and only the relations those fields need are joined.
+    """
+    model = None
+    project_field = "project"
+
+    def get_queryset(self):
+        queryset = self.model.objects.filter(is_active=True)
+        queryset = filter_by_allowed_projects(queryset, self.request.user, self.project_field)
+
+        project_id = self.request.query_params.get("project")
+        if project_id:
+            try:
+                queryset = queryset.filter(**{self.project_field: int(project_id)})
+            except ValueError:
+                raise ParseError("Invalid project.")
+
+        related = self.get_serializer_class().select_related_for(self.request)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
+
+
+# ---------------- Endpoints ----------------
+class ProjectViewSet(ProjectScopedViewSet):
+    model = Project
+    serializer_class = ProjectSerializer
+    project_field = "id"
+
+
+class ActivityViewSet(ProjectScopedViewSet):
+    model = Activity
+    serializer_class = ActivitySerializer
+
+
+class ProgressLogViewSet(ProjectScopedViewSet):
+    model = ProgressLog
+    serializer_class = ProgressLogSerializer
+    project_field = "activity__project"
+
+
+class PaymentCertificateViewSet(ProjectScopedViewSet):
+    model = PaymentCertificate
+    serializer_class = PaymentCertificateSerializer
+
+
+class FundTransactionViewSet(ProjectScopedViewSet):
+    model = FundTransaction
+    serializer_class = FundTransactionSerializer
+
+
+class EquipmentViewSet(ProjectScopedViewSet):
+    model = Equipment
+    serializer_class = EquipmentSerializer
+
+
+class ManpowerViewSet(ProjectScopedViewSet):
+    model = Manpower
+    serializer_class = ManpowerSerializer
+
+
+class MaterialTestViewSet(ProjectScopedViewSet):
+    model = MaterialTest
+    serializer_class = MaterialTestSerializer
+
+
+class ComplianceViewSet(ProjectScopedViewSet):
+    model = Compliance
+    serializer_class = ComplianceSerializer
+
+
+# ---------------- Delta Sync ----------------
+@method_decorator(gzip_page, name="dispatch")
+class SyncView(APIView):
+    """
+    Change feed for offline site clients.
+
+    GET /api/sync/?cursor=<opaque>&project=<id>&limit=<n>
+
+    Returns activities, progress logs, site images and site visitors created,
+    updated or soft-deleted since `cursor`. Omit the cursor for a full first
+    sync; keep calling while `has_more` is true. Responses are gzip-compressed
+    when the client sends Accept-Encoding: gzip.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 500
+    max_limit = 2000
+
+    def get(self, request):
+        if not request.user.has_perm("sitemanage.view_activity"):
+            raise PermissionDenied()
+
+        projects = get_allowed_projects(request.user)
+        project_id = request.query_params.get("project")
+        if project_id:
+            try:
+                projects = projects.filter(id=int(project_id))
+            except ValueError:
+                return Response({"detail": "Invalid project."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        try:
+            changes, cursor, has_more = build_changes(
+                projects, request.query_params.get("cursor"), limit, request=request
+            )
+        except InvalidSyncCursor:
+            return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "cursor": cursor,
+            "has_more": has_more,
+            "changes": changes,
+        })
+
+
+# ---------------- Finance Export ----------------
+class FinanceExportView(APIView):
+    """
+    Incremental export of payment certificates and fund transactions.
+
+    GET /api/finance-export/?consumer=<name>&output=jsonl|csv&limit=<n>
+
+    Returns the changes after the consumer's stored cursor (or after
+    `cursor=<opaque>` when given), one row per line. The next cursor is in
+    the X-Export-Cursor header and X-Export-Has-More tells the consumer to
+    read again. Nothing is stored until the consumer acknowledges:
+
+    POST /api/finance-export/ {"consumer": <name>, "cursor": <opaque>, "rows": <n>}
+
+    The export covers every project, so both require
+    `finance.change_exportcursor` on top of the view permissions.
+    """
+    permission_classes = [IsAuthenticated]
+    max_limit = 20000
+    required_perms = [
+        "finance.view_paymentcertificate",
+        "finance.view_fundtransaction",
+        "finance.change_exportcursor",
+    ]
+
+    def check_permissions(self, request):
+        super().check_permissions(request)
+        if not request.user.has_perms(self.required_perms):
+            raise PermissionDenied()
+
+    def get(self, request):
+        consumer = request.query_params.get("consumer", "").strip()
+        # Not "format": DRF reserves it for renderer selection
+        fmt = request.query_params.get("output", "jsonl")
+        if not consumer or fmt not in export.FORMATS:
+            return Response(
+                {"detail": "A consumer and an output (jsonl or csv) are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = int(request.query_params.get("limit", export.DEFAULT_LIMIT))
+        except ValueError:
+            limit = export.DEFAULT_LIMIT
+        limit = max(1, min(limit, self.max_limit))
+
+        try:
+            cursor = request.query_params.get("cursor")
+            positions = export.parse_cursor(cursor) if cursor else export.get_positions(consumer)
+        except InvalidSyncCursor:
+            return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows, positions, has_more = export.read_changes(positions, limit)
+        response = HttpResponse(export.render(rows, fmt), content_type=export.FORMATS[fmt])
+        response["X-Export-Cursor"] = encode_cursor(positions)
+        response["X-Export-Has-More"] = "true" if has_more else "false"
+        response["X-Export-Rows"] = str(len(rows))
+        return response
+
+    def post(self, request):
+        consumer = str(request.data.get("consumer", "")).strip()
+        cursor = request.data.get("cursor")
+        if not consumer or not cursor:
+            return Response({"detail": "A consumer and a cursor are required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            positions = export.parse_cursor(cursor)
+            rows = int(request.data.get("rows") or 0)
+        except (InvalidSyncCursor, TypeError, ValueError):
+            return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        export.acknowledge(consumer, positions, rows)
+        return Response({"consumer": consumer, "cursor": encode_cursor(positions)})
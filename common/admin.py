@@ -1,3 +1,125 @@
 from django.contrib import admin
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
 
-# Register your models here.
+from .models import RequestSample
+from .profiling import endpoint_summary
+
+
+# ---------------- Soft delete actions ----------------
+@admin.action(description="Deactivate selected rows")
+def soft_delete_selected(modeladmin, request, queryset):
+    """One UPDATE for the selection (common.managers); rows are kept."""
+    count = queryset.soft_delete()
+    modeladmin.message_user(request, f"{count} row(s) deactivated.")
+
+
+@admin.action(description="Reactivate selected rows")
+def restore_selected(modeladmin, request, queryset):
+    count = queryset.restore()
+    modeladmin.message_user(request, f"{count} row(s) reactivated.")
+
+
+class ActiveListFilter(admin.SimpleListFilter):
+    """The changelist shows active rows unless inactive or all rows are asked for."""
+    title = "active"
+    parameter_name = "active"
+
+    def lookups(self, request, model_admin):
+        return [("no", "Inactive"), ("all", "All")]
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.value() is None,
+            "query_string": changelist.get_query_string(remove=[self.parameter_name]),
+            "display": "Active",
+        }
+        for lookup, title in self.lookup_choices:
+            yield {
+                "selected": self.value() == lookup,
+                "query_string": changelist.get_query_string({self.parameter_name: lookup}),
+                "display": title,
+            }
+
+    def queryset(self, request, queryset):
+        if self.value() == "all":
+            return queryset
+        return queryset.filter(is_active=self.value() != "no")
+
+
+@admin.register(RequestSample)
+class RequestSampleAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "method",
+        "view_name",
+        "status_code",
+        "duration_ms",
+        "sql_count",
+        "sql_ms",
+        "duplicate_queries",
+        "template_ms",
+        "profile_link",
+    )
+    list_filter = ("method", "status_code", "view_name")
+    search_fields = ("path", "view_name")
+    date_hierarchy = "created_at"
+    exclude = ("profile_data",)
+    change_list_template = "admin/common/requestsample/change_list.html"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        # Profiles can be large: only fetch whether one exists.
+        return super().get_queryset(request).defer("profile_data").annotate(
+            profiled=ExpressionWrapper(Q(profile_data__isnull=False), output_field=BooleanField())
+        )
+
+    def get_urls(self):
+        urls = [
+            path(
+                "slow-endpoints/",
+                self.admin_site.admin_view(self.slow_endpoints_view),
+                name="common_requestsample_slow_endpoints",
+            ),
+            path(
+                "<int:pk>/profile/",
+                self.admin_site.admin_view(self.download_profile_view),
+                name="common_requestsample_profile",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    @admin.display(description="Profile")
+    def profile_link(self, obj):
+        if not obj.profiled:
+            return "-"
+        url = reverse("admin:common_requestsample_profile", args=[obj.pk])
+        return format_html('<a href="{}">.prof</a>', url)
+
+    def slow_endpoints_view(self, request):
+        if not self.has_view_permission(request):
+            raise Http404
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Slow endpoints",
+            "endpoints": endpoint_summary(),
+        }
+        return TemplateResponse(request, "admin/common/requestsample/slow_endpoints.html", context)
+
+    def download_profile_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise Http404
+        sample = get_object_or_404(RequestSample, pk=pk, profile_data__isnull=False)
+        response = HttpResponse(bytes(sample.profile_data), content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="request-{sample.pk}.prof"'
+        return response
@@ -0,0 +1,53 @@
+"""
+Project data versions.
+
+Derived results (S-curves, rollups, ...) are cached under keys that embed the
+project's data version, so bumping it invalidates all of them at once. The
+cache itself may be per process (the default LocMemCache), but the version
+lives in a ProjectDataVersion row: a bump from any gunicorn worker or
+management command is seen by every process, and results cached under an
+older version are simply never read again.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import ProjectDataVersion
+
+
+def get_project_version(project_id):
+    """Current data version of a project (1 until the first bump)."""
+    version = ProjectDataVersion.objects.filter(project_id=project_id).values_list("version", flat=True).first()
+    return version or 1
+
+
+def get_project_versions(project_ids):
+    """{project id: data version} for many projects in one query."""
+    project_ids = list(project_ids)
+    versions = dict(
+        ProjectDataVersion.objects.filter(project_id__in=project_ids).values_list("project_id", "version")
+    )
+    return {project_id: versions.get(project_id) or 1 for project_id in project_ids}
+
+
+def bump_project_version(project_id):
+    """Invalidate every cached result derived from this project's data (one atomic UPDATE)."""
+    versions = ProjectDataVersion.objects.filter(project_id=project_id)
+    if versions.update(version=F("version") + 1):
+        return get_project_version(project_id)
+    try:
+        with transaction.atomic():
+            ProjectDataVersion.objects.create(project_id=project_id, version=2)
+    except IntegrityError:
+        # Created concurrently (or the project is gone): bump the new row
+        versions.update(version=F("version") + 1)
+    return get_project_version(project_id)
+
+
+def project_cache_key(prefix, project_id, *parts, version=None):
+    """
+    Build a cache key bound to the project's current data version (read
+    unless given, e.g. from get_project_versions()).
+    """
+    suffix = ":".join(str(part) for part in parts)
+    key = f"{prefix}:{project_id}:v{version or get_project_version(project_id)}"
+    return f"{key}:{suffix}" if suffix else key
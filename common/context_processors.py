@@ -46,6 +46,7 @@ def sidebar_permissions(request):
         "project": is_super or user.has_perm("reports.view_projectreport"),
         "progress_cover": is_super or user.has_perm("reports.view_progressreportcover"),
         "progress": is_super or user.has_perm("reports.view_projectreport"),
+        "progress_snapshots": is_super or user.has_perm("progress.view_progresssnapshot"),
         "finance": is_super or user.has_perm("reports.view_financereport"),
         "quality": is_super or user.has_perm("reports.view_qualityreport"),
         "resources": is_super or user.has_perm("reports.view_resourcesreport"),
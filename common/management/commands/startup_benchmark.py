@@ -0,0 +1,73 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Libraries that must only be imported by the worker that renders a report
+# (see reports.renderers), never at startup.
+HEAVY_MODULES = ["reportlab", "openpyxl", "docx", "weasyprint", "xhtml2pdf", "cairocffi", "fontTools"]
+
+# Runs in a fresh interpreter: boot Django like a WSGI worker, then resolve
+# the URLconf, which imports every view module.
+WORKER_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+heavy = [name for name in json.loads(sys.argv[1]) if name in sys.modules]
+print(json.dumps({"seconds": elapsed, "rss_kb": rss_kb, "heavy": heavy}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker startup (import time and peak RSS) in fresh interpreters "
+        "and fail if heavy document libraries are imported at startup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to start")
+        parser.add_argument("--max-seconds", type=float, help="Fail if the median startup time exceeds this")
+        parser.add_argument("--max-rss-mb", type=float, help="Fail if the median peak RSS exceeds this")
+
+    def handle(self, *args, **options):
+        env = dict(os.environ)
+        env.setdefault("DJANGO_SETTINGS_MODULE", "construction_reports.settings")
+
+        results = []
+        for _ in range(max(1, options["runs"])):
+            proc = subprocess.run(
+                [sys.executable, "-c", WORKER_SCRIPT, json.dumps(HEAVY_MODULES)],
+                env=env, capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                raise CommandError(f"Worker failed to start:\n{proc.stderr}")
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+        seconds = statistics.median(r["seconds"] for r in results)
+        rss_mb = statistics.median(r["rss_kb"] for r in results) / 1024
+        heavy = sorted({name for r in results for name in r["heavy"]})
+
+        self.stdout.write(f"Runs:            {len(results)}")
+        self.stdout.write(f"Startup (median): {seconds * 1000:.0f} ms")
+        self.stdout.write(f"Peak RSS (median): {rss_mb:.1f} MB")
+        self.stdout.write(f"Heavy modules:   {', '.join(heavy) or 'none'}")
+
+        errors = []
+        if heavy:
+            errors.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+        if options["max_seconds"] is not None and seconds > options["max_seconds"]:
+            errors.append(f"startup {seconds:.2f}s exceeds {options['max_seconds']:.2f}s")
+        if options["max_rss_mb"] is not None and rss_mb > options["max_rss_mb"]:
+            errors.append(f"peak RSS {rss_mb:.1f} MB exceeds {options['max_rss_mb']:.1f} MB")
+        if errors:
+            raise CommandError("; ".join(errors))
+
+        self.stdout.write(self.style.SUCCESS("Startup benchmark passed."))
@@ -0,0 +1,72 @@
+"""
+Soft delete.
+
+Rows are never deleted from the application: is_active=False hides them.
+Models with is_active carry two managers:
+
+- `objects` returns every row, active or not. It stays the default manager,
+  so related managers, the admin, sync feeds and rebuilds keep seeing
+  deactivated rows;
+- `active` returns active rows only, for lists, forms and reports:
+
+      Compliance.active.filter(project=project)
+
+Both return a SoftDeleteQuerySet, whose soft_delete() and restore() flip
+is_active for the whole queryset with one UPDATE (updated_at set to now)
+instead of a save() per object. UPDATE sends no post_save, so they send
+`active_changed` with the primary keys of the rows that actually changed;
+the apps that keep derived data (project stats, fund balances, cash flow,
+activity progress, cache versions) refresh it from their receivers, in the
+same transaction.
+"""
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+# sender: the model; pks: ids of the rows changed; is_active: their new value
+active_changed = Signal()
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def inactive(self):
+        return self.filter(is_active=False)
+
+    def soft_delete(self):
+        """Deactivate the rows. Returns the number of rows changed."""
+        return self._set_active(False)
+
+    def restore(self):
+        """Reactivate the rows. Returns the number of rows changed."""
+        return self._set_active(True)
+
+    def _set_active(self, value):
+        changes = {"is_active": value}
+        if any(field.name == "updated_at" for field in self.model._meta.concrete_fields):
+            changes["updated_at"] = timezone.now()
+
+        with transaction.atomic(using=self.db):
+            pks = list(self.exclude(is_active=value).order_by().values_list("pk", flat=True))
+            if not pks:
+                return 0
+            self.model._base_manager.using(self.db).filter(pk__in=pks).update(**changes)
+            active_changed.send(sender=self.model, pks=pks, is_active=value)
+        return len(pks)
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Every row (the default `objects` manager of soft-deletable models)."""
+
+
+class ActiveManager(SoftDeleteManager):
+    """Active rows only."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
+def changed_project_ids(model, pks, lookup="project_id"):
+    """Projects of the rows named in an active_changed signal."""
+    return set(model.objects.filter(pk__in=pks).values_list(lookup, flat=True).distinct())
@@ -0,0 +1,228 @@
+"""
+Prometheus metrics shared by all app server workers.
+
+Each worker accumulates counter and histogram increments in memory and adds
+them to a local SQLite file (settings.METRICS_DB) at most once per
+METRICS_FLUSH_SECONDS. Every worker writes into the same rows, so the
+/metrics endpoint (common.views.metrics) reads totals for the whole server
+without any external service.
+
+Metrics:
+- http_requests_total{view, method, status}
+- http_request_duration_seconds{view, method} (histogram)
+- db_queries_per_request{view} (histogram)
+- http_upload_bytes_total{view} (multipart request bodies)
+- report_render_duration_seconds{report, format} (histogram, see
+  reports.instrumentation)
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+RENDER_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REGISTRY = []
+
+
+def _format_labels(labels):
+    return ",".join(
+        '{}="{}"'.format(
+            name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        for name, value in labels
+    )
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# ---------------- Metric types ----------------
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+    def _labels(self, labels):
+        return _format_labels((name, labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        _buffer.add(self.name, self._labels(labels), "", amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(float(bucket) for bucket in buckets) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        label_text = self._labels(labels)
+        for bucket in self.buckets:
+            # Every bucket is written so empty ones are still exposed.
+            _buffer.add(f"{self.name}_bucket", label_text, _format_value(bucket), int(value <= bucket))
+        _buffer.add(f"{self.name}_sum", label_text, "", value)
+        _buffer.add(f"{self.name}_count", label_text, "", 1)
+
+
+# ---------------- Shared store ----------------
+class _Store:
+    """Per-process buffer flushed into the shared SQLite file."""
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS samples ("
+        " name TEXT NOT NULL, labels TEXT NOT NULL, le TEXT NOT NULL, value REAL NOT NULL,"
+        " PRIMARY KEY (name, labels, le))"
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = defaultdict(float)
+        self.last_flush = time.monotonic()
+        self.db = None
+        self.pid = None
+
+    def add(self, name, labels, le, amount):
+        with self.lock:
+            self.pending[(name, labels, le)] += amount
+        if time.monotonic() - self.last_flush >= getattr(settings, "METRICS_FLUSH_SECONDS", 1):
+            self.flush()
+
+    def connect(self):
+        # Connections must not cross a fork (gunicorn preload).
+        if self.db is None or self.pid != os.getpid():
+            self.db = sqlite3.connect(
+                str(getattr(settings, "METRICS_DB", settings.BASE_DIR / "metrics.sqlite3")),
+                timeout=5,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(self.schema)
+            self.pid = os.getpid()
+        return self.db
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, defaultdict(float)
+            self.last_flush = time.monotonic()
+            if not pending:
+                return
+            try:
+                db = self.connect()
+                db.execute("BEGIN IMMEDIATE")
+                db.executemany(
+                    "INSERT INTO samples (name, labels, le, value) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (name, labels, le) DO UPDATE SET value = value + excluded.value",
+                    [(name, labels, le, value) for (name, labels, le), value in pending.items()],
+                )
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                logger.exception("Could not write metrics")
+                if self.db is not None and self.db.in_transaction:
+                    self.db.execute("ROLLBACK")
+
+    def read(self):
+        self.flush()
+        with self.lock:
+            return self.connect().execute("SELECT name, labels, le, value FROM samples").fetchall()
+
+
+_buffer = _Store()
+
+
+def exposition():
+    """All metrics in the Prometheus text format (version 0.0.4)."""
+    samples = defaultdict(list)
+    for name, labels, le, value in _buffer.read():
+        samples[name].append((labels, le, value))
+
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        if metric.kind == "counter":
+            names = [metric.name]
+        else:
+            names = [f"{metric.name}_bucket", f"{metric.name}_sum", f"{metric.name}_count"]
+        for name in names:
+            rows = sorted(samples.get(name, []), key=lambda row: (row[0], float(row[1] or 0)))
+            for labels, le, value in rows:
+                if le:
+                    labels = ",".join(filter(None, [labels, f'le="{le}"']))
+                label_text = f"{{{labels}}}" if labels else ""
+                lines.append(f"{name}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- Metrics ----------------
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by URL name, method and status.",
+    ["view", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by URL name.",
+    ["view", "method"], LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request", "Database queries run per request.",
+    ["view"], QUERY_BUCKETS,
+)
+UPLOAD_BYTES = Counter(
+    "http_upload_bytes_total", "Bytes received in multipart (file upload) requests.",
+    ["view"],
+)
+REPORT_RENDER = Histogram(
+    "report_render_duration_seconds", "Report generation time by report type and format.",
+    ["report", "format"], RENDER_BUCKETS,
+)
+
+
+# ---------------- Middleware ----------------
+class MetricsMiddleware:
+    """Count requests, latency, queries and upload bytes per URL name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        REQUEST_LATENCY.observe(duration, view=view, method=request.method)
+        DB_QUERIES.observe(queries[0], view=view)
+        if request.content_type == "multipart/form-data":
+            UPLOAD_BYTES.inc(int(request.META.get("CONTENT_LENGTH") or 0), view=view)
+        return response
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_request_sample'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDataVersion',
+            fields=[
+                ('project_id', models.PositiveBigIntegerField(primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=1)),
+            ],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0002_project_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EndpointLatency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(max_length=200)),
+                ('window_start', models.DateTimeField()),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('duration_ms_sum', models.FloatField(default=0)),
+                ('duration_ms_max', models.FloatField(default=0)),
+                ('sql_count_sum', models.PositiveBigIntegerField(default=0)),
+                ('sql_ms_sum', models.FloatField(default=0)),
+                ('template_ms_sum', models.FloatField(default=0)),
+                ('duplicate_queries_sum', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'endpoint latencies',
+                'indexes': [models.Index(fields=['window_start'], name='endpoint_latency_window_idx')],
+                'constraints': [models.UniqueConstraint(fields=('view_name', 'window_start', 'bucket'), name='endpoint_latency_uniq')],
+            },
+        ),
+    ]
@@ -1,3 +1,82 @@
+from django.contrib.auth.models import User
 from django.db import models
 
-# Create your models here.
+
+class RequestSample(models.Model):
+    """
+    One profiled request, written by common.profiling.RequestProfilingMiddleware.
+
+    `profile_data` holds marshalled cProfile stats (the .prof format) when the
+    request asked for a cProfile dump.
+    """
+    view_name = models.CharField(max_length=200, blank=True)
+    path = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    duration_ms = models.FloatField()
+    sql_count = models.PositiveIntegerField(default=0)
+    sql_ms = models.FloatField(default=0)
+    duplicate_queries = models.PositiveIntegerField(default=0)
+    duplicate_sql = models.TextField(blank=True)
+    template_ms = models.FloatField(default=0)
+    profile_data = models.BinaryField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="reqsample_created_idx"),
+            models.Index(fields=["view_name", "duration_ms"], name="reqsample_view_duration_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} {self.duration_ms:.0f} ms"
+
+
+class EndpointLatency(models.Model):
+    """
+    Rolling aggregate of the profiled requests of one URL name: one row per
+    hour and latency bucket (common.profiling.BUCKETS_MS), updated in place
+    as samples are written. The slow endpoints page reads percentiles from
+    the bucket counts instead of the raw samples.
+    """
+    view_name = models.CharField(max_length=200)
+    window_start = models.DateTimeField()
+    bucket = models.PositiveSmallIntegerField()
+
+    count = models.PositiveIntegerField(default=0)
+    duration_ms_sum = models.FloatField(default=0)
+    duration_ms_max = models.FloatField(default=0)
+    sql_count_sum = models.PositiveBigIntegerField(default=0)
+    sql_ms_sum = models.FloatField(default=0)
+    template_ms_sum = models.FloatField(default=0)
+    duplicate_queries_sum = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "endpoint latencies"
+        constraints = [
+            models.UniqueConstraint(fields=["view_name", "window_start", "bucket"], name="endpoint_latency_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["window_start"], name="endpoint_latency_window_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.view_name} {self.window_start:%Y-%m-%d %H:00} #{self.bucket}: {self.count}"
+
+
+class ProjectDataVersion(models.Model):
+    """
+    Data version of a project (see common.cache).
+
+    Kept in the database rather than in the cache so that every worker and
+    management command bumps and reads the same number. No foreign key: a bump
+    may run while the project itself is being deleted.
+    """
+    project_id = models.PositiveBigIntegerField(primary_key=True)
+    version = models.PositiveBigIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.project_id} v{self.version}"
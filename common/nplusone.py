@@ -0,0 +1,131 @@
+"""
+N+1 query detection.
+
+A QueryShapeTracker counts queries per SQL template (parameters removed,
+`IN (%s, %s, ...)` lists collapsed). When one template runs more than
+`threshold` times, the call stack of that execution (project frames only) is
+kept, and on exit the tracker logs a warning or raises NPlusOneError.
+
+Used by NPlusOneMiddleware in development (settings.NPLUSONE_ENABLED) and by
+common.testing.NPlusOneTestMixin in tests.
+
+Settings:
+- NPLUSONE_ENABLED (default DEBUG): check every request;
+- NPLUSONE_THRESHOLD (default 10): executions of one template allowed;
+- NPLUSONE_RAISE (default False): raise instead of logging.
+"""
+import logging
+import os
+import re
+import traceback
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 10
+
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_IGNORED = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+# Entry points and middleware frames present in every stack.
+_SKIPPED_FILES = (
+    "manage.py",
+    os.path.join("construction_reports", "wsgi.py"),
+    os.path.join("common", "metrics.py"),
+    os.path.join("common", "nplusone.py"),
+    os.path.join("common", "profiling.py"),
+)
+
+
+class NPlusOneError(AssertionError):
+    """A query template ran more often than allowed."""
+
+
+def query_shape(sql):
+    """SQL template used to group repeated queries."""
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("(...)", sql)).strip()
+
+
+def _project_stack():
+    """Call stack limited to this project's code (no Django, no site-packages)."""
+    base = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(base)
+        and "site-packages" not in frame.filename
+        and not frame.filename.endswith(_SKIPPED_FILES)
+    ]
+    return "".join(traceback.format_list(frames))
+
+
+class QueryShapeTracker:
+    """
+    Context manager recording repeated query templates on the default connection.
+
+        with QueryShapeTracker(threshold=5, raise_errors=True, label="my view"):
+            ...
+    """
+
+    def __init__(self, threshold=None, raise_errors=None, label=""):
+        self.threshold = threshold or getattr(settings, "NPLUSONE_THRESHOLD", DEFAULT_THRESHOLD)
+        self.raise_errors = (
+            getattr(settings, "NPLUSONE_RAISE", False) if raise_errors is None else raise_errors
+        )
+        self.label = label
+        self.counts = Counter()
+        self.stacks = {}
+        self._wrapper = None
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self._execute)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._wrapper.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self.check()
+        return False
+
+    def _execute(self, execute, sql, params, many, context):
+        shape = query_shape(sql)
+        if not shape.upper().startswith(_IGNORED):
+            self.counts[shape] += 1
+            if self.counts[shape] == self.threshold + 1:
+                self.stacks[shape] = _project_stack()
+        return execute(sql, params, many, context)
+
+    @property
+    def violations(self):
+        """[(shape, count, stack)] for templates run more than `threshold` times."""
+        return [(shape, self.counts[shape], stack) for shape, stack in self.stacks.items()]
+
+    def report(self):
+        lines = [f"Repeated queries{f' in {self.label}' if self.label else ''}:"]
+        for shape, count, stack in self.violations:
+            lines.append(f"\n{count}x {shape}\nFirst run over the limit of {self.threshold} from:\n{stack}")
+        return "\n".join(lines)
+
+    def check(self):
+        if not self.stacks:
+            return
+        if self.raise_errors:
+            raise NPlusOneError(self.report())
+        logger.warning(self.report())
+
+
+class NPlusOneMiddleware:
+    """Check every request for repeated queries when NPLUSONE_ENABLED (default: DEBUG)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "NPLUSONE_ENABLED", settings.DEBUG):
+            return self.get_response(request)
+        with QueryShapeTracker(label=f"{request.method} {request.path}"):
+            return self.get_response(request)
@@ -0,0 +1,171 @@
+import base64
+import hashlib
+import json
+import math
+from functools import reduce
+
+from django.core.cache import cache
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    """
+    One page of a KeysetPaginator.
+
+    Mimics the parts of django.core.paginator.Page used by the templates
+    (iteration, number, has_next/has_previous, paginator.num_pages) and adds
+    next_cursor/previous_cursor for building links.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, number, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return ""
+        return self.paginator.encode_cursor(self.object_list[-1], self.number + 1, "n")
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or self.number <= 2:
+            return ""
+        return self.paginator.encode_cursor(self.object_list[0], self.number - 1, "p")
+
+
+class KeysetPaginator:
+    """
+    Cursor (seek) paginator keyed on the queryset ordering.
+
+    Instead of COUNT(*) + OFFSET, each page filters on the sort key of the
+    last (or first) row of the previous page, so page N costs the same as
+    page 1 as long as an index covers the ordering. The ordering must end in
+    a unique, non-null column (usually "id" / "-id") so keys never tie.
+
+    The total count is only used for the "Page N of ~M" label; it is cached
+    per query for `count_timeout` seconds and may therefore be approximate.
+    """
+
+    def __init__(self, queryset, ordering, per_page=10, count_timeout=300):
+        self.ordering = tuple(ordering)
+        self.queryset = queryset.order_by(*self.ordering)
+        self.per_page = per_page
+        self.count_timeout = count_timeout
+        self.fields = [
+            (name.lstrip("-"), name.startswith("-")) for name in self.ordering
+        ]
+
+    # ---------------- Count ----------------
+    @property
+    def count(self):
+        key = "keyset-count:" + hashlib.md5(
+            str(self.queryset.order_by().query).encode("utf-8")
+        ).hexdigest()
+        total = cache.get(key)
+        if total is None:
+            total = self.queryset.order_by().count()
+            cache.set(key, total, self.count_timeout)
+        return total
+
+    @property
+    def num_pages(self):
+        return max(1, math.ceil(self.count / self.per_page))
+
+    # ---------------- Cursors ----------------
+    def encode_cursor(self, obj, number, direction):
+        values = []
+        for name, _desc in self.fields:
+            value = getattr(obj, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        payload = json.dumps({"v": values, "n": number, "d": direction}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            raw_values = payload["v"]
+            number = int(payload["n"])
+            direction = payload["d"]
+        except (ValueError, KeyError, TypeError):
+            raise InvalidCursor(cursor)
+
+        if len(raw_values) != len(self.fields) or direction not in ("n", "p"):
+            raise InvalidCursor(cursor)
+
+        opts = self.queryset.model._meta
+        values = []
+        for (name, _desc), raw in zip(self.fields, raw_values):
+            field = opts.get_field("id" if name == "pk" else name)
+            values.append(field.to_python(raw))
+        return values, max(number, 1), direction
+
+    def _seek_filter(self, values, forward):
+        """
+        Build (a > x) OR (a = x AND b > y) ... honouring each field's direction.
+        """
+        clauses = []
+        for i, (name, desc) in enumerate(self.fields):
+            lookup = "lt" if desc == forward else "gt"
+            equal = {self.fields[j][0]: values[j] for j in range(i)}
+            clauses.append(Q(**equal, **{f"{name}__{lookup}": values[i]}))
+        return reduce(lambda a, b: a | b, clauses)
+
+    # ---------------- Pages ----------------
+    def get_page(self, cursor=None):
+        """Return a KeysetPage; an invalid or empty cursor yields page 1."""
+        values, number, direction = None, 1, "n"
+        if cursor:
+            try:
+                values, number, direction = self.decode_cursor(cursor)
+            except InvalidCursor:
+                values, number, direction = None, 1, "n"
+
+        if values is None:
+            rows = list(self.queryset[:self.per_page + 1])
+            return KeysetPage(rows[:self.per_page], 1, self, len(rows) > self.per_page, False)
+
+        if direction == "n":
+            qs = self.queryset.filter(self._seek_filter(values, forward=True))
+            rows = list(qs[:self.per_page + 1])
+            return KeysetPage(rows[:self.per_page], number, self, len(rows) > self.per_page, True)
+
+        reversed_ordering = [
+            name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering
+        ]
+        qs = self.queryset.filter(self._seek_filter(values, forward=False)).order_by(*reversed_ordering)
+        rows = list(qs[:self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return KeysetPage(rows, number, self, True, has_previous)
@@ -0,0 +1,295 @@
+"""
+Opt-in request profiling.
+
+RequestProfilingMiddleware records a RequestSample (see common.models) for:
+
+- every request when settings.REQUEST_PROFILING is True;
+- staff requests sending the header `X-Profile: 1` (or `?_profile=1`).
+
+A sample holds the wall time, SQL count and time, duplicate queries (same
+SQL and parameters run more than once) and the time spent rendering
+templates. Sending `X-Profile: cprofile` (or `?_profile=cprofile`) as staff
+also runs the view under cProfile; the stats are stored with the sample and
+can be downloaded from the admin as a .prof file for snakeviz.
+
+Each sample is also added to a rolling aggregate per URL name
+(EndpointLatency: one row per hour and latency bucket, updated with one
+UPDATE). The admin "Slow endpoints" page reads p50/p95 latency per URL name
+from those rows over the retention window (REQUEST_PROFILING_RETENTION_DAYS,
+default 7), interpolating within the histogram buckets, so it never loads
+raw samples. The raw samples stay available for drilling down and are
+pruned periodically.
+"""
+import cProfile
+import logging
+import marshal
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from datetime import timedelta
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Max, Sum
+from django.db.models.functions import Greatest
+from django.template import base as template_base
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+HEADER = "HTTP_X_PROFILE"
+QUERY_PARAM = "_profile"
+PRUNE_EVERY = 200
+
+# Upper bounds of the latency buckets; the last bucket is open-ended
+BUCKETS_MS = (10, 25, 50, 100, 200, 350, 500, 750, 1000, 1500, 2500, 5000, 10000)
+
+_state = threading.local()
+
+
+# ---------------- Template timing ----------------
+def _instrument_templates():
+    """Wrap Template.render once so the active profile can time template rendering."""
+    if getattr(template_base.Template.render, "_profiled", False):
+        return
+    original = template_base.Template.render
+
+    def render(self, context):
+        profile = getattr(_state, "profile", None)
+        if profile is None or profile.template_depth:
+            return original(self, context)
+        profile.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            profile.template_ms += (time.perf_counter() - start) * 1000
+            profile.template_depth -= 1
+
+    render._profiled = True
+    template_base.Template.render = render
+
+
+# ---------------- Per-request state ----------------
+class RequestProfile:
+    def __init__(self):
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.template_depth = 0
+        self.queries = Counter()
+
+    def execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (time.perf_counter() - start) * 1000
+            self.queries[(sql, repr(params))] += 1
+
+    @property
+    def sql_count(self):
+        return sum(self.queries.values())
+
+    def duplicates(self):
+        """(number of repeated executions, SQL of the most repeated query)."""
+        repeated = sum(count - 1 for count in self.queries.values())
+        if not repeated:
+            return 0, ""
+        (sql, _params), _count = self.queries.most_common(1)[0]
+        return repeated, sql
+
+
+class RequestProfilingMiddleware:
+    """Place after AuthenticationMiddleware (the header is honoured for staff only)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.samples_written = 0
+        _instrument_templates()
+
+    def __call__(self, request):
+        mode = self._mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        profile = _state.profile = RequestProfile()
+        profiler = cProfile.Profile() if mode == "cprofile" else None
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(profile.execute):
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            _state.profile = None
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        self._save(request, response, profile, profiler, duration_ms)
+        return response
+
+    def _mode(self, request):
+        requested = request.META.get(HEADER) or request.GET.get(QUERY_PARAM)
+        user = getattr(request, "user", None)
+        if requested and user is not None and user.is_staff:
+            return "cprofile" if requested.lower() == "cprofile" else "timing"
+        if getattr(settings, "REQUEST_PROFILING", False):
+            return "timing"
+        return None
+
+    def _save(self, request, response, profile, profiler, duration_ms):
+        from common.models import RequestSample
+
+        match = request.resolver_match
+        view_name = (match.view_name if match else "")[:200]
+        duplicate_count, duplicate_sql = profile.duplicates()
+        profile_data = None
+        if profiler is not None:
+            profiler.create_stats()
+            profile_data = marshal.dumps(pstats.Stats(profiler).stats)
+
+        try:
+            record_latency(
+                view_name, round(duration_ms, 2), profile.sql_count, profile.sql_ms,
+                profile.template_ms, duplicate_count,
+            )
+            RequestSample.objects.create(
+                view_name=view_name,
+                path=request.path[:255],
+                method=request.method,
+                status_code=response.status_code,
+                user=request.user if request.user.is_authenticated else None,
+                duration_ms=round(duration_ms, 2),
+                sql_count=profile.sql_count,
+                sql_ms=round(profile.sql_ms, 2),
+                duplicate_queries=duplicate_count,
+                duplicate_sql=duplicate_sql[:2000],
+                template_ms=round(profile.template_ms, 2),
+                profile_data=profile_data,
+            )
+        except Exception:
+            logger.exception("Could not store request profile for %s", request.path)
+            return
+
+        self.samples_written += 1
+        if self.samples_written % PRUNE_EVERY == 0:
+            prune_samples()
+
+
+def retention_start():
+    days = getattr(settings, "REQUEST_PROFILING_RETENTION_DAYS", 7)
+    return timezone.now() - timedelta(days=days)
+
+
+def prune_samples():
+    """Drop samples and aggregate rows older than the retention window."""
+    from common.models import EndpointLatency, RequestSample
+
+    start = retention_start()
+    RequestSample.objects.filter(created_at__lt=start).delete()
+    EndpointLatency.objects.filter(window_start__lt=start - timedelta(hours=1)).delete()
+
+
+# ---------------- Rolling aggregate ----------------
+def record_latency(view_name, duration_ms, sql_count, sql_ms, template_ms, duplicates, now=None):
+    """Add one request to its URL name's aggregate row for the current hour and latency bucket."""
+    from common.models import EndpointLatency
+
+    window_start = (now or timezone.now()).replace(minute=0, second=0, microsecond=0)
+    row = EndpointLatency.objects.filter(
+        view_name=view_name, window_start=window_start, bucket=bisect_left(BUCKETS_MS, duration_ms),
+    )
+    changes = {
+        "count": F("count") + 1,
+        "duration_ms_sum": F("duration_ms_sum") + duration_ms,
+        "duration_ms_max": Greatest(F("duration_ms_max"), duration_ms),
+        "sql_count_sum": F("sql_count_sum") + sql_count,
+        "sql_ms_sum": F("sql_ms_sum") + sql_ms,
+        "template_ms_sum": F("template_ms_sum") + template_ms,
+        "duplicate_queries_sum": F("duplicate_queries_sum") + duplicates,
+    }
+    if row.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            EndpointLatency.objects.create(
+                view_name=view_name, window_start=window_start, bucket=bisect_left(BUCKETS_MS, duration_ms),
+                count=1, duration_ms_sum=duration_ms, duration_ms_max=duration_ms, sql_count_sum=sql_count,
+                sql_ms_sum=sql_ms, template_ms_sum=template_ms, duplicate_queries_sum=duplicates,
+            )
+    except IntegrityError:
+        row.update(**changes)  # created by a concurrent request
+
+
+# ---------------- Aggregation ----------------
+def histogram_percentile(counts, fraction, maximum):
+    """
+    Percentile from bucket counts (indexed like BUCKETS_MS, plus the open
+    bucket), interpolated linearly within the bucket it falls in and capped
+    at the largest value seen.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    rank = fraction * total
+    seen = 0
+    for bucket, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = BUCKETS_MS[bucket - 1] if bucket else 0
+            upper = BUCKETS_MS[bucket] if bucket < len(BUCKETS_MS) else maximum
+            return min(lower + (upper - lower) * (rank - seen) / count, maximum)
+        seen += count
+    return maximum
+
+
+def endpoint_summary(since=None):
+    """
+    Latency and query statistics per URL name from the rolling aggregate
+    (since the retention window start by default), slowest p95 first.
+    """
+    from common.models import EndpointLatency
+
+    rows = (
+        EndpointLatency.objects.filter(window_start__gte=since or retention_start() - timedelta(hours=1))
+        .values_list("view_name", "bucket")
+        .annotate(
+            count=Sum("count"), duration_max=Max("duration_ms_max"), sql_count=Sum("sql_count_sum"),
+            sql_ms=Sum("sql_ms_sum"), template_ms=Sum("template_ms_sum"), duplicates=Sum("duplicate_queries_sum"),
+        )
+        .order_by("view_name", "bucket")
+    )
+    endpoints = {}
+    for view_name, bucket, count, duration_max, sql_count, sql_ms, template_ms, duplicates in rows:
+        endpoint = endpoints.setdefault(view_name, {
+            "counts": [0] * (len(BUCKETS_MS) + 1), "max": 0.0,
+            "sql_count": 0, "sql_ms": 0.0, "template_ms": 0.0, "duplicates": 0,
+        })
+        endpoint["counts"][bucket] += count
+        endpoint["max"] = max(endpoint["max"], duration_max)
+        endpoint["sql_count"] += sql_count
+        endpoint["sql_ms"] += sql_ms
+        endpoint["template_ms"] += template_ms
+        endpoint["duplicates"] += duplicates
+
+    summary = []
+    for view_name, endpoint in endpoints.items():
+        count = sum(endpoint["counts"])
+        summary.append({
+            "view_name": view_name or "(unresolved)",
+            "count": count,
+            "p50": histogram_percentile(endpoint["counts"], 0.50, endpoint["max"]),
+            "p95": histogram_percentile(endpoint["counts"], 0.95, endpoint["max"]),
+            "max": endpoint["max"],
+            "avg_sql_count": endpoint["sql_count"] / count,
+            "avg_sql_ms": endpoint["sql_ms"] / count,
+            "avg_template_ms": endpoint["template_ms"] / count,
+            "avg_duplicates": endpoint["duplicates"] / count,
+        })
+    summary.sort(key=itemgetter("p95"), reverse=True)
+    return summary
@@ -0,0 +1,60 @@
+"""
+Test helpers shared by all apps.
+
+Every app's tests import TestCase from here, so each test also fails when
+one SQL template runs more than `nplusone_threshold` times (see
+common.nplusone). Raise the threshold on a test class that legitimately
+repeats queries, or check a block with assertNoNPlusOne().
+"""
+from datetime import date
+
+from django import test
+
+from .nplusone import QueryShapeTracker
+
+
+class NPlusOneTestMixin:
+    """Fail the test with the offending call stack when a query repeats too often."""
+    nplusone_threshold = None  # settings.NPLUSONE_THRESHOLD
+
+    def setUp(self):
+        super().setUp()
+        tracker = QueryShapeTracker(self.nplusone_threshold, raise_errors=True, label=self.id())
+        tracker.__enter__()
+        self.addCleanup(tracker.__exit__, None, None, None)
+
+    def assertNoNPlusOne(self, threshold=None):
+        """Context manager checking only the enclosed block."""
+        return QueryShapeTracker(threshold or self.nplusone_threshold, raise_errors=True, label=self.id())
+
+
+class TestCase(NPlusOneTestMixin, test.TestCase):
+    pass
+
+
+class TransactionTestCase(NPlusOneTestMixin, test.TransactionTestCase):
+    pass
+
+
+def create_project(code="P-001", **fields):
+    """A project (and its client) with a plan running through 2025."""
+    from projects.models import Project
+    from setup.models import Client
+
+    client, _created = Client.objects.get_or_create(
+        tin_number="100-200-300", defaults={"name": "Client", "postal_address": "P.O. Box 1", "city": "Dodoma"},
+    )
+    defaults = {
+        "project_name": f"Project {code}",
+        "location": "Dodoma",
+        "client": client,
+        "contract_sum": 1_000_000,
+        "contract_duration_months": 12,
+        "contract_signing_date": date(2025, 1, 1),
+        "site_possession_date": date(2025, 1, 1),
+        "mobilization_start": date(2025, 1, 1),
+        "mobilization_end": date(2025, 1, 31),
+        "commencement_date": date(2025, 1, 1),
+        "practical_completion_date": date(2025, 12, 31),
+    }
+    return Project.objects.create(project_code=code, **{**defaults, **fields})
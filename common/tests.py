@@ -1,3 +1,55 @@
-from django.test import TestCase
+from django.contrib.auth.models import Permission
 
-# Create your tests here.
+from common.cache import bump_project_version, get_project_version, get_project_versions
+from common.nplusone import NPlusOneError, QueryShapeTracker, query_shape
+from common.testing import TestCase, create_project
+
+
+class QueryShapeTrackerTests(TestCase):
+    nplusone_threshold = 100  # the tests below repeat queries on purpose
+
+    def permissions(self):
+        return Permission.objects.order_by("pk")[:5]
+
+    def test_query_shape_collapses_in_lists(self):
+        self.assertEqual(
+            query_shape('SELECT "id"  FROM "t" WHERE "id" IN (%s, %s, %s)'),
+            'SELECT "id" FROM "t" WHERE "id" IN (...)',
+        )
+
+    def test_raises_on_repeated_query(self):
+        with self.assertRaises(NPlusOneError) as raised:
+            with QueryShapeTracker(threshold=3, raise_errors=True, label="loop"):
+                for permission in self.permissions():
+                    permission.content_type.app_label
+        self.assertIn("5x SELECT", str(raised.exception))
+        self.assertIn("common/tests.py", str(raised.exception))
+
+    def test_select_related_passes(self):
+        with QueryShapeTracker(threshold=3, raise_errors=True) as tracker:
+            for permission in self.permissions().select_related("content_type"):
+                permission.content_type.app_label
+        self.assertEqual(tracker.violations, [])
+        self.assertEqual(sum(tracker.counts.values()), 1)
+
+    def test_warns_instead_of_raising(self):
+        with self.assertLogs("common.nplusone", "WARNING"):
+            with QueryShapeTracker(threshold=3, raise_errors=False):
+                for permission in self.permissions():
+                    permission.content_type.app_label
+
+    def test_assert_no_nplusone(self):
+        with self.assertRaises(NPlusOneError):
+            with self.assertNoNPlusOne(threshold=3):
+                for permission in self.permissions():
+                    permission.content_type.app_label
+
+
+class ProjectVersionTests(TestCase):
+    def test_versions_of_many_projects_in_one_query(self):
+        bumped, untouched = create_project("P-001"), create_project("P-002")
+        bump_project_version(bumped.pk)
+        with self.assertNumQueries(1):
+            versions = get_project_versions([bumped.pk, untouched.pk])
+        self.assertEqual(versions, {project.pk: get_project_version(project.pk) for project in (bumped, untouched)})
+        self.assertEqual(versions[untouched.pk], 1)
@@ -1,3 +1,24 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from .metrics import exposition
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint, answered only for "Authorization: Bearer
+    <METRICS_TOKEN>" (404 otherwise, and always when no token is set).
+
+    REMOTE_ADDR is the proxy's address behind nginx, so METRICS_ALLOWED_IPS
+    is only an additional restriction, never a replacement for the token.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    scheme, _, supplied = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    if not token or scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip(), token):
+        raise Http404
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", [])
+    if allowed and request.META.get("REMOTE_ADDR") not in allowed:
+        raise Http404
+    return HttpResponse(exposition(), content_type="text/plain; version=0.0.4; charset=utf-8")
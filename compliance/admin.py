@@ -1,9 +1,12 @@
 from django.contrib import admin
+
+from common.admin import ActiveListFilter, restore_selected, soft_delete_selected
 from .models import Compliance
 
 # admin.py
 @admin.register(Compliance)
 class ComplianceAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         'project',
         'authority',
@@ -12,7 +15,7 @@ class ComplianceAdmin(admin.ModelAdmin):
         'expiry_date',
         'is_active',
     )
-    list_filter = ('authority', 'status', 'is_active')
+    list_filter = ('authority', 'status', ActiveListFilter)
     search_fields = ('registration_no', 'project__project_name')
     ordering = ('expiry_date',)
 
@@ -37,11 +37,11 @@ class BaseForm(forms.ModelForm):
 
         # Filter project dropdown if exists
         if "project" in self.fields:
-            self.fields["project"].queryset = Project.objects.filter(is_active=True)
+            self.fields["project"].queryset = Project.active.all()
 
         # Filter authority dropdown if exists
         if "authority" in self.fields:
-            self.fields["authority"].queryset = Authority.objects.filter(is_active=True)
+            self.fields["authority"].queryset = Authority.active.all()
 
 
 # ---------------- Compliance Form ----------------
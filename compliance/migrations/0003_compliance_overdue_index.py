@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0002_alter_compliance_authority'),
+        ('projects', '0004_overdue_sweep'),
+        ('setup', '0007_alter_authority_options_alter_workcategory_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='compliance',
+            index=models.Index(fields=['project', 'status', 'expiry_date'], name='compliance_proj_status_exp_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0003_compliance_overdue_index'),
+        ('projects', '0005_project_archived_at'),
+        ('setup', '0007_alter_authority_options_alter_workcategory_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='compliance',
+            index=models.Index(fields=['is_active', 'expiry_date'], name='compliance_active_exp_idx'),
+        ),
+    ]
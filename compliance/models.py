@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from projects.models import Project
 from setup.models import Authority 
+from common.managers import ActiveManager, SoftDeleteManager
 
 class Compliance(models.Model):
 
@@ -28,8 +29,15 @@ class Compliance(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ['expiry_date']
+        indexes = [
+            models.Index(fields=['project', 'status', 'expiry_date'], name='compliance_proj_status_exp_idx'),
+            models.Index(fields=['is_active', 'expiry_date'], name='compliance_active_exp_idx'),
+        ]
         permissions = [
             ("can_approve_compliance", "Can approve compliance"),
         ]
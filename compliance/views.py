@@ -12,8 +12,7 @@ from .forms import ComplianceForm
 def compliance_list(request):
     search = request.GET.get('q', '').strip()
 
-    queryset = Compliance.objects.filter(is_active=True)\
-        .select_related("project", "authority")
+    queryset = Compliance.active.select_related("project", "authority")
 
     if search:
         queryset = queryset.filter(
@@ -58,7 +57,7 @@ def compliance_create(request):
 @login_required
 @permission_required('compliance.change_compliance', raise_exception=True)
 def compliance_update(request, pk):
-    obj = get_object_or_404(Compliance, pk=pk, is_active=True)
+    obj = get_object_or_404(Compliance.active, pk=pk)
     form = ComplianceForm(request.POST or None, instance=obj)
 
     if form.is_valid():
@@ -79,11 +78,10 @@ def compliance_update(request, pk):
 @login_required
 @permission_required('compliance.delete_compliance', raise_exception=True)
 def compliance_delete(request, pk):
-    obj = get_object_or_404(Compliance, pk=pk, is_active=True)
+    obj = get_object_or_404(Compliance.active, pk=pk)
 
     if request.method == "POST":
-        obj.is_active = False
-        obj.save()
+        Compliance.objects.filter(pk=obj.pk).soft_delete()
         messages.success(request, "Compliance record deleted.")
         return redirect('compliance:compliance_list')
 
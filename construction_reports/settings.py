@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -33,6 +34,7 @@ INSTALLED_APPS = [
     #new apps
     'accounts.apps.AccountsConfig',
     'widget_tweaks',
+    'rest_framework',
     'reports',
     'projects',
     'finance',
@@ -43,10 +45,13 @@ INSTALLED_APPS = [
     'progress',
     'quality',
     'resources',
+    'api',
 
 ]
 
 MIDDLEWARE = [
+    'common.metrics.MetricsMiddleware',
+    'common.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,6 +62,7 @@ MIDDLEWARE = [
     
     # 'accounts.apps.AccountsConfig',
     'accounts.middleware.DisableClientSideCachingMiddleware',
+    'common.profiling.RequestProfilingMiddleware',
 
 ]
 
@@ -107,6 +113,9 @@ DATABASES = {
     }
 }
 
+# Report datasets (reports.datasets) are routed to their own SQLite alias
+DATABASE_ROUTERS = ["reports.routers.DatasetRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -157,3 +166,48 @@ LOGOUT_REDIRECT_URL = "/auth/login/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Read-only API (api app)
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticated',
+        'api.permissions.DjangoModelViewPermissions',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.ApiCursorPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Report generation timings stored in reports.ReportRun (see reports/instrumentation.py)
+REPORT_RUNS_ENABLED = True
+REPORT_RUNS_TRACE_MEMORY = False  # tracemalloc slows downloads down; enable while investigating memory
+
+# Request profiling (see common/profiling.py). Staff can always profile a
+# single request with the "X-Profile: 1" or "X-Profile: cprofile" header.
+REQUEST_PROFILING = False
+REQUEST_PROFILING_RETENTION_DAYS = 7
+
+# Prometheus metrics at /metrics (see common/metrics.py), shared by all
+# workers through a local SQLite file. The scraper must send
+# "Authorization: Bearer <METRICS_TOKEN>"; without a token the endpoint
+# answers 404. Behind nginx on the same host every request arrives from
+# 127.0.0.1, so client addresses cannot protect it: METRICS_ALLOWED_IPS is
+# only an extra check (empty: any address) for deployments where the
+# scraper reaches gunicorn directly.
+METRICS_DB = BASE_DIR / 'metrics.sqlite3'
+METRICS_FLUSH_SECONDS = 1
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = []
+
+# N+1 query detection (see common/nplusone.py): log the call stack when one
+# SQL template runs more than NPLUSONE_THRESHOLD times in a request.
+NPLUSONE_ENABLED = DEBUG
+NPLUSONE_THRESHOLD = 10
+NPLUSONE_RAISE = False
@@ -4,6 +4,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from common import views as common_views
+
 def home_redirect(request):
     return redirect("/auth/dashboard/") if request.user.is_authenticated else redirect("/auth/login/")
 
@@ -20,6 +22,8 @@ urlpatterns = [
     path('progress/', include('progress.urls')),
     path('quality/', include('quality.urls')),
     path('resources/', include('resources.urls')),
+    path('api/', include('api.urls')),
+    path('metrics', common_views.metrics, name='metrics'),
 ]
 
 
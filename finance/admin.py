@@ -1,9 +1,12 @@
 from django.contrib import admin
-from .models import PaymentCertificate, FundTransaction
+
+from common.admin import ActiveListFilter, restore_selected, soft_delete_selected
+from .models import EarnedValuePeriod, MonthlyCashFlow, PaymentCertificate, FundTransaction
 
 
 @admin.register(PaymentCertificate)
 class PaymentCertificateAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         "project",
         "certificate_no",
@@ -12,13 +15,14 @@ class PaymentCertificateAdmin(admin.ModelAdmin):
         "payment_date",
         "is_active",
     )
-    list_filter = ("project", "payment_date", "is_active")
+    list_filter = ("project", "payment_date", ActiveListFilter)
     search_fields = ("certificate_no", "pv_no", "amount_to")
     readonly_fields = ("created_at",)
 
 
 @admin.register(FundTransaction)
 class FundTransactionAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         "project",
         "date",
@@ -28,6 +32,40 @@ class FundTransactionAdmin(admin.ModelAdmin):
         "balance_after",
         "is_active",
     )
-    list_filter = ("project", "type", "date", "is_active")
+    list_filter = ("project", "type", "date", ActiveListFilter)
     search_fields = ("payee", "pv_or_receipt_no")
     readonly_fields = ("balance_after", "created_at")
+
+
+@admin.register(EarnedValuePeriod)
+class EarnedValuePeriodAdmin(admin.ModelAdmin):
+    list_display = (
+        "project",
+        "period",
+        "planned_value",
+        "earned_value",
+        "actual_cost",
+        "updated_at",
+    )
+    list_filter = ("project",)
+    readonly_fields = ("updated_at",)
+
+
+@admin.register(MonthlyCashFlow)
+class MonthlyCashFlowAdmin(admin.ModelAdmin):
+    list_display = (
+        "project",
+        "period",
+        "certified",
+        "paid",
+        "credits",
+        "debits",
+        "closing_balance",
+    )
+    list_filter = ("project",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,218 @@
+"""
+Monthly cash flow per project (MonthlyCashFlow).
+
+Payment certificates count as certified in the month of date_certified and
+as paid in the month of payment_date; fund transactions count as credits or
+debits in the month of their date. Soft-deleted rows count for nothing.
+
+Rows are maintained by delta from signals: the row's contribution before the
+change is read in pre_save/pre_delete, and the difference with the new one
+is added to its month (month sums) and to that month and every later one
+(cumulative columns and closing balance), one UPDATE each. A month row is
+created on first use, starting from the cumulative values of the month
+before it. Writes lock the project row, like the fund ledger.
+
+cash_flow_summary() answers any from/to range from at most two month rows
+plus the raw rows of the partial months at the range edges.
+
+Bulk writes bypass signals: rebuild_cash_flow() recomputes the rows
+(manage.py rebuild_cash_flow).
+"""
+import calendar
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from projects.models import Project
+
+from .ledger import lock_projects
+from .models import FundTransaction, MonthlyCashFlow, PaymentCertificate
+
+ZERO = Decimal("0.00")
+
+MONTH_FIELDS = ("certified", "paid", "credits", "debits")
+CUMULATIVE_FIELDS = {field: f"cumulative_{field}" for field in MONTH_FIELDS}
+BALANCE_SIGN = {"credits": 1, "debits": -1}
+
+SNAPSHOT_FIELDS = {
+    PaymentCertificate: ("project_id", "is_active", "date_certified", "certified_amount", "payment_date", "amount_paid"),
+    FundTransaction: ("project_id", "is_active", "date", "type", "amount_paid"),
+}
+
+
+def month_start(date):
+    return date.replace(day=1)
+
+
+def month_end(date):
+    return date.replace(day=calendar.monthrange(date.year, date.month)[1])
+
+
+# ---------------- Deltas ----------------
+def snapshot(instance):
+    return {field: getattr(instance, field) for field in SNAPSHOT_FIELDS[type(instance)]}
+
+
+def fetch(model, pk):
+    return model.objects.filter(pk=pk).values(*SNAPSHOT_FIELDS[model]).first()
+
+
+def entries(model, row):
+    """[(project id, period, month field, amount)] contributed by a row snapshot."""
+    if not row or not row["is_active"]:
+        return []
+    project_id = row["project_id"]
+    if model is PaymentCertificate:
+        return [
+            (project_id, month_start(row["date_certified"]), "certified", row["certified_amount"]),
+            (project_id, month_start(row["payment_date"]), "paid", row["amount_paid"]),
+        ]
+    field = "credits" if row["type"] == FundTransaction.CREDIT else "debits"
+    return [(project_id, month_start(row["date"]), field, row["amount_paid"])]
+
+
+def _month_row(project_id, period):
+    """Create the month row if missing, carrying the cumulative values of the month before."""
+    if MonthlyCashFlow.objects.filter(project_id=project_id, period=period).exists():
+        return
+    previous = (
+        MonthlyCashFlow.objects.filter(project_id=project_id, period__lt=period)
+        .order_by("-period").first()
+    )
+    carried = {
+        name: getattr(previous, name) if previous else ZERO
+        for name in (*CUMULATIVE_FIELDS.values(), "closing_balance")
+    }
+    MonthlyCashFlow.objects.create(project_id=project_id, period=period, **carried)
+
+
+def apply_change(model, before, after):
+    """Move a row's contribution from its `before` to its `after` snapshot (either may be None)."""
+    deltas = defaultdict(lambda: defaultdict(Decimal))
+    for project_id, period, field, amount in entries(model, before):
+        deltas[(project_id, period)][field] -= amount
+    for project_id, period, field, amount in entries(model, after):
+        deltas[(project_id, period)][field] += amount
+    deltas = {
+        key: {field: amount for field, amount in fields.items() if amount}
+        for key, fields in deltas.items()
+    }
+    deltas = {key: fields for key, fields in deltas.items() if fields}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        lock_projects({project_id for project_id, _period in deltas})
+        for (project_id, period), fields in sorted(deltas.items()):
+            _month_row(project_id, period)
+            MonthlyCashFlow.objects.filter(project_id=project_id, period=period).update(**{
+                field: F(field) + amount for field, amount in fields.items()
+            })
+            later = {CUMULATIVE_FIELDS[field]: F(CUMULATIVE_FIELDS[field]) + amount for field, amount in fields.items()}
+            balance = sum(amount * BALANCE_SIGN[field] for field, amount in fields.items() if field in BALANCE_SIGN)
+            if balance:
+                later["closing_balance"] = F("closing_balance") + balance
+            MonthlyCashFlow.objects.filter(project_id=project_id, period__gte=period).update(**later)
+
+
+# ---------------- Full rebuild ----------------
+def rebuild_cash_flow(project_ids):
+    """
+    Recompute the month rows of the given projects from the source tables.
+    Archived projects keep their rows (projects.archive).
+    """
+    project_ids = sorted(
+        set(project_ids) - set(Project.objects.filter(archived_at__isnull=False).values_list("pk", flat=True))
+    )
+    sums = defaultdict(lambda: defaultdict(Decimal))  # (project, period) -> {field: amount}
+    sources = [
+        (PaymentCertificate, "date_certified", Sum("certified_amount"), "certified", {}),
+        (PaymentCertificate, "payment_date", Sum("amount_paid"), "paid", {}),
+        (FundTransaction, "date", Sum("amount_paid"), "credits", {"type": FundTransaction.CREDIT}),
+        (FundTransaction, "date", Sum("amount_paid"), "debits", {"type": FundTransaction.DEBIT}),
+    ]
+    for model, date_field, total, field, filters in sources:
+        rows = (
+            model.objects.filter(project_id__in=project_ids, is_active=True, **filters)
+            .annotate(period=TruncMonth(date_field)).values_list("project_id", "period")
+            .annotate(total=total).order_by()
+        )
+        for project_id, period, amount in rows:
+            sums[(project_id, period)][field] += amount
+
+    months = []
+    running = defaultdict(lambda: defaultdict(Decimal))
+    for (project_id, period), fields in sorted(sums.items()):
+        totals = running[project_id]
+        for field in MONTH_FIELDS:
+            totals[field] += fields[field]
+        months.append(MonthlyCashFlow(
+            project_id=project_id,
+            period=period,
+            **{field: fields[field] for field in MONTH_FIELDS},
+            **{CUMULATIVE_FIELDS[field]: totals[field] for field in MONTH_FIELDS},
+            closing_balance=totals["credits"] - totals["debits"],
+        ))
+
+    with transaction.atomic():
+        lock_projects(project_ids)
+        MonthlyCashFlow.objects.filter(project_id__in=project_ids).delete()
+        MonthlyCashFlow.objects.bulk_create(months)
+    return len(months)
+
+
+# ---------------- Queries ----------------
+def _totals_at(project_id, day):
+    """Cumulative certified/paid/credits/debits at the end of `day`."""
+    period = month_start(day)
+    full_month = day == month_end(day)
+    rows = MonthlyCashFlow.objects.filter(project_id=project_id)
+    row = (rows.filter(period__lte=period) if full_month else rows.filter(period__lt=period)).order_by("-period").first()
+    totals = {field: getattr(row, CUMULATIVE_FIELDS[field]) if row else ZERO for field in MONTH_FIELDS}
+    if full_month:
+        return totals
+
+    # Partial month: add the raw rows from the first of the month to `day`
+    certified = Q(date_certified__range=(period, day))
+    paid = Q(payment_date__range=(period, day))
+    certificates = PaymentCertificate.objects.filter(certified | paid, project_id=project_id, is_active=True).aggregate(
+        certified=Sum("certified_amount", filter=certified),
+        paid=Sum("amount_paid", filter=paid),
+    )
+    transactions = FundTransaction.objects.filter(project_id=project_id, is_active=True, date__range=(period, day)).aggregate(
+        credits=Sum("amount_paid", filter=Q(type=FundTransaction.CREDIT)),
+        debits=Sum("amount_paid", filter=Q(type=FundTransaction.DEBIT)),
+    )
+    for field, amount in {**certificates, **transactions}.items():
+        totals[field] += amount or ZERO
+    return totals
+
+
+def cash_flow_summary(project_id, from_date=None, to_date=None):
+    """
+    Certified, paid, credits and debits between two dates (inclusive, open
+    ended when None), the fund balance before and after the range and the
+    cumulative certified/paid amounts at its end.
+    """
+    if to_date is None:
+        last = MonthlyCashFlow.objects.filter(project_id=project_id).order_by("-period").first()
+        end = {field: getattr(last, CUMULATIVE_FIELDS[field]) if last else ZERO for field in MONTH_FIELDS}
+    else:
+        end = _totals_at(project_id, to_date)
+    if from_date is None:
+        start = dict.fromkeys(MONTH_FIELDS, ZERO)
+    else:
+        start = _totals_at(project_id, from_date - datetime.timedelta(days=1))
+
+    summary = {field: end[field] - start[field] for field in MONTH_FIELDS}
+    summary.update(
+        opening_balance=start["credits"] - start["debits"],
+        closing_balance=end["credits"] - end["debits"],
+        cumulative_certified=end["certified"],
+        cumulative_paid=end["paid"],
+    )
+    return summary
@@ -0,0 +1,247 @@
+"""
+Earned value management (EVM) per project.
+
+- Budget at completion (BAC): Project.contract_sum
+- Planned value (PV): BAC x weighted planned progress (sitemanage S-curve)
+- Earned value (EV): BAC x weighted actual progress from progress logs
+- Actual cost (AC): cumulative certified amount of payment certificates
+
+All three series are built month by month in one pass over array columns,
+then stored in EarnedValuePeriod. Rows are rewritten only when their values
+changed. The series are cumulative, so a certificate or progress log dated
+in some month only affects that month and the ones after it: saves refresh
+from that month on, and several changes committed together are merged into
+one refresh from the earliest of them (schedule_evm_refresh). Plan and
+contract sum changes refresh every period.
+
+The current month decides which periods have earned value and actual cost,
+so the rollup also goes stale when the month changes and nothing is saved:
+run `manage.py refresh_evm` daily, like `manage.py sweep_overdue`.
+"""
+import datetime
+from array import array
+from bisect import bisect_right
+from decimal import Decimal
+from itertools import accumulate
+from threading import local
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from common.cache import get_project_version
+from projects.models import Project
+from sitemanage.scurve import ProgressColumns
+
+from .models import EarnedValuePeriod, PaymentCertificate
+
+CENT = Decimal("0.01")
+
+
+def _month_start(date):
+    return date.replace(day=1)
+
+
+def _next_month(date):
+    return (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def _money(value):
+    return Decimal(str(value)).quantize(CENT)
+
+
+def compute_evm_periods(project, today=None):
+    """Return [(period, planned_value, earned_value, actual_cost), ...] cumulative per month."""
+    columns = ProgressColumns(project.id)
+    bac = float(project.contract_sum or 0)
+
+    certificates = PaymentCertificate.objects.filter(
+        project_id=project.id, is_active=True
+    ).order_by("date_certified", "id").values_list("date_certified", "certified_amount")
+    cost_days = array("l")
+    cost_amounts = array("d")
+    for date, amount in certificates:
+        day = date.toordinal()
+        if cost_days and cost_days[-1] == day:
+            cost_amounts[-1] += float(amount)
+        else:
+            cost_days.append(day)
+            cost_amounts.append(float(amount))
+    actual_cost = array("d", accumulate(cost_amounts))
+
+    bounds = []
+    if columns:
+        bounds += [columns.range_start, columns.range_end]
+    if cost_days:
+        bounds += [cost_days[0], cost_days[-1]]
+    if not bounds:
+        return []
+
+    today = today or timezone.localdate()
+    current_period = _month_start(today)
+
+    periods = []
+    period = _month_start(datetime.date.fromordinal(min(bounds)))
+    last_period = _month_start(datetime.date.fromordinal(max(bounds)))
+    while period <= last_period:
+        period_end = (_next_month(period) - datetime.timedelta(days=1)).toordinal()
+        planned = bac * columns.planned_at(period_end) if columns else 0.0
+
+        if period > current_period:
+            earned = cost = None
+        else:
+            earned = _money(bac * columns.earned_at(period_end)) if columns else Decimal("0.00")
+            position = bisect_right(cost_days, period_end)
+            cost = _money(actual_cost[position - 1] if position else 0.0)
+
+        periods.append((period, _money(planned), earned, cost))
+        period = _next_month(period)
+
+    return periods
+
+
+def _refreshed_key(project_id):
+    return f"evm-refreshed:{project_id}"
+
+
+def refresh_project_evm(project_id, force=False, since=None):
+    """
+    Bring the EarnedValuePeriod rows of a project up to date. With `since`,
+    only the rows from that month on are read and rewritten, plus the months
+    the project's range gained or lost.
+
+    A full refresh is skipped when neither the project's data version nor the
+    current month has moved since the last one.
+    """
+    marker = (get_project_version(project_id), _month_start(timezone.localdate()))
+    if not force and since is None and cache.get(_refreshed_key(project_id)) == marker:
+        return 0
+
+    project = Project.objects.filter(pk=project_id).first()
+    if project is None:
+        return 0
+
+    computed = {
+        period: (planned, earned, cost)
+        for period, planned, earned, cost in compute_evm_periods(project)
+    }
+
+    changed = 0
+    with transaction.atomic():
+        rows = project.earned_value_periods.all()
+        if since is not None:
+            stored = set(rows.values_list("period", flat=True))
+            window = _month_start(since)
+            affected = {period for period in computed if period >= window or period not in stored}
+            affected |= stored - set(computed)
+            computed = {period: values for period, values in computed.items() if period in affected}
+            rows = rows.filter(period__in=affected)
+        existing = {row.period: row for row in rows}
+
+        stale = [row.pk for period, row in existing.items() if period not in computed]
+        if stale:
+            EarnedValuePeriod.objects.filter(pk__in=stale).delete()
+
+        to_create, to_update = [], []
+        for period, (planned, earned, cost) in computed.items():
+            row = existing.get(period)
+            if row is None:
+                to_create.append(EarnedValuePeriod(
+                    project=project, period=period,
+                    planned_value=planned, earned_value=earned, actual_cost=cost,
+                ))
+            elif (row.planned_value, row.earned_value, row.actual_cost) != (planned, earned, cost):
+                row.planned_value, row.earned_value, row.actual_cost = planned, earned, cost
+                row.updated_at = timezone.now()
+                to_update.append(row)
+
+        EarnedValuePeriod.objects.bulk_create(to_create)
+        EarnedValuePeriod.objects.bulk_update(
+            to_update, ["planned_value", "earned_value", "actual_cost", "updated_at"]
+        )
+        changed = len(stale) + len(to_create) + len(to_update)
+
+    if since is None:
+        cache.set(_refreshed_key(project_id), marker, None)
+    return changed
+
+
+# project id: earliest date changed (None: every period), per thread
+_pending = local()
+
+
+def schedule_evm_refresh(project_id, since=None):
+    """
+    Refresh the rollup once the current transaction commits, from the month
+    of `since` (None: every period). Calls made in the same transaction are
+    merged into one refresh from the earliest date.
+    """
+    pending = _pending.__dict__.setdefault("projects", {})
+    if project_id in pending:
+        earlier = pending[project_id]
+        since = None if since is None or earlier is None else min(since, earlier)
+    pending[project_id] = since
+    transaction.on_commit(lambda: _run_pending_refresh(project_id))
+
+
+def _run_pending_refresh(project_id):
+    pending = _pending.__dict__.setdefault("projects", {})
+    if project_id in pending:
+        refresh_project_evm(project_id, since=pending.pop(project_id))
+
+
+def _ratio(numerator, denominator):
+    if not denominator:
+        return None
+    return round(float(numerator) / float(denominator), 2)
+
+
+def _latest_periods(today=None):
+    current_period = _month_start(today or timezone.localdate())
+    return EarnedValuePeriod.objects.filter(period__lte=current_period, earned_value__isnull=False)
+
+
+def latest_evm_periods(project_ids, today=None):
+    """{project id: latest EarnedValuePeriod with earned value} for many projects, in one query."""
+    latest = _latest_periods(today).filter(project=OuterRef("project")).order_by("-period").values("pk")[:1]
+    return {
+        row.project_id: row
+        for row in EarnedValuePeriod.objects.filter(project_id__in=list(project_ids), pk=Subquery(latest))
+    }
+
+
+def get_evm_summary(project, today=None):
+    """
+    Latest EVM position of a project from the rollup table.
+
+    Returns None when no period has been computed yet.
+    """
+    return evm_summary(project, _latest_periods(today).filter(project=project).order_by("-period").first())
+
+
+def evm_summary(project, row):
+    """EVM position of a project from its latest period row (None: no row)."""
+    if row is None:
+        return None
+
+    bac = project.contract_sum or Decimal("0")
+    pv, ev, ac = row.planned_value, row.earned_value, row.actual_cost
+    cpi = _ratio(ev, ac)
+    spi = _ratio(ev, pv)
+    eac = _money(float(bac) / cpi) if cpi else None
+
+    return {
+        "period": row.period,
+        "budget_at_completion": bac,
+        "planned_value": pv,
+        "earned_value": ev,
+        "actual_cost": ac,
+        "cost_variance": ev - ac,
+        "schedule_variance": ev - pv,
+        "cpi": cpi,
+        "spi": spi,
+        "estimate_at_completion": eac,
+        "estimate_to_complete": eac - ac if eac is not None else None,
+        "variance_at_completion": bac - eac if eac is not None else None,
+    }
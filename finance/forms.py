@@ -32,7 +32,7 @@ class PaymentCertificateForm(RequiredFieldMixin, forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Only active projects
-        self.fields["project"].queryset = Project.objects.filter(is_active=True)
+        self.fields["project"].queryset = Project.active.all()
         for field in self.fields.values():
             field.required = True
 
@@ -55,6 +55,6 @@ class FundTransactionForm(RequiredFieldMixin, forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["project"].queryset = Project.objects.filter(is_active=True)
+        self.fields["project"].queryset = Project.active.all()
         for field in self.fields.values():
             field.required = True
@@ -0,0 +1,215 @@
+"""
+Running balances of fund transactions.
+
+FundTransaction.balance_after is the project's fund balance after the row,
+in (date, id) order. Active credits add and active debits subtract;
+soft-deleted rows add nothing and carry the balance of the row before them.
+
+Every write locks the project row first (SELECT ... FOR UPDATE), so two
+writers for the same project never start from the same previous balance:
+
+- appending (a new row dated on or after the latest one) stores the
+  previous balance plus the amount, read once under the lock;
+- anything else (a back-dated insert, an edit, a soft delete, a move to
+  another project) saves the row and then rewrites the balances from the
+  earliest affected date onwards with one UPDATE over a window SUM;
+- a delete, one by one or in bulk (queryset, admin), reposts from the
+  deleted row's date (finance.signals).
+
+import_transactions() creates many rows at once: balances are accumulated
+in memory and the rows written with bulk_create.
+
+Balances written by UPDATE or bulk_create send no signals, so the affected
+projects' ProjectStats.fund_balance is refreshed here.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from common.cache import bump_project_version
+from projects.archive import check_not_archived
+from projects.models import Project
+from projects.stats import refresh_recomputed
+
+from .models import FundTransaction
+
+ZERO = Decimal("0.00")
+
+
+def signed_amount(tx):
+    """Contribution of a transaction to the balance."""
+    if not tx.is_active:
+        return ZERO
+    return tx.amount_paid if tx.type == FundTransaction.CREDIT else -tx.amount_paid
+
+
+def lock_projects(project_ids):
+    """Lock project rows in id order (a consistent order avoids deadlocks)."""
+    list(Project.objects.select_for_update().filter(pk__in=project_ids).order_by("pk").values_list("pk"))
+
+
+def _head(project_id):
+    """(date, balance_after) of the project's last transaction, or None."""
+    return (
+        FundTransaction.objects.filter(project_id=project_id)
+        .order_by("-date", "-id").values_list("date", "balance_after").first()
+    )
+
+
+def _opening_balance(project_id, from_date):
+    """Balance before the first transaction dated `from_date` or later."""
+    if from_date is None:
+        return ZERO
+    balance = (
+        FundTransaction.objects.filter(project_id=project_id, date__lt=from_date)
+        .order_by("-date", "-id").values_list("balance_after", flat=True).first()
+    )
+    return balance if balance is not None else ZERO
+
+
+# ---------------- Recomputation ----------------
+def recompute_balances(project_id, from_date=None):
+    """
+    Rewrite balance_after for the project's transactions dated `from_date` or
+    later (all of them when None) with one window-function UPDATE. Rows that
+    already hold the right balance are not written; changed rows get a new
+    updated_at (the finance export picks them up). Returns the number of rows
+    changed. Call with the project locked.
+    """
+    quote = connection.ops.quote_name
+    table = quote(FundTransaction._meta.db_table)
+    where = "project_id = %s" + (f" AND {quote('date')} >= %s" if from_date else "")
+    running = (
+        "SELECT id, ROUND(CAST(%s AS DECIMAL(15, 2)) + SUM(CASE WHEN is_active THEN"
+        f" (CASE WHEN {quote('type')} = %s THEN amount_paid ELSE -amount_paid END) ELSE 0 END)"
+        f" OVER (ORDER BY {quote('date')}, id), 2) AS balance"
+        f" FROM {table} WHERE {where}"
+    )
+    params = [_opening_balance(project_id, from_date), FundTransaction.CREDIT, project_id]
+    if from_date:
+        params.append(from_date)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    if connection.vendor == "mysql":
+        sql = (
+            f"UPDATE {table} JOIN ({running}) AS running ON {table}.id = running.id"
+            f" SET {table}.balance_after = running.balance, {table}.updated_at = %s"
+            f" WHERE {table}.balance_after <> running.balance"
+        )
+        params = [*params, now]
+    else:
+        sql = (
+            f"UPDATE {table} SET balance_after = running.balance, updated_at = %s FROM ({running}) AS running"
+            f" WHERE {table}.id = running.id AND {table}.balance_after <> running.balance"
+        )
+        params = [now, *params]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def _changed(project_ids):
+    refresh_recomputed(FundTransaction, project_ids)
+    for project_id in project_ids:
+        bump_project_version(project_id)
+
+
+def repost(project_id, from_date=None):
+    """Lock the project and rewrite its balances from `from_date` (all when None)."""
+    with transaction.atomic():
+        lock_projects([project_id])
+        changed = recompute_balances(project_id, from_date)
+    _changed([project_id])
+    return changed
+
+
+def rebuild_balances(project_ids=None):
+    """Recompute every balance of the given projects (all by default). Returns rows changed."""
+    if project_ids is None:
+        project_ids = FundTransaction.objects.values_list("project_id", flat=True).distinct()
+    return sum(repost(project_id) for project_id in sorted(set(project_ids)))
+
+
+# ---------------- Writes ----------------
+@contextmanager
+def posting(tx):
+    """
+    Wrap the database save of one transaction (used by FundTransaction.save).
+
+        with posting(tx):
+            super().save(*args, **kwargs)
+
+    Sets tx.balance_after when appending; otherwise the balances from the
+    earliest affected date are rewritten after the save.
+    """
+    with transaction.atomic():
+        before = None
+        if tx.pk is not None:
+            before = FundTransaction.objects.filter(pk=tx.pk).values_list("project_id", "date").first()
+        lock_projects({tx.project_id, before[0]} if before else {tx.project_id})
+
+        affected = {}
+        if before is None:
+            head = _head(tx.project_id)
+            if head is None or tx.date >= head[0]:
+                tx.balance_after = (head[1] if head else ZERO) + signed_amount(tx)
+            else:
+                affected[tx.project_id] = tx.date
+        else:
+            affected[before[0]] = before[1]
+            affected[tx.project_id] = min(tx.date, affected.get(tx.project_id, tx.date))
+        if tx.balance_after is None:
+            tx.balance_after = ZERO  # rewritten below
+
+        yield
+
+        for project_id, from_date in affected.items():
+            recompute_balances(project_id, from_date)
+        if affected:
+            tx.refresh_from_db(fields=["balance_after"])
+            _changed(affected)
+
+
+def import_transactions(transactions, batch_size=1000):
+    """
+    Create many unsaved FundTransaction objects, with their balances.
+
+    Rows are ordered by date per project (keeping the given order within a
+    day). When a project's rows all come after its existing transactions,
+    balances are accumulated in memory; otherwise the balances from the
+    earliest imported date are recomputed after the insert. Returns the
+    created objects.
+    """
+    from .cashflow import rebuild_cash_flow
+
+    by_project = defaultdict(list)
+    for tx in transactions:
+        by_project[tx.project_id].append(tx)
+
+    with transaction.atomic():
+        lock_projects(by_project)
+        for project_id in by_project:
+            check_not_archived(project_id)
+        created = []
+        back_dated = {}
+        for project_id, rows in by_project.items():
+            rows.sort(key=lambda tx: tx.date)
+            head = _head(project_id)
+            if head is not None and rows[0].date < head[0]:
+                back_dated[project_id] = rows[0].date
+                for tx in rows:
+                    tx.balance_after = ZERO  # rewritten below
+            else:
+                balance = head[1] if head else ZERO
+                for tx in rows:
+                    balance += signed_amount(tx)
+                    tx.balance_after = balance
+            created += FundTransaction.objects.bulk_create(rows, batch_size=batch_size)
+
+        for project_id, from_date in back_dated.items():
+            recompute_balances(project_id, from_date)
+    rebuild_cash_flow(by_project)
+    _changed(by_project)
+    return created
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from finance.cashflow import rebuild_cash_flow
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly cash-flow rollup (MonthlyCashFlow) from certificates and transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only rebuild this project id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        project_ids = options["projects"] or list(Project.objects.values_list("pk", flat=True))
+        months = rebuild_cash_flow(project_ids)
+        self.stdout.write(self.style.SUCCESS(f"Cash flow rebuilt: {months} month row(s) for {len(project_ids)} project(s)."))
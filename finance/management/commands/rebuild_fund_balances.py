@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from finance.ledger import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = "Recompute the running balance (balance_after) of fund transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only rebuild this project id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        changed = rebuild_balances(options["projects"])
+        self.stdout.write(self.style.SUCCESS(f"Fund balances rebuilt: {changed} transaction(s) corrected."))
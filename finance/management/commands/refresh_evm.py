@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from finance.evm import refresh_project_evm
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly earned value rollup (EarnedValuePeriod) for projects (run daily)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, help="Only refresh this project id")
+
+    def handle(self, *args, **options):
+        projects = Project.objects.filter(is_active=True)
+        if options["project"]:
+            projects = projects.filter(pk=options["project"])
+
+        for project_id in projects.values_list("pk", flat=True):
+            changed = refresh_project_evm(project_id, force=True)
+            self.stdout.write(f"Project {project_id}: {changed} period(s) updated")
+
+        self.stdout.write(self.style.SUCCESS("Earned value rollup refreshed."))
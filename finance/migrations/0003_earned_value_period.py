@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_alter_fundtransaction_options_and_more'),
+        ('projects', '0002_alter_projectparticipant_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EarnedValuePeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='First day of the month')),
+                ('planned_value', models.DecimalField(decimal_places=2, max_digits=18)),
+                ('earned_value', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('actual_cost', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='earned_value_periods', to='projects.project')),
+            ],
+            options={
+                'ordering': ['project', 'period'],
+                'constraints': [models.UniqueConstraint(fields=('project', 'period'), name='evm_project_period_uniq')],
+            },
+        ),
+    ]
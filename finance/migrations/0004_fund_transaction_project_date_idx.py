@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_earned_value_period'),
+        ('projects', '0004_overdue_sweep'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fundtransaction',
+            index=models.Index(fields=['project', 'date'], name='fundtx_project_date_idx'),
+        ),
+    ]
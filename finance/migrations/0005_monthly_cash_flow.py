@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_fund_transaction_project_date_idx'),
+        ('projects', '0004_overdue_sweep'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCashFlow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='First day of the month')),
+                ('certified', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('credits', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('debits', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('cumulative_certified', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('cumulative_paid', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('cumulative_credits', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('cumulative_debits', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('closing_balance', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cash_flow_months', to='projects.project')),
+            ],
+            options={
+                'ordering': ['project', 'period'],
+                'constraints': [models.UniqueConstraint(fields=('project', 'period'), name='cashflow_project_period_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def updated_from_created(apps, schema_editor):
+    """Existing rows were last changed when created, as far as the export knows."""
+    for name in ("PaymentCertificate", "FundTransaction"):
+        model = apps.get_model("finance", name)
+        model.objects.update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_monthly_cash_flow'),
+        ('projects', '0004_overdue_sweep'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('consumer', models.CharField(max_length=100, unique=True)),
+                ('positions', models.JSONField(blank=True, default=dict, help_text='Last (updated_at, id) exported per feed')),
+                ('exported_rows', models.PositiveIntegerField(default=0, help_text='Rows acknowledged in the last export')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['consumer'],
+            },
+        ),
+        migrations.AddField(
+            model_name='fundtransaction',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='paymentcertificate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(updated_from_created, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='fundtransaction',
+            index=models.Index(fields=['updated_at', 'id'], name='fundtx_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentcertificate',
+            index=models.Index(fields=['updated_at', 'id'], name='paycert_updated_idx'),
+        ),
+    ]
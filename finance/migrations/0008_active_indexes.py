@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0007_archive_tables'),
+        ('projects', '0005_project_archived_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fundtransaction',
+            index=models.Index(fields=['project', 'is_active', 'date'], name='fundtx_proj_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentcertificate',
+            index=models.Index(fields=['project', 'is_active', 'payment_date'], name='paycert_proj_active_idx'),
+        ),
+    ]
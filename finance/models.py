@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from projects.models import Project
+from common.managers import ActiveManager, SoftDeleteManager
 
 
 class PaymentCertificate(models.Model):
@@ -23,10 +24,18 @@ class PaymentCertificate(models.Model):
 
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["-payment_date"]
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="paycert_updated_idx"),
+            models.Index(fields=["project", "is_active", "payment_date"], name="paycert_proj_active_idx"),
+        ]
         # permissions = [
         #     ("view_paymentcertificate", "Can view Payment Certificates"),
         # ]
@@ -67,35 +76,150 @@ class FundTransaction(models.Model):
 
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["date", "id"]
+        indexes = [
+            models.Index(fields=["project", "date"], name="fundtx_project_date_idx"),
+            models.Index(fields=["updated_at", "id"], name="fundtx_updated_idx"),
+            models.Index(fields=["project", "is_active", "date"], name="fundtx_proj_active_idx"),
+        ]
         # permissions = [
         #     ("view_fundtransaction", "Can view Fund Transactions"),
         # ]
 
+    def clean(self):
+        from projects.archive import check_not_archived
+
+        check_not_archived(self.project_id)
+
     def save(self, *args, **kwargs):
         """
-        Auto-calculate running balance per project
+        Save with the running balance per project (see finance.ledger)
         """
-        last_tx = (
-            FundTransaction.objects
-            .filter(project=self.project)
-            .exclude(pk=self.pk)
-            .order_by("-date", "-id")
-            .first()
-        )
+        from .ledger import posting
 
-        previous_balance = last_tx.balance_after if last_tx else 0
+        with posting(self):
+            super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.project} | {self.type} | {self.amount_paid}"
 
-        if self.type == self.CREDIT:
-            self.balance_after = previous_balance + self.amount_paid
-        else:
-            self.balance_after = previous_balance - self.amount_paid
 
-        super().save(*args, **kwargs)
+
+class EarnedValuePeriod(models.Model):
+    """
+    Monthly earned value rollup per project (see finance.evm).
+
+    Values are cumulative at the end of the month. Earned value and actual
+    cost are empty for months after the current one.
+    """
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name="earned_value_periods"
+    )
+
+    period = models.DateField(help_text="First day of the month")
+    planned_value = models.DecimalField(max_digits=18, decimal_places=2)
+    earned_value = models.DecimalField(max_digits=18, decimal_places=2, null=True, blank=True)
+    actual_cost = models.DecimalField(max_digits=18, decimal_places=2, null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["project", "period"]
+        constraints = [
+            models.UniqueConstraint(fields=["project", "period"], name="evm_project_period_uniq"),
+        ]
 
     def __str__(self):
-        return f"{self.project} | {self.type} | {self.amount_paid}"
+        return f"{self.project} | {self.period:%Y-%m}"
+
+
+class MonthlyCashFlow(models.Model):
+    """
+    Monthly cash-flow rollup per project, maintained by delta (see finance.cashflow).
+
+    Month columns hold the sums of the month; cumulative columns and the
+    closing balance include every earlier month. Months without any
+    certificate or transaction have no row.
+    """
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name="cash_flow_months"
+    )
+    period = models.DateField(help_text="First day of the month")
 
+    certified = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    paid = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    credits = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    debits = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    cumulative_certified = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    cumulative_paid = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    cumulative_credits = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    cumulative_debits = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    closing_balance = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["project", "period"]
+        constraints = [
+            models.UniqueConstraint(fields=["project", "period"], name="cashflow_project_period_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.project} | {self.period:%Y-%m}"
+
+
+class ExportCursor(models.Model):
+    """
+    Position of a named consumer (e.g. the accounting system) in the
+    incremental finance export (see api.export).
+    """
+    consumer = models.CharField(max_length=100, unique=True)
+    positions = models.JSONField(default=dict, blank=True, help_text="Last (updated_at, id) exported per feed")
+    exported_rows = models.PositiveIntegerField(default=0, help_text="Rows acknowledged in the last export")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["consumer"]
+
+    def __str__(self):
+        return self.consumer
+
+
+# ---------------------------
+# ARCHIVE (see projects.archive)
+# ---------------------------
+class ArchivedFundTransaction(models.Model):
+    """FundTransaction row of an archived project, moved out of the live table with its id."""
+    id = models.BigIntegerField(primary_key=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="+")
+    date = models.DateField()
+    payee = models.CharField(max_length=255)
+    type = models.CharField(max_length=6, choices=FundTransaction.TRANSACTION_TYPES)
+    description = models.TextField()
+    amount_paid = models.DecimalField(max_digits=15, decimal_places=2)
+    balance_after = models.DecimalField(max_digits=15, decimal_places=2)
+    pv_or_receipt_no = models.CharField(max_length=50)
+    remarks = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="+")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ["date", "id"]
+        indexes = [
+            models.Index(fields=["project", "date"], name="arch_fundtx_project_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} | {self.type} | {self.amount_paid}"
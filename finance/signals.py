@@ -0,0 +1,127 @@
+from django.db.models import Min
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from common.cache import bump_project_version
+from common.managers import active_changed, changed_project_ids
+from projects.models import Project
+from sitemanage.models import Activity, ProgressLog
+
+from . import cashflow
+from .evm import schedule_evm_refresh
+from .ledger import repost
+from .models import FundTransaction, PaymentCertificate
+
+
+def _earliest(*dates):
+    return min((date for date in dates if date), default=None)
+
+
+@receiver(post_save, sender=PaymentCertificate)
+@receiver(post_delete, sender=PaymentCertificate)
+def refresh_evm_for_certificate(sender, instance, **kwargs):
+    """Actual cost changes from the certified date on (the stored one too, when it moved)."""
+    before = getattr(instance, "_cash_flow_before", None) or {}
+    bump_project_version(instance.project_id)
+    schedule_evm_refresh(instance.project_id, since=_earliest(instance.date_certified, before.get("date_certified")))
+
+
+@receiver(post_save, sender=FundTransaction)
+def bump_version_for_transaction(sender, instance, **kwargs):
+    bump_project_version(instance.project_id)
+
+
+@receiver(post_delete, sender=FundTransaction)
+def repost_on_transaction_delete(sender, instance, **kwargs):
+    """Rewrite the balances after a deleted row (instance, queryset and admin deletes alike)."""
+    repost(instance.project_id, instance.date)
+
+
+@receiver(post_save, sender=Project)
+def refresh_evm_for_project(sender, instance, created, **kwargs):
+    """Contract sum is the budget at completion."""
+    if created:
+        return
+    bump_project_version(instance.pk)
+    schedule_evm_refresh(instance.pk)
+
+
+# Sitemanage signals already bump the project version for these.
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+def refresh_evm_for_activity(sender, instance, update_fields=None, **kwargs):
+    """Plan or weight changes move planned value in every period."""
+    if update_fields and set(update_fields) <= set(Activity.PROGRESS_FIELDS):
+        return  # progress from a log: refreshed from the log's date below
+    schedule_evm_refresh(instance.project_id)
+
+
+@receiver(pre_save, sender=ProgressLog)
+def remember_log_date(sender, instance, **kwargs):
+    instance._evm_date_before = (
+        ProgressLog.objects.filter(pk=instance.pk).values_list("date", flat=True).first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=ProgressLog)
+@receiver(post_delete, sender=ProgressLog)
+def refresh_evm_for_progress_log(sender, instance, **kwargs):
+    """Earned value changes from the log's date on (the stored one too, when it moved)."""
+    since = _earliest(instance.date, getattr(instance, "_evm_date_before", None))
+    schedule_evm_refresh(instance.activity.project_id, since=since)
+
+
+# ---------------- Monthly cash flow ----------------
+def remember_cash_flow_row(sender, instance, **kwargs):
+    instance._cash_flow_before = cashflow.fetch(sender, instance.pk) if instance.pk else None
+
+
+def update_cash_flow_on_save(sender, instance, **kwargs):
+    cashflow.apply_change(sender, getattr(instance, "_cash_flow_before", None), cashflow.snapshot(instance))
+
+
+def update_cash_flow_on_delete(sender, instance, **kwargs):
+    cashflow.apply_change(sender, getattr(instance, "_cash_flow_before", None), None)
+
+
+for model in cashflow.SNAPSHOT_FIELDS:
+    pre_save.connect(remember_cash_flow_row, sender=model, dispatch_uid=f"cashflow-pre-save-{model.__name__}")
+    post_save.connect(update_cash_flow_on_save, sender=model, dispatch_uid=f"cashflow-save-{model.__name__}")
+    pre_delete.connect(remember_cash_flow_row, sender=model, dispatch_uid=f"cashflow-pre-delete-{model.__name__}")
+    post_delete.connect(update_cash_flow_on_delete, sender=model, dispatch_uid=f"cashflow-delete-{model.__name__}")
+
+
+# ---------------- Bulk soft delete / restore (common.managers) ----------------
+@receiver(active_changed, sender=FundTransaction)
+def repost_on_active_change(sender, pks, **kwargs):
+    """Rewrite balances from the earliest changed date, then the month rows."""
+    earliest = (
+        FundTransaction.objects.filter(pk__in=pks).values_list("project_id").annotate(date=Min("date")).order_by()
+    )
+    for project_id, date in earliest:
+        repost(project_id, date)
+    cashflow.rebuild_cash_flow({project_id for project_id, _date in earliest})
+
+
+@receiver(active_changed, sender=PaymentCertificate)
+def refresh_on_certificate_active_change(sender, pks, **kwargs):
+    project_ids = changed_project_ids(sender, pks)
+    cashflow.rebuild_cash_flow(project_ids)
+    for project_id in project_ids:
+        bump_project_version(project_id)
+        schedule_evm_refresh(project_id)
+
+
+@receiver(active_changed, sender=ProgressLog)
+def refresh_evm_on_log_active_change(sender, pks, **kwargs):
+    earliest = (
+        ProgressLog.objects.filter(pk__in=pks).values_list("activity__project_id").annotate(date=Min("date")).order_by()
+    )
+    for project_id, date in earliest:
+        schedule_evm_refresh(project_id, since=date)
+
+
+@receiver(active_changed, sender=Activity)
+def refresh_evm_on_activity_active_change(sender, pks, **kwargs):
+    for project_id in changed_project_ids(sender, pks):
+        schedule_evm_refresh(project_id)
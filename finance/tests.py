@@ -1,3 +1,121 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from common.testing import TestCase, create_project
+from projects.models import ProjectStats
+
+from .evm import evm_summary, get_evm_summary, latest_evm_periods
+from .ledger import import_transactions, rebuild_balances
+from .models import EarnedValuePeriod, FundTransaction
+
+
+class LedgerTests(TestCase):
+    """Running balances stay equal to a recomputation from scratch after every kind of write."""
+    nplusone_threshold = 30  # every write locks and reposts its project on its own
+
+    def setUp(self):
+        super().setUp()
+        self.project = create_project("P-001")
+        self.other = create_project("P-002")
+
+    def transaction(self, day, amount, kind=FundTransaction.CREDIT, project=None, save=True):
+        tx = FundTransaction(
+            project=project or self.project, date=date(2025, 3, day), payee="Supplier", type=kind,
+            description="Materials", amount_paid=Decimal(amount), pv_or_receipt_no=f"PV-{day}",
+        )
+        if save:
+            tx.save()
+        return tx
+
+    def balances(self, project=None):
+        return [
+            (tx.date.day, tx.balance_after)
+            for tx in FundTransaction.objects.filter(project=project or self.project).order_by("date", "id")
+        ]
+
+    def assertLedger(self, expected, project=None):
+        self.assertEqual(self.balances(project), [(day, Decimal(balance)) for day, balance in expected])
+        self.assertEqual(rebuild_balances(), 0)
+        stats = ProjectStats.objects.get(pk=(project or self.project).pk)
+        self.assertEqual(stats.fund_balance, Decimal(expected[-1][1]) if expected else 0)
+
+    def test_append(self):
+        self.transaction(1, "1000.00")
+        tx = self.transaction(5, "250.50", FundTransaction.DEBIT)
+        self.assertEqual(tx.balance_after, Decimal("749.50"))
+        self.assertLedger([(1, "1000.00"), (5, "749.50")])
+
+    def test_back_dated_insert_and_edit(self):
+        self.transaction(1, "1000.00")
+        self.transaction(10, "300.00", FundTransaction.DEBIT)
+        tx = self.transaction(5, "200.00", FundTransaction.DEBIT)
+        self.assertEqual(tx.balance_after, Decimal("800.00"))
+        self.assertLedger([(1, "1000.00"), (5, "800.00"), (10, "500.00")])
+
+        tx.amount_paid = Decimal("100.00")
+        tx.save()
+        self.assertLedger([(1, "1000.00"), (5, "900.00"), (10, "600.00")])
+
+    def test_move_to_another_project(self):
+        self.transaction(1, "1000.00")
+        tx = self.transaction(5, "400.00")
+        self.transaction(6, "500.00", project=self.other)
+        tx.project = self.other
+        tx.save()
+        self.assertLedger([(1, "1000.00")])
+        self.assertLedger([(5, "400.00"), (6, "900.00")], project=self.other)
+
+    def test_soft_delete(self):
+        self.transaction(1, "1000.00")
+        tx = self.transaction(5, "200.00", FundTransaction.DEBIT)
+        self.transaction(10, "300.00", FundTransaction.DEBIT)
+        FundTransaction.objects.filter(pk=tx.pk).soft_delete()
+        self.assertLedger([(1, "1000.00"), (5, "1000.00"), (10, "700.00")])
+
+    def test_instance_delete(self):
+        self.transaction(1, "1000.00")
+        tx = self.transaction(5, "200.00", FundTransaction.DEBIT)
+        self.transaction(10, "300.00", FundTransaction.DEBIT)
+        tx.delete()
+        self.assertLedger([(1, "1000.00"), (10, "700.00")])
+
+    def test_queryset_delete(self):
+        self.transaction(1, "1000.00")
+        self.transaction(5, "200.00", FundTransaction.DEBIT)
+        self.transaction(7, "100.00", FundTransaction.DEBIT)
+        self.transaction(10, "300.00", FundTransaction.DEBIT)
+        FundTransaction.objects.filter(date__in=[date(2025, 3, 5), date(2025, 3, 7)]).delete()
+        self.assertLedger([(1, "1000.00"), (10, "700.00")])
+
+    def test_import(self):
+        self.transaction(10, "1000.00")
+        import_transactions([
+            self.transaction(12, "100.00", FundTransaction.DEBIT, save=False),
+            self.transaction(11, "50.00", FundTransaction.DEBIT, save=False),
+            self.transaction(1, "500.00", project=self.other, save=False),
+        ])
+        self.assertLedger([(10, "1000.00"), (11, "950.00"), (12, "850.00")])
+        self.assertLedger([(1, "500.00")], project=self.other)
+
+        import_transactions([self.transaction(2, "200.00", save=False)])  # back-dated
+        self.assertLedger([(2, "200.00"), (10, "1200.00"), (11, "1150.00"), (12, "1050.00")])
+
+
+class EvmSummaryTests(TestCase):
+    def test_latest_periods_of_many_projects_in_one_query(self):
+        projects = [create_project("P-001"), create_project("P-002"), create_project("P-003")]
+        for project, months in zip(projects, [(1, 2, 3), (1,), ()]):
+            for month in months:
+                EarnedValuePeriod.objects.create(
+                    project=project, period=date(2025, month, 1),
+                    planned_value=100 * month, earned_value=90 * month, actual_cost=80 * month,
+                )
+        EarnedValuePeriod.objects.create(project=projects[1], period=date(2025, 2, 1), planned_value=200)
+
+        with self.assertNumQueries(1):
+            periods = latest_evm_periods([project.pk for project in projects], today=date(2025, 6, 15))
+        self.assertEqual({pk: row.period.month for pk, row in periods.items()}, {projects[0].pk: 3, projects[1].pk: 1})
+        for project in projects:
+            self.assertEqual(
+                evm_summary(project, periods.get(project.pk)), get_evm_summary(project, today=date(2025, 6, 15)),
+            )
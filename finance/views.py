@@ -1,5 +1,5 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.paginator import Paginator
+from common.pagination import KeysetPaginator
 from django.db.models import Q
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
@@ -10,9 +10,8 @@ from .forms import PaymentCertificateForm, FundTransactionForm
 # ---------------- Helpers ----------------
 def get_allowed_projects(user):
     if user.is_superuser or user.is_staff:
-        return Project.objects.filter(is_active=True)
-    return Project.objects.filter(
-        is_active=True,
+        return Project.active.all()
+    return Project.active.filter(
         participants__user=user,
         participants__is_active=True
     ).distinct()
@@ -29,7 +28,7 @@ def filter_by_allowed_projects(queryset, user):
 @permission_required('finance.view_paymentcertificate', raise_exception=True)
 def payment_list(request):
     search = request.GET.get('q', '').strip()
-    queryset = PaymentCertificate.objects.filter(is_active=True)
+    queryset = PaymentCertificate.active.all()
     queryset = filter_by_allowed_projects(queryset, request.user)
 
     if search:
@@ -39,8 +38,8 @@ def payment_list(request):
             Q(amount_to__icontains=search)
         )
 
-    paginator = Paginator(queryset.order_by('-payment_date'), 10)
-    payments = paginator.get_page(request.GET.get('page'))
+    paginator = KeysetPaginator(queryset, ('-payment_date', '-id'), 10)
+    payments = paginator.get_page(request.GET.get('cursor'))
 
     return render(request, "finance/payment_list.html", {'payments': payments, 'search': search})
 
@@ -49,7 +48,7 @@ def payment_list(request):
 @permission_required("finance.view_paymentcertificate", raise_exception=True)
 def payment_view(request, pk):
     payment = get_object_or_404(
-        filter_by_allowed_projects(PaymentCertificate.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(PaymentCertificate.active.all(), request.user),
         pk=pk
     )
     return render(request, "finance/payment_detail.html", {"payment": payment})
@@ -76,7 +75,7 @@ def payment_create(request):
 @permission_required("finance.change_paymentcertificate", raise_exception=True)
 def payment_update(request, pk):
     payment = get_object_or_404(
-        filter_by_allowed_projects(PaymentCertificate.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(PaymentCertificate.active.all(), request.user),
         pk=pk
     )
     allowed_projects = get_allowed_projects(request.user)
@@ -95,7 +94,7 @@ def payment_update(request, pk):
 @permission_required("finance.delete_paymentcertificate", raise_exception=True)
 def payment_delete(request, pk):
     payment = get_object_or_404(
-        filter_by_allowed_projects(PaymentCertificate.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(PaymentCertificate.active.all(), request.user),
         pk=pk
     )
     if request.method == "POST":
@@ -111,7 +110,7 @@ def payment_delete(request, pk):
 @permission_required("finance.view_fundtransaction", raise_exception=True)
 def transaction_list(request):
     search = request.GET.get('q', '').strip()
-    queryset = FundTransaction.objects.filter(is_active=True)
+    queryset = FundTransaction.active.all()
     queryset = filter_by_allowed_projects(queryset, request.user)
 
     if search:
@@ -121,8 +120,8 @@ def transaction_list(request):
             Q(pv_or_receipt_no__icontains=search)
         )
 
-    paginator = Paginator(queryset.order_by('-date'), 10)
-    transactions = paginator.get_page(request.GET.get('page'))
+    paginator = KeysetPaginator(queryset, ('-date', '-id'), 10)
+    transactions = paginator.get_page(request.GET.get('cursor'))
 
     return render(request, "finance/transaction_list.html", {"transactions": transactions, "search": search})
 
@@ -131,7 +130,7 @@ def transaction_list(request):
 @permission_required("finance.view_fundtransaction", raise_exception=True)
 def transaction_view(request, pk):
     transaction = get_object_or_404(
-        filter_by_allowed_projects(FundTransaction.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(FundTransaction.active.all(), request.user),
         pk=pk
     )
     return render(request, "finance/transaction_view.html", {"transaction": transaction})
@@ -158,7 +157,7 @@ def transaction_create(request):
 @permission_required("finance.change_fundtransaction", raise_exception=True)
 def transaction_update(request, pk):
     transaction = get_object_or_404(
-        filter_by_allowed_projects(FundTransaction.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(FundTransaction.active.all(), request.user),
         pk=pk
     )
     allowed_projects = get_allowed_projects(request.user)
@@ -177,7 +176,7 @@ def transaction_update(request, pk):
 @permission_required("finance.delete_fundtransaction", raise_exception=True)
 def transaction_delete(request, pk):
     transaction = get_object_or_404(
-        filter_by_allowed_projects(FundTransaction.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(FundTransaction.active.all(), request.user),
         pk=pk
     )
     if request.method == "POST":
@@ -1,3 +1,29 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ActivitySnapshot, ProgressSnapshot
+
+
+class ActivitySnapshotInline(admin.TabularInline):
+    model = ActivitySnapshot
+    extra = 0
+    can_delete = False
+    fields = ("name", "category_name", "progress_percent", "status", "planned_end", "actual_end", "target_percent")
+    readonly_fields = fields
+
+
+@admin.register(ProgressSnapshot)
+class ProgressSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("project", "period_start", "period_end", "activity_count", "average_progress", "created_at")
+    list_filter = ("project",)
+    date_hierarchy = "period_end"
+    inlines = [ActivitySnapshotInline]
+
+    # Snapshots are immutable (audit)
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
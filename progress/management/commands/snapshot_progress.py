@@ -0,0 +1,39 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from progress.snapshots import close_period, month_bounds, previous_month
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Snapshot activity progress at the close of a month (the previous month by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period", help="Month to close, YYYY-MM")
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only snapshot this project id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        if options["period"]:
+            try:
+                period_start, period_end = month_bounds(datetime.date.fromisoformat(options["period"] + "-01"))
+            except ValueError:
+                raise CommandError("--period must be YYYY-MM")
+        else:
+            period_start, period_end = previous_month(timezone.localdate())
+
+        projects = Project.objects.filter(is_active=True).order_by("pk")
+        if options["projects"]:
+            projects = projects.filter(pk__in=options["projects"])
+
+        for snapshot, created in close_period(period_start, period_end, projects):
+            state = "created" if created else "already taken"
+            self.stdout.write(
+                f"{snapshot.project}: {snapshot.activity_count} activities, "
+                f"{snapshot.average_progress}% average ({state})"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Closed {period_start:%B %Y}."))
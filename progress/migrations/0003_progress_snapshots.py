@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('progress', '0002_remove_targetprogress_report_and_more'),
+        ('projects', '0004_overdue_sweep'),
+        ('reports', '0011_report_run'),
+        ('sitemanage', '0016_progresslog_activity_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('activity_count', models.PositiveIntegerField(default=0)),
+                ('average_progress', models.DecimalField(decimal_places=1, default=0, max_digits=5)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('cover', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='snapshots', to='reports.progressreportcover')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_snapshots', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-period_end'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivitySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('category_name', models.CharField(blank=True, max_length=100)),
+                ('progress_percent', models.PositiveSmallIntegerField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('In Progress', 'In Progress'), ('Completed', 'Completed'), ('Delayed', 'Delayed')], max_length=20)),
+                ('planned_start', models.DateField()),
+                ('planned_end', models.DateField()),
+                ('actual_start', models.DateField(blank=True, null=True)),
+                ('actual_end', models.DateField(blank=True, null=True)),
+                ('latest_remarks', models.TextField(blank=True)),
+                ('target_percent', models.PositiveSmallIntegerField(help_text='Planned progress at the end of the next period')),
+                ('activity', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='sitemanage.activity')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='progress.progresssnapshot')),
+            ],
+            options={
+                'ordering': ['category_name', 'name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='progresssnapshot',
+            constraint=models.UniqueConstraint(fields=('project', 'period_end'), name='snapshot_project_period_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='activitysnapshot',
+            constraint=models.UniqueConstraint(fields=('snapshot', 'activity'), name='snapshot_activity_uniq'),
+        ),
+    ]
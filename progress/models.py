@@ -1,25 +1,86 @@
-# from django.db import models
-# from reports.models import MonthlyReport
-
-
-# class WorkCategory(models.Model):
-#     name = models.CharField(max_length=100)
-
-# class WorkItem(models.Model):
-#     category = models.ForeignKey(WorkCategory, on_delete=models.CASCADE)
-#     description = models.TextField()
-
-# class ProgressEntry(models.Model):
-#     report = models.ForeignKey(MonthlyReport, on_delete=models.CASCADE)
-#     work_item = models.ForeignKey(WorkItem, on_delete=models.CASCADE)
-#     block = models.CharField(max_length=50)
-#     status = models.CharField(max_length=50)
-#     progress_percent = models.DecimalField(max_digits=5, decimal_places=2)
-#     remarks = models.TextField(blank=True)
-
-# class TargetProgress(models.Model):
-#     report = models.ForeignKey(MonthlyReport, on_delete=models.CASCADE)
-#     work_item = models.ForeignKey(WorkItem, on_delete=models.CASCADE)
-#     current_progress = models.DecimalField(max_digits=5, decimal_places=2)
-#     target_progress = models.DecimalField(max_digits=5, decimal_places=2)
-    
+from django.contrib.auth.models import User
+from django.db import models
+
+from projects.models import Project
+from reports.models import ProgressReportCover
+from sitemanage.models import Activity
+
+
+class ImmutableModel(models.Model):
+    """Rows are written once (bulk_create or a first save) and never changed, for audit."""
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError(f"{self._meta.verbose_name.capitalize()} rows cannot be changed.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError(f"{self._meta.verbose_name.capitalize()} rows cannot be deleted.")
+
+
+# ---------------------------
+# PROGRESS SNAPSHOT
+# ---------------------------
+class ProgressSnapshot(ImmutableModel):
+    """
+    Progress of every activity of a project at the close of a period,
+    taken by progress.snapshots (one ActivitySnapshot row per activity).
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="progress_snapshots")
+    period_start = models.DateField()
+    period_end = models.DateField()
+    cover = models.ForeignKey(
+        ProgressReportCover,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="snapshots"
+    )
+
+    activity_count = models.PositiveIntegerField(default=0)
+    average_progress = models.DecimalField(max_digits=5, decimal_places=1, default=0)
+
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-period_end"]
+        constraints = [
+            models.UniqueConstraint(fields=["project", "period_end"], name="snapshot_project_period_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.project} - {self.period_end}"
+
+
+class ActivitySnapshot(ImmutableModel):
+    """One activity as it stood at the snapshot's period end."""
+    snapshot = models.ForeignKey(ProgressSnapshot, on_delete=models.CASCADE, related_name="rows")
+    activity = models.ForeignKey(Activity, on_delete=models.SET_NULL, null=True, related_name="+")
+
+    # Copied so the row still reads the same after the activity is renamed or removed
+    name = models.CharField(max_length=255)
+    category_name = models.CharField(max_length=100, blank=True)
+
+    progress_percent = models.PositiveSmallIntegerField()
+    status = models.CharField(max_length=20, choices=Activity.STATUS_CHOICES)
+    planned_start = models.DateField()
+    planned_end = models.DateField()
+    actual_start = models.DateField(null=True, blank=True)
+    actual_end = models.DateField(null=True, blank=True)
+    latest_remarks = models.TextField(blank=True)
+    target_percent = models.PositiveSmallIntegerField(
+        help_text="Planned progress at the end of the next period"
+    )
+
+    class Meta:
+        ordering = ["category_name", "name"]
+        constraints = [
+            models.UniqueConstraint(fields=["snapshot", "activity"], name="snapshot_activity_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.progress_percent}%)"
@@ -0,0 +1,137 @@
+"""
+Period-close progress snapshots.
+
+At the close of a period (a month by default) every active leaf activity
+of a project (summaries roll up from them, sitemanage.wbs) is written once
+to ActivitySnapshot with its progress, status, planned and actual dates,
+latest remarks and the target for the next period. Values are those as of the period end (sitemanage.asof), so a
+period can be closed late without picking up later logs.
+
+Snapshots are immutable: a period that already has one is returned as is.
+Historical and period-over-period reports read the snapshot rows (one per
+activity) instead of the progress log history.
+
+Close the previous month with `manage.py snapshot_progress`, or take a
+snapshot for a ProgressReportCover from the cover list.
+"""
+import calendar
+import datetime
+
+from django.db import transaction
+
+from sitemanage.asof import activities_as_of
+from sitemanage.models import Activity
+
+from .models import ActivitySnapshot, ProgressSnapshot
+
+
+# ---------------- Periods ----------------
+def month_bounds(day):
+    """(first, last) day of the month of `day`."""
+    return day.replace(day=1), day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def previous_month(today):
+    return month_bounds(today.replace(day=1) - datetime.timedelta(days=1))
+
+
+def next_period_end(period_start, period_end):
+    """End of the following period: the next month end for a calendar month, else the same length."""
+    if (period_start, period_end) == month_bounds(period_start):
+        return month_bounds(period_end + datetime.timedelta(days=1))[1]
+    return period_end + (period_end - period_start) + datetime.timedelta(days=1)
+
+
+def planned_percent(activity, day):
+    """Planned progress at the end of `day`, spread evenly between planned start and end."""
+    if day >= activity.planned_end:
+        return 100
+    if day < activity.planned_start:
+        return 0
+    days = (activity.planned_end - activity.planned_start).days + 1
+    return round(((day - activity.planned_start).days + 1) / days * 100)
+
+
+# ---------------- Taking snapshots ----------------
+def take_snapshot(project, period_start, period_end, cover=None, user=None):
+    """
+    Snapshot the project's activities as of `period_end`.
+
+    Returns (snapshot, created); an existing snapshot for the same period end
+    is returned unchanged.
+    """
+    existing = ProgressSnapshot.objects.filter(project=project, period_end=period_end).first()
+    if existing:
+        return existing, False
+
+    activities = activities_as_of(
+        Activity.objects.filter(project=project, is_active=True).leaves().select_related("category"),
+        period_end,
+    )
+    target_day = next_period_end(period_start, period_end)
+
+    with transaction.atomic():
+        snapshot = ProgressSnapshot.objects.create(
+            project=project,
+            period_start=period_start,
+            period_end=period_end,
+            cover=cover,
+            activity_count=len(activities),
+            average_progress=round(sum(a.progress_percent for a in activities) / len(activities), 1) if activities else 0,
+            created_by=user,
+        )
+        ActivitySnapshot.objects.bulk_create([
+            ActivitySnapshot(
+                snapshot=snapshot,
+                activity=activity,
+                name=activity.name,
+                category_name=activity.category.name if activity.category else "",
+                progress_percent=activity.progress_percent,
+                status=activity.status,
+                planned_start=activity.planned_start,
+                planned_end=activity.planned_end,
+                actual_start=activity.actual_start,
+                actual_end=activity.actual_end,
+                latest_remarks=activity.latest_remarks,
+                target_percent=max(activity.progress_percent, planned_percent(activity, target_day)),
+            )
+            for activity in activities
+        ], batch_size=500)
+    return snapshot, True
+
+
+def snapshot_cover(cover, user=None):
+    """Snapshot the cover's project for the cover's period."""
+    return take_snapshot(cover.project, cover.period_from, cover.period_to, cover=cover, user=user)
+
+
+def close_period(period_start, period_end, projects, user=None):
+    """Snapshot each of `projects` for the period. Returns [(snapshot, created)]."""
+    return [take_snapshot(project, period_start, period_end, user=user) for project in projects]
+
+
+# ---------------- Reading ----------------
+def find_snapshot(project_id, period_end):
+    return ProgressSnapshot.objects.filter(project_id=project_id, period_end=period_end).first()
+
+
+def previous_snapshot(snapshot):
+    return (
+        ProgressSnapshot.objects.filter(project_id=snapshot.project_id, period_end__lt=snapshot.period_end)
+        .order_by("-period_end").first()
+    )
+
+
+def period_rows(snapshot):
+    """
+    Snapshot rows with `previous_percent` (at the previous snapshot, None if
+    not there) and `change` set, for period-over-period reports.
+    """
+    previous = previous_snapshot(snapshot)
+    before = dict(previous.rows.values_list("activity_id", "progress_percent")) if previous else {}
+    rows = list(snapshot.rows.all())
+    for row in rows:
+        row.previous_percent = before.get(row.activity_id)
+        row.change = row.progress_percent - (row.previous_percent or 0)
+    return rows
+
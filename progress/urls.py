@@ -1,10 +1,10 @@
 from django.urls import path
 
-from projects.views import project_list
-from .views import progress_list
+from .views import progress_list, snapshot_detail
 
 app_name = "progress"
 
 urlpatterns = [
     path("", progress_list, name="progress_list"),
+    path("snapshots/<int:pk>/", snapshot_detail, name="snapshot_detail"),
 ]
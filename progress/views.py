@@ -1,9 +1,45 @@
-from django.shortcuts import render
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import login_required, permission_required
+from django.core.paginator import Paginator
+from django.shortcuts import get_object_or_404, render
 
+from sitemanage.services import get_allowed_projects
 
-# Create your views here.
+from .models import ProgressSnapshot
+from .snapshots import period_rows, previous_snapshot
+
+
+# ---------------- Snapshots ----------------
 @login_required
+@permission_required("progress.view_progresssnapshot", raise_exception=True)
 def progress_list(request):
-    # Logic to retrieve and display progress data
-    return render(request, 'progress/progress_list.html')
\ No newline at end of file
+    """Period-close snapshots of the user's projects, latest first."""
+    projects = get_allowed_projects(request.user)
+    project_id = request.GET.get("project")
+
+    snapshots = ProgressSnapshot.objects.filter(project__in=projects).select_related("project", "cover")
+    if project_id:
+        snapshots = snapshots.filter(project_id=project_id)
+
+    page_obj = Paginator(snapshots.order_by("-period_end", "project__project_name"), 20).get_page(request.GET.get("page"))
+    return render(request, "progress/progress_list.html", {
+        "projects": projects,
+        "snapshots": page_obj,
+        "page_obj": page_obj,
+        "filter_project": project_id,
+    })
+
+
+@login_required
+@permission_required("progress.view_progresssnapshot", raise_exception=True)
+def snapshot_detail(request, pk):
+    """Activities of one snapshot against the previous one."""
+    snapshot = get_object_or_404(
+        ProgressSnapshot.objects.select_related("project", "cover"),
+        pk=pk,
+        project__in=get_allowed_projects(request.user),
+    )
+    return render(request, "progress/snapshot_detail.html", {
+        "snapshot": snapshot,
+        "previous": previous_snapshot(snapshot),
+        "rows": period_rows(snapshot),
+    })
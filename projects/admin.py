@@ -1,4 +1,6 @@
 from django.contrib import admin
+
+from common.admin import ActiveListFilter, restore_selected, soft_delete_selected
 from django.utils.html import format_html
 from .models import (
     Project,
@@ -6,6 +8,8 @@ from .models import (
     ProjectParticipant,
     ProjectDocument,
     ProjectRole,
+    ProjectStats,
+    OverdueSweep,
 )
 from django.contrib.auth.models import User
 
@@ -44,6 +48,7 @@ class ProjectDocumentInline(admin.StackedInline):
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         "project_code",
         "project_name",
@@ -54,7 +59,7 @@ class ProjectAdmin(admin.ModelAdmin):
         "created_by",
         "is_active",
     )
-    list_filter = ("is_active", "client", "created_at")
+    list_filter = (ActiveListFilter, "client", "created_at")
     search_fields = ("project_code", "project_name", "client__name", "location")
     ordering = ("-created_at",)
     readonly_fields = ("created_at", "updated_at")
@@ -113,7 +118,9 @@ class ProjectAdmin(admin.ModelAdmin):
 
 @admin.register(ProjectContractor)
 class ProjectContractorAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = ("project", "contractor", "work_description")
+    list_filter = (ActiveListFilter,)
     search_fields = ("project__project_name", "contractor__name")
     autocomplete_fields = ("project", "contractor")
 
@@ -124,8 +131,9 @@ class ProjectContractorAdmin(admin.ModelAdmin):
 
 @admin.register(ProjectParticipant)
 class ProjectParticipantAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = ("project", "user", "project_role")
-    list_filter = ("project_role",)
+    list_filter = ("project_role", ActiveListFilter)
     search_fields = ("project__project_name", "user__username")
     autocomplete_fields = ("project", "user", "project_role")
 
@@ -136,7 +144,9 @@ class ProjectParticipantAdmin(admin.ModelAdmin):
 
 @admin.register(ProjectDocument)
 class ProjectDocumentAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = ("title", "project", "uploaded_by", "uploaded_at", "download_link")
+    list_filter = (ActiveListFilter,)
     search_fields = ("title", "project__project_name")
     readonly_fields = ("uploaded_by", "uploaded_at")
 
@@ -161,4 +171,53 @@ class ProjectDocumentAdmin(admin.ModelAdmin):
 
 @admin.register(ProjectRole)
 class ProjectRoleAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
+    list_filter = (ActiveListFilter,)
     search_fields = ["name"]  # required for autocomplete_fields
+
+
+# -----------------------------
+# Project Stats (rollup)
+# -----------------------------
+@admin.register(ProjectStats)
+class ProjectStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "project",
+        "activities_total",
+        "activities_completed",
+        "activities_delayed",
+        "images_count",
+        "visitors_count",
+        "total_certified",
+        "total_paid",
+        "fund_balance",
+    )
+    list_select_related = ("project__client",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# -----------------------------
+# Overdue sweeps
+# -----------------------------
+@admin.register(OverdueSweep)
+class OverdueSweepAdmin(admin.ModelAdmin):
+    list_display = (
+        "started_at",
+        "as_of",
+        "activities_delayed",
+        "compliances_expired",
+        "projects_touched",
+        "duration_ms",
+    )
+    date_hierarchy = "started_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
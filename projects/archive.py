@@ -0,0 +1,173 @@
+"""
+Archive of closed projects.
+
+Once a project is closed (defects liability period over, or the project
+soft-deleted) its progress logs, fund transactions and site images are moved
+to archive tables with the same columns and ids, so the live tables and
+their indexes only hold running projects:
+
+- rows are copied in batches (stored values, no auto_now refresh) and then
+  deleted from the live table in the same transaction; deletes send no
+  signals, so the project's ProjectStats and cash flow stay as they were;
+- Project.archived_at marks the project; rebuilds (stats, reconciliation,
+  sweeps) leave archived projects alone;
+- a run that fails halfway leaves the project marked with some rows still
+  live: closed_projects() keeps returning it until they are all moved, so
+  the next run finishes the job;
+- Activity.latest_log is cleared (the log snapshot fields are kept) and set
+  again by reconciliation when the project is unarchived.
+
+Reads go through source(): reports, the S-curve and the as-of engine get
+the archive table for an archived project and the live table otherwise,
+with the same field names. Reports over several projects use
+live_and_archived(), the UNION ALL of both tables when any of the projects
+is archived.
+
+Writes to the live tables for an archived project are refused
+(check_not_archived(), from the models' clean() and a pre_save receiver in
+projects.signals; finance.ledger.import_transactions for bulk imports).
+
+Run `manage.py archive_projects` (e.g. monthly) and
+`manage.py unarchive_project <id>` to bring a project back.
+"""
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from finance.models import ArchivedFundTransaction, FundTransaction
+from sitemanage.models import (
+    Activity,
+    ArchivedProgressLog,
+    ArchivedSiteProjectImage,
+    ProgressLog,
+    SiteProjectImage,
+)
+
+from .models import Project
+
+BATCH_SIZE = 1000
+
+# live model: (archive model, lookup of the project)
+ARCHIVES = {
+    ProgressLog: (ArchivedProgressLog, "activity__project"),
+    FundTransaction: (ArchivedFundTransaction, "project"),
+    SiteProjectImage: (ArchivedSiteProjectImage, "project"),
+}
+
+
+def is_archived(project_id):
+    return Project.objects.filter(pk=project_id, archived_at__isnull=False).exists()
+
+
+def archived_ids(project_ids):
+    return set(Project.objects.filter(pk__in=project_ids, archived_at__isnull=False).values_list("pk", flat=True))
+
+
+def source(model, project_id):
+    """Manager of the table holding `model` rows for the project (archive or live)."""
+    if model in ARCHIVES and project_id and is_archived(project_id):
+        return ARCHIVES[model][0].objects
+    return model.objects
+
+
+def live_and_archived(model, narrow, project_ids=None):
+    """
+    `model` rows of the projects (all when None) from the live table and, if
+    any of them is archived, the archive table: `narrow(queryset)` filters
+    each side the same way and the result is their UNION ALL, as `model`
+    objects. A union can only be ordered, sliced or counted further.
+    """
+    live = narrow(model.objects.all())
+    if model not in ARCHIVES:
+        return live
+    archived = Project.objects.filter(archived_at__isnull=False)
+    if project_ids is not None:
+        archived = archived.filter(pk__in=project_ids)
+    archived = set(archived.values_list("pk", flat=True))
+    if not archived:
+        return live
+    rows = narrow(ARCHIVES[model][0].objects.all())
+    if project_ids is not None and archived >= {int(pk) for pk in project_ids}:
+        return rows
+    return live.order_by().union(rows.order_by(), all=True)
+
+
+ARCHIVED_ERROR = "This project is archived: unarchive it before recording anything against it."
+
+
+def check_not_archived(project_id):
+    """Refuse a write to a live table for an archived project."""
+    if project_id and is_archived(project_id):
+        raise ValidationError(ARCHIVED_ERROR)
+
+
+def closed_projects(today=None):
+    """
+    Projects not archived yet whose defects liability period is over, or
+    soft-deleted, and archived projects that still have live rows (an
+    interrupted archive_project()).
+    """
+    today = today or timezone.localdate()
+    live_rows = reduce(or_, [
+        Exists(model._base_manager.filter(**{lookup: OuterRef("pk")}))
+        for model, (_archive, lookup) in ARCHIVES.items()
+    ])
+    return Project.objects.filter(
+        Q(archived_at__isnull=True) & (Q(defects_end__lt=today) | Q(is_active=False))
+        | Q(archived_at__isnull=False) & live_rows
+    )
+
+
+# ---------------- Moving rows ----------------
+def _copy(rows, target):
+    """Insert `rows` into `target` as stored (raw: auto_now fields keep their values)."""
+    fields = target._meta.local_concrete_fields
+    objs = [target(**{field.attname: getattr(row, field.attname) for field in fields}) for row in rows]
+    if objs:
+        target._base_manager._insert(objs, fields=fields, raw=True)
+
+
+def _move(source_model, target_model, lookup, project_id, batch_size):
+    moved = 0
+    queryset = source_model._base_manager.filter(**{lookup: project_id}).order_by("pk")
+    while True:
+        with transaction.atomic():
+            batch = list(queryset[:batch_size])
+            if not batch:
+                return moved
+            _copy(batch, target_model)
+            source_model._base_manager.filter(pk__in=[row.pk for row in batch])._raw_delete(
+                source_model._base_manager.db
+            )
+        moved += len(batch)
+
+
+def archive_project(project, batch_size=BATCH_SIZE):
+    """
+    Move the project's rows to the archive tables. Returns {model label: rows
+    moved}. Running it again after a failure moves the rows left behind.
+    """
+    with transaction.atomic():
+        Project.objects.filter(pk=project.pk, archived_at__isnull=True).update(archived_at=timezone.now())
+        Activity.objects.filter(project=project).update(latest_log=None)
+    return {
+        model._meta.label: _move(model, archive, lookup, project.pk, batch_size)
+        for model, (archive, lookup) in ARCHIVES.items()
+    }
+
+
+def unarchive_project(project, batch_size=BATCH_SIZE):
+    """Move the project's rows back to the live tables. Returns {model label: rows moved}."""
+    from sitemanage.reconcile import reconcile_activities
+
+    moved = {
+        model._meta.label: _move(archive, model, lookup, project.pk, batch_size)
+        for model, (archive, lookup) in ARCHIVES.items()
+    }
+    Project.objects.filter(pk=project.pk).update(archived_at=None)
+    reconcile_activities(project_ids=[project.pk])  # restores Activity.latest_log
+    return moved
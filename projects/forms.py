@@ -76,7 +76,7 @@ class ProjectParticipantForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["project_role"].queryset = ProjectRole.objects.filter(is_active=True)
+        self.fields["project_role"].queryset = ProjectRole.active.all()
 
 
 # ---------------- Participant Formset ----------------
@@ -0,0 +1,34 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from projects.archive import BATCH_SIZE, archive_project, closed_projects
+
+
+class Command(BaseCommand):
+    help = "Move logs, transactions and images of closed projects to the archive tables (run monthly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only archive this project id (repeatable)",
+        )
+        parser.add_argument(
+            "--date", type=datetime.date.fromisoformat,
+            help="Treat projects as closed as of this date (YYYY-MM-DD) instead of today",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="List the projects without moving rows")
+
+    def handle(self, *args, **options):
+        projects = closed_projects(options["date"]).order_by("pk")
+        if options["projects"]:
+            projects = projects.filter(pk__in=options["projects"])
+
+        for project in projects:
+            if options["dry_run"]:
+                self.stdout.write(f"{project.pk} {project.project_name}: would be archived")
+                continue
+            moved = archive_project(project, batch_size=options["batch_size"])
+            counts = ", ".join(f"{count} {label}" for label, count in moved.items())
+            self.stdout.write(self.style.SUCCESS(f"{project.pk} {project.project_name}: archived ({counts})"))
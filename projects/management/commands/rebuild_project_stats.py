@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from projects.stats import rebuild_project_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the ProjectStats rollup from activities, site records and payments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only rebuild this project id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        changed = rebuild_project_stats(options["projects"])
+        self.stdout.write(self.style.SUCCESS(f"Project stats rebuilt: {changed} row(s) created or corrected."))
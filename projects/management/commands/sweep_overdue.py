@@ -0,0 +1,35 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from projects.sweeper import BATCH_SIZE, sweep_overdue
+
+
+class Command(BaseCommand):
+    help = "Mark overdue activities as Delayed and expired compliances as Expired (run daily)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only sweep this project id (repeatable)",
+        )
+        parser.add_argument(
+            "--date", type=datetime.date.fromisoformat,
+            help="Sweep as of this date (YYYY-MM-DD) instead of today",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Count rows without changing them")
+
+    def handle(self, *args, **options):
+        sweep = sweep_overdue(
+            today=options["date"],
+            project_ids=options["projects"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+        verb = "would be " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"As of {sweep.as_of}: {sweep.activities_delayed} activities {verb}delayed, "
+            f"{sweep.compliances_expired} compliances {verb}expired "
+            f"in {sweep.projects_touched} project(s) ({sweep.duration_ms:.0f} ms)."
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.archive import BATCH_SIZE, unarchive_project
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Move an archived project's rows back to the live tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("project", type=int, help="Project id")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        project = Project.objects.filter(pk=options["project"]).first()
+        if project is None:
+            raise CommandError(f"Project {options['project']} does not exist.")
+        if project.archived_at is None:
+            raise CommandError(f"Project {project.pk} is not archived.")
+
+        moved = unarchive_project(project, batch_size=options["batch_size"])
+        counts = ", ".join(f"{count} {label}" for label, count in moved.items())
+        self.stdout.write(self.style.SUCCESS(f"{project.pk} {project.project_name}: restored ({counts})"))
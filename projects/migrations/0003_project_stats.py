@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_projectparticipant_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStats',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='projects.project')),
+                ('activities_total', models.IntegerField(default=0)),
+                ('activities_pending', models.IntegerField(default=0)),
+                ('activities_in_progress', models.IntegerField(default=0)),
+                ('activities_completed', models.IntegerField(default=0)),
+                ('activities_delayed', models.IntegerField(default=0)),
+                ('progress_sum', models.BigIntegerField(default=0, help_text='Sum of activity progress percentages')),
+                ('last_activity_update', models.DateTimeField(blank=True, null=True)),
+                ('last_progress_date', models.DateField(blank=True, null=True)),
+                ('images_count', models.IntegerField(default=0)),
+                ('latest_image_date', models.DateField(blank=True, null=True)),
+                ('visitors_count', models.IntegerField(default=0)),
+                ('total_certified', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('total_paid', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('fund_balance', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+            ],
+            options={
+                'verbose_name': 'Project Stats',
+                'verbose_name_plural': 'Project Stats',
+            },
+        ),
+    ]
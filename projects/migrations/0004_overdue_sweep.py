@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OverdueSweep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('as_of', models.DateField(help_text='Rows due before this date were considered overdue')),
+                ('activities_delayed', models.IntegerField(default=0)),
+                ('compliances_expired', models.IntegerField(default=0)),
+                ('projects_touched', models.IntegerField(default=0)),
+                ('duration_ms', models.FloatField(default=0)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
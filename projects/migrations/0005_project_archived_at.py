@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_overdue_sweep'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text="Set while the project's logs, transactions and images live in the archive tables (projects.archive)", null=True),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.contrib.auth.models import User
 from django.db import models
 from setup.models import Contractor, ContractorType, Client, ProjectRole
 from django.core.validators import FileExtensionValidator
+from common.managers import ActiveManager, SoftDeleteManager
 
 
 class Project(models.Model):
@@ -38,6 +39,13 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    archived_at = models.DateTimeField(
+        null=True, blank=True, editable=False,
+        help_text="Set while the project's logs, transactions and images live in the archive tables (projects.archive)"
+    )
+
+    objects = SoftDeleteManager()
+    active = ActiveManager()
 
     class Meta:
         ordering = ["-created_at"]
@@ -58,6 +66,9 @@ class ProjectDocument(models.Model):
     uploaded_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
 
 class ProjectParticipant(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="participants"); 
@@ -65,6 +76,9 @@ class ProjectParticipant(models.Model):
     project_role = models.ForeignKey(ProjectRole, on_delete=models.PROTECT); 
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta: ordering = ["project_role"]
 
     def __str__(self): return f"{self.user.username} – {self.project_role.name}"
@@ -76,8 +90,72 @@ class ProjectContractor(models.Model):
     work_description = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         unique_together = ("project", "contractor")
 
     def __str__(self):
         return f"{self.contractor} – {self.project.project_name}"
+
+
+class ProjectStats(models.Model):
+    """
+    Per-project rollup kept up to date by delta from signals (see projects.stats).
+
+    Pages read these numbers instead of recounting activities, images,
+    visitors and payments. Rebuild with `manage.py rebuild_project_stats`
+    after bulk changes that bypass signals.
+    """
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+
+    # Activities (active only)
+    activities_total = models.IntegerField(default=0)
+    activities_pending = models.IntegerField(default=0)
+    activities_in_progress = models.IntegerField(default=0)
+    activities_completed = models.IntegerField(default=0)
+    activities_delayed = models.IntegerField(default=0)
+    progress_sum = models.BigIntegerField(default=0, help_text="Sum of activity progress percentages")
+    last_activity_update = models.DateTimeField(null=True, blank=True)
+    last_progress_date = models.DateField(null=True, blank=True)
+
+    # Site media & visitors
+    images_count = models.IntegerField(default=0)
+    latest_image_date = models.DateField(null=True, blank=True)
+    visitors_count = models.IntegerField(default=0)
+
+    # Finance
+    total_certified = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    total_paid = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    fund_balance = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Project Stats"
+        verbose_name_plural = "Project Stats"
+
+    def __str__(self):
+        return f"Stats for project {self.project_id}"
+
+    @property
+    def average_progress(self):
+        return round(self.progress_sum / self.activities_total, 1) if self.activities_total else 0
+
+    def percent_of_activities(self, count):
+        return round(count / self.activities_total * 100, 1) if self.activities_total else 0
+
+
+class OverdueSweep(models.Model):
+    """One run of the overdue sweeper (projects.sweeper)."""
+    started_at = models.DateTimeField(auto_now_add=True)
+    as_of = models.DateField(help_text="Rows due before this date were considered overdue")
+    activities_delayed = models.IntegerField(default=0)
+    compliances_expired = models.IntegerField(default=0)
+    projects_touched = models.IntegerField(default=0)
+    duration_ms = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Overdue sweep {self.started_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from common.managers import active_changed, changed_project_ids
+from sitemanage.models import ProgressLog
+
+from .archive import ARCHIVES, check_not_archived
+from .models import Project, ProjectStats
+from .stats import ROLLUPS, apply_change, rebuild_project_stats
+
+
+@receiver(post_save, sender=Project)
+def create_project_stats(sender, instance, created, **kwargs):
+    if created:
+        ProjectStats.objects.get_or_create(project=instance)
+
+
+def remember_stats_row(sender, instance, **kwargs):
+    """Read the row as stored before the change (its current contribution)."""
+    instance._stats_before = ROLLUPS[sender].fetch(instance.pk) if instance.pk else None
+
+
+def update_stats_on_save(sender, instance, **kwargs):
+    rollup = ROLLUPS[sender]
+    before, after = getattr(instance, "_stats_before", None), rollup.snapshot(instance)
+    apply_change(rollup, before, after)
+    rebuilt = rollup.rebuilt_projects(before, after)
+    if rebuilt:
+        rebuild_project_stats(rebuilt)
+
+
+def update_stats_on_delete(sender, instance, **kwargs):
+    # No rebuild here: a cascade from a project deletion may already have
+    # removed its stats row. A recount runs after the commit, when a deleted
+    # project is gone and left alone.
+    rollup = ROLLUPS[sender]
+    before = getattr(instance, "_stats_before", None)
+    apply_change(rollup, before, None, rebuild_missing=False)
+    rebuilt = rollup.rebuilt_projects(before, None)
+    if rebuilt:
+        transaction.on_commit(lambda: rebuild_project_stats(rebuilt))
+
+
+for model in ROLLUPS:
+    pre_save.connect(remember_stats_row, sender=model, dispatch_uid=f"stats-pre-save-{model.__name__}")
+    post_save.connect(update_stats_on_save, sender=model, dispatch_uid=f"stats-save-{model.__name__}")
+    pre_delete.connect(remember_stats_row, sender=model, dispatch_uid=f"stats-pre-delete-{model.__name__}")
+    post_delete.connect(update_stats_on_delete, sender=model, dispatch_uid=f"stats-delete-{model.__name__}")
+
+
+@receiver(active_changed)
+def rebuild_stats_on_active_change(sender, pks, **kwargs):
+    """Bulk soft delete or restore (common.managers): recompute the projects' rows."""
+    if sender in ROLLUPS:
+        rebuild_project_stats(changed_project_ids(sender, pks, ROLLUPS[sender].fields["project_id"]))
+
+
+# ---------------- Archived projects (projects.archive) ----------------
+def block_archived_writes(sender, instance, **kwargs):
+    """Rows of an archived project live in the archive tables: refuse new live rows."""
+    project_id = instance.activity.project_id if sender is ProgressLog else instance.project_id
+    check_not_archived(project_id)
+
+
+for model in ARCHIVES:
+    pre_save.connect(block_archived_writes, sender=model, dispatch_uid=f"archive-pre-save-{model.__name__}")
@@ -0,0 +1,366 @@
+"""
+ProjectStats maintenance.
+
+Every save or delete of a tracked row (activities, progress logs, site
+images, visitors, payment certificates, fund transactions) is turned into
+a delta on its project's ProjectStats row:
+
+- counters and sums are updated with F() expressions, so concurrent writers
+  never overwrite each other;
+- "latest" dates only move forward with GREATEST(); they are recomputed
+  from the source table only when the row holding the latest value leaves
+  (deleted, deactivated, moved or edited backwards), and for both projects
+  when an activity (with its progress logs) moves to another project;
+- the fund balance is the balance_after of the latest active transaction,
+  re-read on every transaction change.
+
+The row's previous state is read in pre_save/pre_delete, and all updates of
+one change run in a single transaction (joining the caller's, if any).
+Only leaf activities count: a summary activity (one with active children,
+sitemanage.wbs) groups its children and logs no progress of its own. A save
+that can turn a parent into a leaf or back (a child created, moved,
+deactivated or restored) recomputes its project's row.
+
+Bulk queryset updates bypass signals: rebuild_project_stats() recomputes
+rows from scratch (manage.py rebuild_project_stats); bulk soft_delete() and
+restore() (common.managers) do so for the projects they touch.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from finance.models import FundTransaction, PaymentCertificate
+from sitemanage.models import Activity, ProgressLog, SiteProjectImage, SiteVisitor
+
+from .models import Project, ProjectStats
+
+STATUS_FIELDS = {
+    Activity.STATUS_PENDING: "activities_pending",
+    Activity.STATUS_IN_PROGRESS: "activities_in_progress",
+    Activity.STATUS_COMPLETED: "activities_completed",
+    Activity.STATUS_DELAYED: "activities_delayed",
+}
+
+STAT_FIELDS = [
+    field.name for field in ProjectStats._meta.concrete_fields if field.name != "project"
+]
+
+
+# ---------------- Rollup definitions ----------------
+class Rollup:
+    """How the active rows of one model contribute to ProjectStats."""
+    model = None
+    fields = {}          # snapshot key -> lookup (also the attribute on the instance)
+    latest = {}          # stats field -> snapshot key, kept as the maximum
+    recomputed = ()      # stats fields re-read from the source on every change
+    moves_children = ()  # stats fields of child rows that follow this row's project
+
+    def counts(self, row):
+        """Additive contribution of an active row: {stats field: amount}."""
+        return {}
+
+    def snapshot(self, instance):
+        row = {key: getattr(instance, key) for key in self.fields if key != "project_id"}
+        row["project_id"] = self.project_of(instance)
+        row["is_active"] = instance.is_active
+        return row
+
+    def project_of(self, instance):
+        return instance.project_id
+
+    def fetch(self, pk):
+        lookups = {**self.fields, "is_active": "is_active"}
+        values = self.model.objects.filter(pk=pk).values(*lookups.values()).first()
+        if values is None:
+            return None
+        return {key: values[lookup] for key, lookup in lookups.items()}
+
+    def active_rows(self, project_id):
+        return self.model.objects.filter(project_id=project_id, is_active=True)
+
+    def compute(self, field, project_id):
+        """Current value of a latest/recomputed stats field, read from the source rows."""
+        return self.active_rows(project_id).aggregate(value=Max(self.fields[self.latest[field]]))["value"]
+
+    def rebuilt_projects(self, before, after):
+        """Projects whose row must be recomputed after the change instead of taking a delta."""
+        return set()
+
+
+class ActivityRollup(Rollup):
+    model = Activity
+    fields = {
+        "project_id": "project_id",
+        "parent_id": "parent_id",
+        "status": "status",
+        "progress_percent": "progress_percent",
+        "updated_at": "updated_at",
+    }
+    latest = {"last_activity_update": "updated_at"}
+    moves_children = ("last_progress_date",)
+
+    # A summary's row is kept with is_active False (it counts for nothing);
+    # "in_tree" keeps its real state for rebuilt_projects().
+    def fetch(self, pk):
+        row = (
+            Activity.objects.filter(pk=pk)
+            .annotate(summary=Exists(Activity.objects.filter(parent=OuterRef("pk"), is_active=True)))
+            .values(*self.fields.values(), "is_active", "summary").first()
+        )
+        return self._counted(row) if row else None
+
+    def snapshot(self, instance):
+        row = super().snapshot(instance)
+        before = getattr(instance, "_stats_before", None)
+        row["summary"] = bool(before and before["summary"])  # saving a row leaves its children as they are
+        return self._counted(row)
+
+    @staticmethod
+    def _counted(row):
+        row["in_tree"] = row["is_active"]
+        row["is_active"] = row["is_active"] and not row["summary"]
+        return row
+
+    def active_rows(self, project_id):
+        return Activity.objects.filter(project_id=project_id, is_active=True).leaves()
+
+    def rebuilt_projects(self, before, after):
+        """A child added to, moved between or removed from parents may turn them into leaves or summaries."""
+        def place(row):
+            return (row["parent_id"], row["in_tree"]) if row and row["parent_id"] else None
+
+        if place(before) == place(after):
+            return set()
+        return {row["project_id"] for row in (before, after) if place(row)}
+
+    def counts(self, row):
+        counts = {"activities_total": 1, "progress_sum": row["progress_percent"]}
+        if row["status"] in STATUS_FIELDS:
+            counts[STATUS_FIELDS[row["status"]]] = 1
+        return counts
+
+
+class ProgressLogRollup(Rollup):
+    model = ProgressLog
+    fields = {"project_id": "activity__project_id", "date": "date"}
+    latest = {"last_progress_date": "date"}
+
+    def project_of(self, instance):
+        return instance.activity.project_id
+
+    def active_rows(self, project_id):
+        return ProgressLog.objects.filter(activity__project_id=project_id, is_active=True)
+
+
+class SiteImageRollup(Rollup):
+    model = SiteProjectImage
+    fields = {"project_id": "project_id", "image_date": "image_date"}
+    latest = {"latest_image_date": "image_date"}
+
+    def counts(self, row):
+        return {"images_count": 1}
+
+
+class SiteVisitorRollup(Rollup):
+    model = SiteVisitor
+    fields = {"project_id": "project_id"}
+
+    def counts(self, row):
+        return {"visitors_count": 1}
+
+
+class PaymentCertificateRollup(Rollup):
+    model = PaymentCertificate
+    fields = {
+        "project_id": "project_id",
+        "certified_amount": "certified_amount",
+        "amount_paid": "amount_paid",
+    }
+
+    def counts(self, row):
+        return {"total_certified": row["certified_amount"], "total_paid": row["amount_paid"]}
+
+
+class FundTransactionRollup(Rollup):
+    model = FundTransaction
+    fields = {"project_id": "project_id"}
+    recomputed = ("fund_balance",)
+
+    def compute(self, field, project_id):
+        latest = self.active_rows(project_id).order_by("-date", "-id").values_list("balance_after", flat=True).first()
+        return latest or 0
+
+
+ROLLUPS = {
+    rollup.model: rollup
+    for rollup in (
+        ActivityRollup(),
+        ProgressLogRollup(),
+        SiteImageRollup(),
+        SiteVisitorRollup(),
+        PaymentCertificateRollup(),
+        FundTransactionRollup(),
+    )
+}
+
+ROLLUP_FOR_FIELD = {
+    field: rollup
+    for rollup in ROLLUPS.values()
+    for field in (*rollup.latest, *rollup.recomputed)
+}
+
+
+# ---------------- Deltas ----------------
+def apply_change(rollup, before, after, rebuild_missing=True):
+    """
+    Move a row's contribution from its `before` to its `after` snapshot.
+
+    Either snapshot may be None (created / deleted). A project without a
+    stats row is rebuilt from scratch when `rebuild_missing` is set.
+    """
+    recompute = defaultdict(set)
+    if before and after and before["project_id"] != after["project_id"]:
+        for field in rollup.moves_children:
+            recompute[before["project_id"]].add(field)
+            recompute[after["project_id"]].add(field)
+
+    before = before if before and before["is_active"] else None
+    after = after if after and after["is_active"] else None
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    raised = defaultdict(dict)
+
+    if before:
+        for field, amount in rollup.counts(before).items():
+            deltas[before["project_id"]][field] -= amount
+        for field, key in rollup.latest.items():
+            stays = (
+                after and after["project_id"] == before["project_id"]
+                and after[key] is not None and before[key] is not None
+                and after[key] >= before[key]
+            )
+            if before[key] is not None and not stays:
+                recompute[before["project_id"]].add(field)
+    if after:
+        for field, amount in rollup.counts(after).items():
+            deltas[after["project_id"]][field] += amount
+        for field, key in rollup.latest.items():
+            if after[key] is not None and field not in recompute[after["project_id"]]:
+                raised[after["project_id"]][field] = after[key]
+    for snapshot in (before, after):
+        if snapshot and rollup.recomputed:
+            recompute[snapshot["project_id"]].update(rollup.recomputed)
+
+    with transaction.atomic():
+        for project_id in set(deltas) | set(raised) | set(recompute):
+            updates = {
+                field: F(field) + amount
+                for field, amount in deltas[project_id].items() if amount
+            }
+            updates.update({
+                field: Greatest(Coalesce(F(field), Value(value)), Value(value))
+                for field, value in raised[project_id].items()
+            })
+            updates.update({
+                field: ROLLUP_FOR_FIELD.get(field, rollup).compute(field, project_id)
+                for field in recompute[project_id]
+            })
+            if not updates:
+                continue
+            if not ProjectStats.objects.filter(pk=project_id).update(**updates) and rebuild_missing:
+                rebuild_project_stats([project_id])
+
+
+def refresh_recomputed(model, project_ids):
+    """Re-read a model's recomputed stats fields, after its rows changed without signals."""
+    rollup = ROLLUPS[model]
+    for project_id in project_ids:
+        ProjectStats.objects.filter(pk=project_id).update(**{
+            field: rollup.compute(field, project_id) for field in rollup.recomputed
+        })
+
+
+# ---------------- Full rebuild ----------------
+def rebuild_project_stats(project_ids=None):
+    """
+    Recompute ProjectStats rows from the source tables.
+
+    One grouped query per source model for all projects. Returns the number
+    of rows created or corrected.
+    """
+    # Archived projects keep the stats they had when archived (projects.archive)
+    projects = Project.objects.filter(archived_at__isnull=True)
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+
+    computed = {}
+    balances = projects.annotate(balance=Subquery(
+        FundTransaction.objects.filter(project=OuterRef("pk"), is_active=True)
+        .order_by("-date", "-id").values("balance_after")[:1]
+    )).values_list("pk", "balance")
+    for project_id, balance in balances:
+        computed[project_id] = ProjectStats(project_id=project_id, fund_balance=balance or 0)
+
+    def rows(queryset, project_field="project"):
+        return queryset.filter(**{f"{project_field}__in": projects, "is_active": True})
+
+    for row in rows(Activity.objects.leaves()).values("project_id", "status").annotate(
+        count=Count("id"), progress=Sum("progress_percent"), last=Max("updated_at")
+    ):
+        stats = computed[row["project_id"]]
+        stats.activities_total += row["count"]
+        stats.progress_sum += row["progress"] or 0
+        if row["status"] in STATUS_FIELDS:
+            field = STATUS_FIELDS[row["status"]]
+            setattr(stats, field, getattr(stats, field) + row["count"])
+        if stats.last_activity_update is None or row["last"] > stats.last_activity_update:
+            stats.last_activity_update = row["last"]
+
+    for project_id, last in rows(ProgressLog.objects, "activity__project").values_list(
+        "activity__project_id"
+    ).annotate(last=Max("date")):
+        computed[project_id].last_progress_date = last
+
+    for project_id, count, last in rows(SiteProjectImage.objects).values_list("project_id").annotate(
+        count=Count("id"), last=Max("image_date")
+    ):
+        computed[project_id].images_count = count
+        computed[project_id].latest_image_date = last
+
+    for project_id, count in rows(SiteVisitor.objects).values_list("project_id").annotate(count=Count("id")):
+        computed[project_id].visitors_count = count
+
+    for project_id, certified, paid in rows(PaymentCertificate.objects).values_list("project_id").annotate(
+        certified=Sum("certified_amount"), paid=Sum("amount_paid")
+    ):
+        computed[project_id].total_certified = certified
+        computed[project_id].total_paid = paid
+
+    with transaction.atomic():
+        existing = {
+            stats.pk: stats
+            for stats in ProjectStats.objects.select_for_update().filter(pk__in=list(computed))
+        }
+        to_create = [stats for project_id, stats in computed.items() if project_id not in existing]
+        to_update = [
+            stats for project_id, stats in computed.items()
+            if project_id in existing and any(
+                getattr(stats, field) != getattr(existing[project_id], field) for field in STAT_FIELDS
+            )
+        ]
+        ProjectStats.objects.bulk_create(to_create)
+        ProjectStats.objects.bulk_update(to_update, STAT_FIELDS)
+    return len(to_create) + len(to_update)
+
+
+def get_project_stats(project_ids):
+    """{project id: ProjectStats}, building rows that do not exist yet."""
+    project_ids = list(project_ids)
+    stats = ProjectStats.objects.in_bulk(project_ids)
+    missing = [project_id for project_id in project_ids if project_id not in stats]
+    if missing:
+        rebuild_project_stats(missing)
+        stats.update(ProjectStats.objects.in_bulk(missing))
+    return stats
@@ -0,0 +1,98 @@
+"""
+Time-driven status changes.
+
+Statuses that depend on the calendar only change when someone saves a row:
+an activity becomes Delayed when progress is logged after its planned end,
+and a compliance stays Valid after it expires. sweep_overdue() applies them
+for today, so pages and reports can read the stored status:
+
+- active leaf activities not completed (Pending / In Progress, below 100%)
+  whose planned_end has passed become Delayed;
+- Valid compliances whose expiry_date has passed become Expired.
+
+Projects with overdue rows are found first, then each batch of projects is
+changed with one UPDATE per model (indexes on project, status and the due
+date). Queryset updates send no signals, so the touched projects get their
+ProjectStats rebuilt and their cache version bumped. Each run is recorded
+as an OverdueSweep.
+
+Run daily, shortly after midnight: `manage.py sweep_overdue`.
+"""
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from common.cache import bump_project_version
+from compliance.models import Compliance
+from sitemanage.models import Activity
+
+from .models import OverdueSweep
+from .stats import rebuild_project_stats
+
+BATCH_SIZE = 200
+
+
+def overdue_activities(today):
+    """Leaf activities only: a summary's progress is its children's (sitemanage.wbs)."""
+    return Activity.objects.filter(
+        is_active=True,
+        project__archived_at__isnull=True,
+        status__in=[Activity.STATUS_PENDING, Activity.STATUS_IN_PROGRESS],
+        planned_end__lt=today,
+        progress_percent__lt=100,
+    ).leaves()
+
+
+def expired_compliances(today):
+    return Compliance.objects.filter(
+        is_active=True, status="Valid", expiry_date__lt=today, project__archived_at__isnull=True
+    )
+
+
+def _projects(queryset, project_ids):
+    if project_ids is not None:
+        queryset = queryset.filter(project_id__in=project_ids)
+    return set(queryset.values_list("project_id", flat=True).distinct())
+
+
+def sweep_overdue(today=None, project_ids=None, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Flip overdue activities to Delayed and expired compliances to Expired.
+
+    Returns the OverdueSweep recorded for the run (not saved on a dry run;
+    the counts are then those that would change).
+    """
+    started = time.perf_counter()
+    today = today or timezone.localdate()
+    sweep = OverdueSweep(as_of=today)
+
+    activities = overdue_activities(today)
+    compliances = expired_compliances(today)
+    activity_projects = _projects(activities, project_ids)
+    compliance_projects = _projects(compliances, project_ids)
+    touched = sorted(activity_projects | compliance_projects)
+
+    for offset in range(0, len(touched), batch_size):
+        batch = touched[offset:offset + batch_size]
+        if dry_run:
+            sweep.activities_delayed += activities.filter(project_id__in=batch).count()
+            sweep.compliances_expired += compliances.filter(project_id__in=batch).count()
+            continue
+        with transaction.atomic():
+            if activity_projects.intersection(batch):
+                sweep.activities_delayed += activities.filter(project_id__in=batch).update(
+                    status=Activity.STATUS_DELAYED, updated_at=timezone.now(),
+                )
+            if compliance_projects.intersection(batch):
+                sweep.compliances_expired += compliances.filter(project_id__in=batch).update(status="Expired")
+        if activity_projects.intersection(batch):
+            rebuild_project_stats(activity_projects.intersection(batch))
+        for project_id in batch:
+            bump_project_version(project_id)
+
+    sweep.projects_touched = len(touched)
+    sweep.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    if not dry_run:
+        sweep.save()
+    return sweep
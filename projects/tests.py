@@ -1,3 +1,182 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+
+from common.testing import TestCase, create_project
+from finance.models import FundTransaction
+from sitemanage.models import Activity, ProgressLog
+
+from . import archive
+from .archive import archive_project, closed_projects, live_and_archived
+from .models import ProjectStats
+from .stats import STAT_FIELDS, STATUS_FIELDS, rebuild_project_stats
+from .sweeper import sweep_overdue
+
+
+class ProjectStatsDeltaTests(TestCase):
+    """The deltas applied by signals must match a rebuild from the source tables."""
+
+    def setUp(self):
+        super().setUp()
+        self.project = create_project("P-001")
+        self.other = create_project("P-002")
+        self.user = User.objects.create_user("engineer")
+
+    def activity(self, project=None, name="Blockwork", **fields):
+        return Activity.objects.create(
+            project=project or self.project, name=name,
+            planned_start=date(2025, 2, 1), planned_end=date(2025, 2, 28),
+            created_by=self.user, updated_by=self.user, **fields,
+        )
+
+    def stats(self, project=None):
+        return ProjectStats.objects.get(pk=(project or self.project).pk)
+
+    def assertMatchesRebuild(self):
+        kept = {stats.pk: [getattr(stats, field) for field in STAT_FIELDS] for stats in ProjectStats.objects.all()}
+        self.assertEqual(rebuild_project_stats(), 0)
+        rebuilt = {stats.pk: [getattr(stats, field) for field in STAT_FIELDS] for stats in ProjectStats.objects.all()}
+        self.assertEqual(kept, rebuilt)
+
+    def test_activity_counts(self):
+        first = self.activity()
+        self.activity()
+        stats = self.stats()
+        self.assertEqual((stats.activities_total, stats.activities_pending), (2, 2))
+
+        ProgressLog.objects.create(activity=first, date=date(2025, 2, 10), progress_percent=40)
+        first.refresh_from_db()
+        self.assertNotEqual(first.status, Activity.STATUS_PENDING)  # In Progress or Delayed, by today's date
+        stats = self.stats()
+        self.assertEqual((stats.activities_pending, getattr(stats, STATUS_FIELDS[first.status])), (1, 1))
+        self.assertEqual(stats.progress_sum, 40)
+        self.assertEqual(stats.last_progress_date, date(2025, 2, 10))
+        self.assertMatchesRebuild()
+
+    def test_moving_an_activity_moves_its_contribution(self):
+        activity = self.activity()
+        ProgressLog.objects.create(activity=activity, date=date(2025, 2, 10), progress_percent=100)
+        activity.refresh_from_db()
+        activity.project = self.other
+        activity.save()
+
+        self.assertEqual((self.stats().activities_total, self.stats().last_progress_date), (0, None))
+        stats = self.stats(self.other)
+        self.assertEqual((stats.activities_completed, stats.progress_sum), (1, 100))
+        self.assertEqual(stats.last_progress_date, date(2025, 2, 10))
+        self.assertMatchesRebuild()
+
+    def test_latest_date_recomputed_when_its_log_leaves(self):
+        activity = self.activity()
+        ProgressLog.objects.create(activity=activity, date=date(2025, 2, 10), progress_percent=20)
+        latest = ProgressLog.objects.create(activity=activity, date=date(2025, 2, 20), progress_percent=50)
+        self.assertEqual(self.stats().last_progress_date, date(2025, 2, 20))
+
+        ProgressLog.objects.filter(pk=latest.pk).soft_delete()
+        self.assertEqual(self.stats().last_progress_date, date(2025, 2, 10))
+        self.assertEqual(self.stats().progress_sum, 20)
+        self.assertMatchesRebuild()
+
+    def test_summary_activities_do_not_count(self):
+        summary = self.activity(name="Substructure")
+        child = self.activity(parent=summary)
+        self.assertEqual(self.stats().activities_total, 1)
+        self.assertMatchesRebuild()
+
+        ProgressLog.objects.create(activity=child, date=date(2025, 2, 10), progress_percent=60)
+        self.assertEqual(self.stats().progress_sum, 60)
+        summary.refresh_from_db()
+        summary.description = "Foundations and ground beams"
+        summary.save()
+        self.assertMatchesRebuild()
+
+        child.refresh_from_db()
+        child.parent = None
+        child.save()  # the summary is a leaf again
+        self.assertEqual(self.stats().activities_total, 2)
+        self.assertMatchesRebuild()
+
+    def test_sweep_leaves_summaries_alone(self):
+        summary = self.activity(name="Substructure")
+        self.activity(parent=summary)
+        sweep_overdue(today=date(2025, 6, 1))
+        statuses = dict(Activity.objects.values_list("pk", "status"))
+        self.assertEqual(statuses.pop(summary.pk), Activity.STATUS_PENDING)
+        self.assertEqual(list(statuses.values()), [Activity.STATUS_DELAYED])
+        self.assertEqual(self.stats().activities_delayed, 1)
+        self.assertMatchesRebuild()
+
+    def test_soft_delete_and_restore(self):
+        activity = self.activity()
+        Activity.objects.filter(pk=activity.pk).soft_delete()
+        self.assertEqual(self.stats().activities_total, 0)
+        Activity.objects.filter(pk=activity.pk).restore()
+        self.assertEqual(self.stats().activities_total, 1)
+        self.assertMatchesRebuild()
+
+    def test_fund_balance_follows_the_latest_transaction(self):
+        for day, kind, amount in [(1, FundTransaction.CREDIT, 500), (5, FundTransaction.DEBIT, 200)]:
+            FundTransaction.objects.create(
+                project=self.project, date=date(2025, 3, day), payee="Supplier", type=kind,
+                description="Cement", amount_paid=amount, pv_or_receipt_no=f"PV-{day}",
+            )
+        self.assertEqual(self.stats().fund_balance, Decimal("300.00"))
+        self.assertMatchesRebuild()
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.archived = create_project("P-001")
+        self.live = create_project("P-002")
+        for project, day in [(self.archived, 1), (self.live, 2)]:
+            FundTransaction.objects.create(
+                project=project, date=date(2025, 3, day), payee="Supplier", type=FundTransaction.CREDIT,
+                description="Advance", amount_paid=100, pv_or_receipt_no=f"PV-{day}",
+            )
+        archive_project(self.archived)
+
+    def test_reads_cover_live_and_archived_projects(self):
+        rows = live_and_archived(FundTransaction, lambda rows: rows.filter(is_active=True)).order_by("date", "id")
+        self.assertEqual([row.project_id for row in rows], [self.archived.pk, self.live.pk])
+
+        only_archived = live_and_archived(
+            FundTransaction, lambda rows: rows.filter(project=self.archived), [self.archived.pk]
+        )
+        self.assertEqual([row.pv_or_receipt_no for row in only_archived], ["PV-1"])
+
+    def test_writes_to_archived_project_refused(self):
+        tx = FundTransaction(
+            project=self.archived, date=date(2025, 3, 5), payee="Supplier", type=FundTransaction.DEBIT,
+            description="Cement", amount_paid=10, pv_or_receipt_no="PV-5",
+        )
+        with self.assertRaises(ValidationError):
+            tx.full_clean()
+        with self.assertRaises(ValidationError):
+            tx.save()
+        self.assertFalse(FundTransaction.objects.filter(project=self.archived).exists())
+
+    def test_interrupted_archive_is_resumed(self):
+        project = create_project("P-003", defects_end=date(2025, 6, 30))
+        for day in (3, 4):
+            FundTransaction.objects.create(
+                project=project, date=date(2025, 3, day), payee="Supplier", type=FundTransaction.CREDIT,
+                description="Advance", amount_paid=100, pv_or_receipt_no=f"PV-{day}",
+            )
+        copy = archive._copy
+        batches = iter([copy, mock.Mock(side_effect=RuntimeError)])
+        with mock.patch("projects.archive._copy", lambda rows, target: next(batches)(rows, target)), \
+                self.assertRaises(RuntimeError):
+            archive_project(project, batch_size=1)  # the second transaction fails
+        self.assertEqual(FundTransaction.objects.filter(project=project).count(), 1)
+        self.assertIn(project, closed_projects(date(2025, 7, 1)))
+        self.assertNotIn(self.archived, closed_projects(date(2025, 7, 1)))
+
+        archive_project(project, batch_size=1)
+        self.assertFalse(FundTransaction.objects.filter(project=project).exists())
+        self.assertNotIn(project, closed_projects(date(2025, 7, 1)))
+        rows = live_and_archived(FundTransaction, lambda rows: rows.filter(project=project), [project.pk])
+        self.assertEqual(sorted(row.pv_or_receipt_no for row in rows), ["PV-3", "PV-4"])
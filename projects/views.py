@@ -19,13 +19,12 @@ def project_list(request):
 
     if request.user.is_superuser or request.user.is_staff:
         # Admins see all projects
-        projects = Project.objects.filter(is_active=True)
+        projects = Project.active.all()
     else:
         # Normal users see only assigned projects
-        projects = Project.objects.filter(
+        projects = Project.active.filter(
             participants__user=request.user,
             participants__is_active=True,
-            is_active=True
         ).distinct()
 
     projects = projects.select_related("client").order_by("-commencement_date")
@@ -56,12 +55,11 @@ def project_list(request):
 def project_detail(request, pk):
 
     if request.user.is_superuser or request.user.is_staff:
-        project = get_object_or_404(Project, pk=pk, is_active=True)
+        project = get_object_or_404(Project.active, pk=pk)
     else:
         project = get_object_or_404(
-            Project,
+            Project.active,
             pk=pk,
-            is_active=True,
             participants__user=request.user,
             participants__is_active=True
         )
@@ -234,18 +232,16 @@ def project_edit(request, pk):
 @login_required
 @permission_required("projects.delete_project", raise_exception=True)
 def project_delete(request, pk):
-    project = get_object_or_404(Project, pk=pk, is_active=True)
+    project = get_object_or_404(Project.active, pk=pk)
 
     if request.method == "POST":
         try:
-            # Mark project as inactive
-            project.is_active = False
-            project.save()
-
-            # Optionally mark related records inactive
-            project.documents.update(is_active=False)
-            project.participants.update(is_active=False)
-            project.contractors.update(is_active=False)
+            # Mark the project and its related records inactive (one UPDATE each)
+            with transaction.atomic():
+                Project.objects.filter(pk=project.pk).soft_delete()
+                project.documents.soft_delete()
+                project.participants.soft_delete()
+                project.contractors.soft_delete()
 
             messages.success(request, "✅ Project deactivated successfully (all files kept).")
             return redirect("projects:project_list")
@@ -1,4 +1,6 @@
 from django.contrib import admin
+
+from common.admin import ActiveListFilter, restore_selected, soft_delete_selected
 from django.utils.html import format_html
 from .models import MaterialTest, WorkApproval
 
@@ -8,6 +10,7 @@ from .models import MaterialTest, WorkApproval
 # ---------------------------
 @admin.register(MaterialTest)
 class MaterialTestAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         'project',
         'material_type',
@@ -23,7 +26,7 @@ class MaterialTestAdmin(admin.ModelAdmin):
         'material_type',
         'result',
         'project',
-        'is_active',
+        ActiveListFilter,
     )
 
     search_fields = (
@@ -74,6 +77,7 @@ class MaterialTestAdmin(admin.ModelAdmin):
 # ---------------------------
 @admin.register(WorkApproval)
 class WorkApprovalAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         'activity_display',
         'approved_by',
@@ -85,7 +89,7 @@ class WorkApprovalAdmin(admin.ModelAdmin):
     list_filter = (
         'activity__project',
         'approved_by',
-        'is_active',
+        ActiveListFilter,
     )
 
     search_fields = (
@@ -36,7 +36,7 @@ class BaseForm(forms.ModelForm):
 
         # Filter project dropdown if exists
         if "project" in self.fields:
-            self.fields["project"].queryset = Project.objects.filter(is_active=True)
+            self.fields["project"].queryset = Project.active.all()
 
 
 # ---------------- Material Test Form ----------------
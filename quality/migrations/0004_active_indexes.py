@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_archived_at'),
+        ('quality', '0003_rename_lab_name_materialtest_consultant'),
+        ('sitemanage', '0017_archive_tables'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='materialtest',
+            index=models.Index(fields=['project', 'is_active', 'test_date'], name='mattest_proj_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workapproval',
+            index=models.Index(fields=['activity', 'is_active'], name='approval_act_active_idx'),
+        ),
+    ]
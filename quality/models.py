@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from projects.models import Project
 from sitemanage.models import Activity
+from common.managers import ActiveManager, SoftDeleteManager
 
 
 # ---------------------------
@@ -32,8 +33,14 @@ class MaterialTest(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["-test_date"]
+        indexes = [
+            models.Index(fields=["project", "is_active", "test_date"], name="mattest_proj_active_idx"),
+        ]
         permissions = [
             ("can_approve_material", "Can approve material test"),
         ]
@@ -54,8 +61,14 @@ class WorkApproval(models.Model):
     remarks = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["-approval_date"]
+        indexes = [
+            models.Index(fields=["activity", "is_active"], name="approval_act_active_idx"),
+        ]
         permissions = [
             ("can_approve_work", "Can approve work"),
         ]
@@ -14,9 +14,8 @@ from .forms import MaterialTestForm, WorkApprovalForm
 def get_allowed_projects(user):
     """Return queryset of projects the user is allowed to access."""
     if user.is_superuser or user.is_staff:
-        return Project.objects.filter(is_active=True)
-    return Project.objects.filter(
-        is_active=True,
+        return Project.active.all()
+    return Project.active.filter(
         participants__user=user,
         participants__is_active=True
     ).distinct()
@@ -42,7 +41,7 @@ def filter_work_by_allowed_projects(queryset, user):
 @permission_required('quality.view_materialtest', raise_exception=True)
 def material_test_list(request):
     search = request.GET.get('q', '').strip()
-    qs = MaterialTest.objects.filter(is_active=True).select_related("project")
+    qs = MaterialTest.active.select_related("project")
     qs = filter_by_allowed_projects(qs, request.user)
 
     if search:
@@ -65,7 +64,7 @@ def material_test_list(request):
 @login_required
 @permission_required('quality.view_materialtest', raise_exception=True)
 def material_test_report_view(request, pk):
-    obj = get_object_or_404(MaterialTest, pk=pk, is_active=True)
+    obj = get_object_or_404(MaterialTest.active, pk=pk)
     if obj.project not in get_allowed_projects(request.user):
         raise Http404("You do not have access to this report.")
     if not obj.report_file:
@@ -100,7 +99,7 @@ def material_test_create(request):
 @login_required
 @permission_required('quality.can_approve_material', raise_exception=True)
 def material_test_update(request, pk):
-    obj = get_object_or_404(MaterialTest, pk=pk, is_active=True)
+    obj = get_object_or_404(MaterialTest.active, pk=pk)
     if obj.project not in get_allowed_projects(request.user):
         messages.error(request, "You do not have permission to update this material test.")
         return redirect('quality:material_list')
@@ -122,7 +121,7 @@ def material_test_update(request, pk):
 @login_required
 @permission_required('quality.delete_materialtest', raise_exception=True)
 def material_test_delete(request, pk):
-    obj = get_object_or_404(MaterialTest, pk=pk, is_active=True)
+    obj = get_object_or_404(MaterialTest.active, pk=pk)
     if obj.project not in get_allowed_projects(request.user):
         messages.error(request, "You do not have permission to delete this material test.")
         return redirect('quality:material_list')
@@ -142,7 +141,7 @@ def material_test_delete(request, pk):
 @permission_required('quality.view_workapproval', raise_exception=True)
 def work_approval_list(request):
     search = request.GET.get('q', '').strip()
-    qs = WorkApproval.objects.filter(is_active=True).select_related('activity', 'approved_by')
+    qs = WorkApproval.active.select_related('activity', 'approved_by')
     qs = filter_work_by_allowed_projects(qs, request.user)
 
     if search:
@@ -185,7 +184,7 @@ def work_approval_create(request):
 @login_required
 @permission_required('quality.can_approve_work', raise_exception=True)
 def work_approval_update(request, pk):
-    approval = get_object_or_404(WorkApproval, pk=pk, is_active=True)
+    approval = get_object_or_404(WorkApproval.active, pk=pk)
     if approval.activity.project not in get_allowed_projects(request.user):
         messages.error(request, "You do not have permission to update this work approval.")
         return redirect("quality:work_list")
@@ -209,7 +208,7 @@ def work_approval_update(request, pk):
 @login_required
 @permission_required('quality.delete_workapproval', raise_exception=True)
 def work_approval_delete(request, pk):
-    approval = get_object_or_404(WorkApproval, pk=pk, is_active=True)
+    approval = get_object_or_404(WorkApproval.active, pk=pk)
     if approval.activity.project not in get_allowed_projects(request.user):
         messages.error(request, "You do not have permission to delete this work approval.")
         return redirect("quality:work_list")
@@ -1,3 +1,62 @@
+import csv
+
 from django.contrib import admin
+from django.http import HttpResponse
+
+from .models import ReportRun
+
+PHASES = ("import", "queries", "images", "layout", "serialize")
+
+
+@admin.register(ReportRun)
+class ReportRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "started_at",
+        "report",
+        "format",
+        "project",
+        "user",
+        "total_ms",
+        "sql_count",
+        "sql_ms",
+        "peak_memory_kb",
+        "output_bytes",
+        "row_count",
+        "image_count",
+        "succeeded",
+    )
+    list_filter = ("report", "format", "succeeded", "project")
+    date_hierarchy = "started_at"
+    ordering = ("-started_at",)
+    actions = ["export_csv"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
-# Register your models here.
+    @admin.action(description="Export selected runs to CSV")
+    def export_csv(self, request, queryset):
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="report_runs.csv"'
+        writer = csv.writer(response)
+        writer.writerow(
+            ["Started", "Report", "Format", "Project", "User", "Succeeded",
+             "Total ms", "SQL count", "SQL ms", "Peak memory KB", "Output bytes",
+             "Rows", "Images"]
+            + [f"{name} ms" for name in PHASES]
+            + [f"{name} SQL count" for name in PHASES]
+        )
+        for run in queryset.select_related("project", "user"):
+            phases = run.phases or {}
+            writer.writerow(
+                [run.started_at.isoformat(), run.report, run.format,
+                 run.project.project_name if run.project else "",
+                 run.user.username if run.user else "", run.succeeded,
+                 run.total_ms, run.sql_count, run.sql_ms, run.peak_memory_kb,
+                 run.output_bytes, run.row_count, run.image_count]
+                + [phases.get(name, {}).get("ms", "") for name in PHASES]
+                + [phases.get(name, {}).get("sql_count", "") for name in PHASES]
+            )
+        return response
@@ -0,0 +1,363 @@
+"""
+Self-contained report datasets.
+
+export_dataset() copies everything the report definitions read for one
+project up to the end of a period into a standalone SQLite file:
+
+- the project's rows (activities, logs, images, visitors, finance, resources,
+  quality, compliance, covers and progress snapshots), dated rows only up to
+  the period end; the rows of an archived project (projects.archive) go to
+  the live tables, so the dataset's project is never archived;
+- activities as they stood at the period end (sitemanage.asof: progress,
+  status, latest log), without those created after it; the WBS rollups,
+  schedule (with the period end as the data date), ProjectStats, cash flow
+  and earned value are then recomputed from the dataset rows;
+- the rows they reference (users, categories, clients, contractors, roles,
+  authorities), users without passwords;
+- the tables are created from the models, with their indexes, and rows are
+  copied as stored (no auto_now refresh);
+- a `dataset_info` table and a manifest file (<name>.manifest.json) describe
+  the export and list every referenced media file with its size and sha256;
+  with copy_media the files are copied next to the dataset (<name>_media/).
+
+using_dataset() opens a file under its own database alias and routes every
+query to it (reports.routers.DatasetRouter), so render_dataset_report() runs
+the usual definitions and renderers without touching the live database.
+"""
+import hashlib
+import json
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from common.models import ProjectDataVersion
+from compliance.models import Compliance
+from finance.cashflow import rebuild_cash_flow
+from finance.evm import compute_evm_periods
+from finance.models import (
+    ArchivedFundTransaction,
+    EarnedValuePeriod,
+    FundTransaction,
+    MonthlyCashFlow,
+    PaymentCertificate,
+)
+from progress.models import ActivitySnapshot, ProgressSnapshot
+from projects.archive import ARCHIVES
+from projects.models import Project, ProjectContractor, ProjectParticipant, ProjectStats
+from projects.stats import rebuild_project_stats
+from quality.models import MaterialTest, WorkApproval
+from resources.models import Equipment, Manpower
+from sitemanage import cpm
+from sitemanage.asof import activities_as_of
+from sitemanage.models import (
+    Activity,
+    ActivityClosure,
+    ActivityDependency,
+    ArchivedProgressLog,
+    ArchivedSiteProjectImage,
+    ProgressLog,
+    SiteProjectImage,
+    SiteVisitor,
+)
+from sitemanage.wbs import refresh_rollups
+
+from .models import ProgressReportCover
+from .routers import active_dataset
+
+FORMAT_VERSION = 2
+
+# (model, lookup of the project id, date field limited to the period end)
+SCOPE = [
+    (Project, "pk", None),
+    (ProjectStats, "project", None),
+    (ProjectDataVersion, "project_id", None),
+    (ProjectParticipant, "project", None),
+    (ProjectContractor, "project", None),
+    (Activity, "project", None),
+    (ActivityClosure, "descendant__project", None),
+    (ActivityDependency, "successor__project", None),
+    (ProgressLog, "activity__project", "date"),
+    (SiteProjectImage, "project", "image_date"),
+    (SiteVisitor, "project", "visit_date"),
+    (PaymentCertificate, "project", "date_certified"),
+    (FundTransaction, "project", "date"),
+    (EarnedValuePeriod, "project", "period"),
+    (MonthlyCashFlow, "project", "period"),
+    (Equipment, "project", "delivery_date"),
+    (Manpower, "project", "start_date"),
+    (MaterialTest, "project", "test_date"),
+    (WorkApproval, "activity__project", "approval_date"),
+    (Compliance, "project", None),
+    (ProgressReportCover, "project", "period_to"),
+    (ProgressSnapshot, "project", "period_end"),
+    (ActivitySnapshot, "snapshot__project", "snapshot__period_end"),
+    # rows of an archived project (projects.archive)
+    (ArchivedProgressLog, "activity__project", "date"),
+    (ArchivedSiteProjectImage, "project", "image_date"),
+    (ArchivedFundTransaction, "project", "date"),
+]
+
+
+def manifest_path(path):
+    return Path(path).with_suffix(".manifest.json")
+
+
+def media_dir(path):
+    path = Path(path)
+    return path.with_name(f"{path.stem}_media")
+
+
+# ---------------- Collecting ----------------
+def collect_rows(project_id, period_end):
+    """{model: {pk: instance}} for the project, plus every row they reference."""
+    rows = {}
+    for model, lookup, date_field in SCOPE:
+        queryset = model._base_manager.filter(**{lookup: project_id})
+        if date_field:
+            queryset = queryset.filter(**{f"{date_field}__lte": period_end})
+        rows[model] = {obj.pk: obj for obj in queryset}
+
+    # Activities as of the period end; rows of those created after it go too
+    activities = {activity.pk: activity for activity in activities_as_of(rows[Activity].values(), period_end)}
+    dropped = set(rows[Activity]) - set(activities)
+    rows[Activity] = activities
+    if dropped:
+        for activity in activities.values():
+            if activity.parent_id in dropped:
+                activity.parent_id = None
+        for model, objs in rows.items():
+            if model is Activity:
+                continue
+            links = [field.attname for field in model._meta.concrete_fields if field.related_model is Activity]
+            for pk in [pk for pk, obj in objs.items() if any(getattr(obj, link) in dropped for link in links)]:
+                del objs[pk]
+
+    # Archived rows back to the live tables (same columns and ids)
+    for model, (archive, _lookup) in ARCHIVES.items():
+        fields = model._meta.local_concrete_fields
+        for pk, obj in rows.pop(archive).items():
+            rows[model][pk] = model(**{field.attname: getattr(obj, field.attname) for field in fields})
+    for project in rows[Project].values():
+        project.archived_at = None
+
+    # Referenced rows outside the scope (users, setup tables), transitively.
+    # References into the scope that fall after the period are left dangling.
+    scoped = {model for model, _lookup, _date in SCOPE}
+    pending = list(rows)
+    while pending:
+        model = pending.pop()
+        for field in model._meta.concrete_fields:
+            target = field.related_model
+            if not field.is_relation or target in scoped:
+                continue
+            seen = target in rows
+            known = rows.setdefault(target, {})  # the table is created even when empty
+            ids = {getattr(obj, field.attname) for obj in rows[model].values()} - set(known) - {None}
+            if ids:
+                known.update((obj.pk, obj) for obj in target._base_manager.filter(pk__in=ids))
+            if ids or not seen:
+                pending.append(target)
+
+    for user in rows.get(get_user_model(), {}).values():
+        user.set_unusable_password()
+    return rows
+
+
+def media_files(rows):
+    """[(model label, pk, field name, file name)] of the non-empty file fields."""
+    files = []
+    for model, objs in rows.items():
+        fields = [field for field in model._meta.concrete_fields if isinstance(field, models.FileField)]
+        for obj in objs.values():
+            for field in fields:
+                name = getattr(obj, field.attname)
+                if name:
+                    files.append((model._meta.label, obj.pk, field.name, name))
+    return files
+
+
+def _file_entry(label, pk, field, name, copy_to=None):
+    entry = {"model": label, "pk": pk, "field": field, "name": name, "present": False}
+    source = Path(settings.MEDIA_ROOT) / name
+    if source.is_file():
+        digest = hashlib.sha256()
+        with source.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+        entry.update(present=True, size=source.stat().st_size, sha256=digest.hexdigest())
+        if copy_to is not None:
+            target = copy_to / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+    return entry
+
+
+# ---------------- Connections ----------------
+def open_dataset(path):
+    """Register the SQLite file as a database alias and return the alias."""
+    path = Path(path).resolve()
+    alias = "dataset_" + hashlib.sha1(str(path).encode()).hexdigest()[:12]
+    if alias not in connections.settings:
+        connections.settings[alias] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: {"ENGINE": "django.db.backends.sqlite3", "NAME": str(path)},
+        })[DEFAULT_DB_ALIAS]
+    return alias
+
+
+def close_dataset(alias):
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+@contextmanager
+def using_dataset(path):
+    """Route every query in the block to the dataset file; yields its dataset_info."""
+    if not Path(path).is_file():
+        raise FileNotFoundError(path)
+    alias = open_dataset(path)
+    token = active_dataset.set(alias)
+    try:
+        yield read_info(alias)
+    finally:
+        active_dataset.reset(token)
+        close_dataset(alias)
+
+
+def read_info(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT key, value FROM dataset_info")
+        return {key: json.loads(value) for key, value in cursor.fetchall()}
+
+
+# ---------------- Export ----------------
+def export_dataset(project, period_from, period_to, path, copy_media=False):
+    """
+    Write the project's reporting dataset up to `period_to` to a new SQLite
+    file at `path` and its manifest next to it. Returns the manifest.
+    """
+    path = Path(path)
+    if path.exists():
+        raise FileExistsError(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    rows = collect_rows(project.pk, period_to)
+    info = {
+        "format_version": FORMAT_VERSION,
+        "project_id": project.pk,
+        "project_name": project.project_name,
+        "period_from": period_from.isoformat(),
+        "period_to": period_to.isoformat(),
+        "exported_at": timezone.now().isoformat(),
+        "rows": {model._meta.label: len(objs) for model, objs in rows.items()},
+    }
+
+    alias = open_dataset(path)
+    try:
+        connection = connections[alias]
+        with connection.schema_editor() as editor:
+            for model in rows:
+                editor.create_model(model)
+        connection.disable_constraint_checking()
+        try:
+            with transaction.atomic(using=alias):
+                for model, objs in rows.items():
+                    _insert(model, list(objs.values()), alias)
+                token = active_dataset.set(alias)
+                try:
+                    _refresh_derived(project.pk, period_to)
+                finally:
+                    active_dataset.reset(token)
+                with connection.cursor() as cursor:
+                    cursor.execute("CREATE TABLE dataset_info (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                    cursor.executemany(
+                        "INSERT INTO dataset_info (key, value) VALUES (%s, %s)",
+                        [(key, json.dumps(value)) for key, value in info.items()],
+                    )
+        finally:
+            connection.enable_constraint_checking()
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM")
+    finally:
+        close_dataset(alias)
+
+    copy_to = media_dir(path) if copy_media else None
+    manifest = {
+        **info,
+        "dataset": path.name,
+        "media": [_file_entry(*file, copy_to=copy_to) for file in media_files(rows)],
+        "media_dir": copy_to.name if copy_to else None,
+    }
+    manifest_path(path).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _refresh_derived(project_id, period_to):
+    """
+    Recompute the stored rollups of the dataset's rows (queries routed to the
+    dataset), with `period_to` standing in for today: what the live tables
+    hold was computed from rows after the period.
+    """
+    refresh_rollups(Activity.objects.filter(project_id=project_id))
+    cpm.reschedule(project_id, today=period_to)
+    rebuild_project_stats([project_id])
+    rebuild_cash_flow([project_id])
+    MonthlyCashFlow.objects.filter(project_id=project_id, period__gt=period_to).delete()
+
+    EarnedValuePeriod.objects.filter(project_id=project_id).delete()
+    EarnedValuePeriod.objects.bulk_create([
+        EarnedValuePeriod(
+            project_id=project_id, period=period, planned_value=planned, earned_value=earned, actual_cost=cost,
+        )
+        for period, planned, earned, cost in compute_evm_periods(Project.objects.get(pk=project_id), today=period_to)
+        if period <= period_to
+    ])
+
+
+def _insert(model, objs, alias):
+    """Insert rows as stored (raw: auto_now fields keep their values)."""
+    if not objs:
+        return
+    fields = model._meta.local_concrete_fields
+    batch_size = max(connections[alias].ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), batch_size):
+        model._base_manager.using(alias)._insert(objs[start:start + batch_size], fields=fields, using=alias, raw=True)
+
+
+# ---------------- Rendering ----------------
+def render_dataset_report(path, report, fmt, from_date=None, to_date=None, media_root=None):
+    """
+    Render a registered report from a dataset file. Dates default to the
+    dataset period; media default to the copied <name>_media directory.
+    Returns (content, renderer).
+    """
+    from .definitions import ReportParams, get_definition
+    from .renderers import get_renderer
+
+    definition = get_definition(report)
+    if fmt not in definition.formats:
+        raise ValueError(f"{report} is not available as {fmt}")
+    if media_root is None and media_dir(path).is_dir():
+        media_root = media_dir(path)
+
+    with using_dataset(path) as info, override_settings(MEDIA_ROOT=str(media_root or settings.MEDIA_ROOT)):
+        params = ReportParams(
+            get_user_model()(username="dataset", is_superuser=True),
+            info["project_id"],
+            from_date or info["period_from"],
+            to_date or info["period_to"],
+        )
+        renderer = get_renderer(fmt)
+        blocks = definition.blocks_for(params, fmt)
+        content = renderer.render(blocks, definition.filename.replace("_", " ").title())
+    return content, renderer
+
+
+def dataset_filename(project, period_to):
+    return f"{project.project_code or project.pk}_{period_to:%Y-%m-%d}.sqlite3".replace("/", "-")
@@ -0,0 +1,29 @@
+"""
+Registry of downloadable reports.
+
+Each report is a ReportDefinition registered once under its key; the generic
+download view (reports.views.report_download) renders it in any of its
+formats through reports.renderers.
+"""
+from .base import ReportDefinition, ReportError, ReportParams
+
+REPORTS = {}
+
+
+def register(definition_class):
+    """Class decorator adding a report definition to the registry."""
+    REPORTS[definition_class.key] = definition_class()
+    return definition_class
+
+
+def get_definition(key):
+    try:
+        return REPORTS[key]
+    except KeyError:
+        raise LookupError(f"Unknown report: {key}")
+
+
+# Import definitions so they register themselves.
+from . import finance, progress, project, quality, resources  # noqa: E402,F401
+
+__all__ = ["REPORTS", "ReportDefinition", "ReportError", "ReportParams", "get_definition", "register"]
@@ -0,0 +1,216 @@
+"""
+Building blocks of a report definition.
+
+A definition turns the request filters into a list of blocks (headings,
+tables, key/value details, text, images). Format backends in
+reports.renderers know how to draw each block, so a report is written once
+and downloaded as xlsx, csv, pdf or docx.
+"""
+import datetime
+from decimal import Decimal
+
+from projects.models import Project
+
+
+class ReportError(Exception):
+    """Raised by a definition when the report cannot be built (shown to the user)."""
+
+
+# ---------------- Filters ----------------
+def parse_wbs_level(value):
+    """A positive WBS level from a query-string value, or None when blank or invalid."""
+    try:
+        level = int(value)
+    except (TypeError, ValueError):
+        return None
+    return level if level > 0 else None
+
+
+class ReportParams:
+    """
+    Request filters shared by every report: user, project and date range,
+    and the WBS level activity reports group by (None: by work category).
+    """
+
+    def __init__(self, user, project_id=None, from_date=None, to_date=None, wbs_level=None):
+        self.user = user
+        self.project_id = project_id if project_id not in (None, "", "None") else None
+        self.from_date = from_date or None
+        self.to_date = to_date or None
+        self.wbs_level = parse_wbs_level(wbs_level)
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(
+            request.user,
+            request.GET.get("project"),
+            request.GET.get("from_date"),
+            request.GET.get("to_date"),
+            request.GET.get("wbs_level"),
+        )
+
+    def allowed_projects(self):
+        if self.user.is_superuser or self.user.is_staff:
+            return Project.objects.filter(is_active=True)
+        return Project.objects.filter(
+            is_active=True,
+            participants__user=self.user,
+            participants__is_active=True
+        ).distinct()
+
+    def scope(self, queryset, project_field="project", date_field=None):
+        """Restrict to allowed projects, the selected project and the date range."""
+        if not (self.user.is_superuser or self.user.is_staff):
+            queryset = queryset.filter(**{f"{project_field}__in": self.allowed_projects()})
+        if self.project_id:
+            queryset = queryset.filter(**{project_field: self.project_id})
+        if date_field and self.from_date:
+            queryset = queryset.filter(**{f"{date_field}__gte": self.from_date})
+        if date_field and self.to_date:
+            queryset = queryset.filter(**{f"{date_field}__lte": self.to_date})
+        return queryset
+
+
+# ---------------- Columns ----------------
+class Column:
+    """
+    One table column.
+
+    `value` is a dotted attribute path on the row or a callable(row).
+    `fmt` is "money" or "percent" for document formats; spreadsheets always
+    receive the raw value. `width` is a fraction of the page width (pdf).
+    """
+
+    def __init__(self, label, value, fmt=None, align="left", width=None):
+        self.label = label
+        self.value = value
+        self.fmt = fmt
+        self.align = align
+        self.width = width
+
+    def get(self, row):
+        if callable(self.value):
+            return self.value(row)
+        for attr in self.value.split("."):
+            row = getattr(row, attr, None)
+            if row is None:
+                return None
+        return row
+
+    def raw(self, row):
+        """Value for spreadsheets (xlsx, csv)."""
+        value = self.get(row)
+        if value is None:
+            return ""
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.strftime("%Y-%m-%d")
+        return value
+
+    def text(self, row):
+        """Value for documents (pdf, docx)."""
+        value = self.get(row)
+        if value is None or value == "":
+            return "-"
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.strftime("%Y-%m-%d")
+        if self.fmt == "money":
+            return f"{Decimal(value):,.2f}"
+        if self.fmt == "percent":
+            return f"{value}%"
+        return str(value)
+
+
+# ---------------- Blocks ----------------
+class Block:
+    # Restrict a block to some formats, e.g. ("xlsx", "csv"); None means all.
+    formats = None
+
+    def renders_in(self, fmt):
+        return self.formats is None or fmt in self.formats
+
+
+class Heading(Block):
+    def __init__(self, text, level=2, formats=None):
+        self.text = text
+        self.level = level
+        self.formats = formats
+
+
+class Text(Block):
+    def __init__(self, text, formats=None):
+        self.text = text
+        self.formats = formats
+
+
+class Section(Block):
+    """A titled table: header row from `columns`, one row per item in `rows`."""
+
+    def __init__(self, title, columns, rows, empty_text=None, numbered=False, formats=None):
+        self.title = title
+        self.columns = list(columns)
+        if numbered:
+            self.columns.insert(0, Column("S/N", lambda row: None, align="center", width=0.07))
+        self.numbered = numbered
+        self.rows = rows
+        self.empty_text = empty_text
+        self.formats = formats
+
+    def raw_rows(self):
+        for index, row in enumerate(self.rows, start=1):
+            values = [column.raw(row) for column in self.columns]
+            if self.numbered:
+                values[0] = index
+            yield values
+
+    def text_rows(self):
+        for index, row in enumerate(self.rows, start=1):
+            values = [column.text(row) for column in self.columns]
+            if self.numbered:
+                values[0] = str(index)
+            yield values
+
+
+class Details(Block):
+    """Label/value pairs drawn as a two-column table without header."""
+
+    def __init__(self, pairs, formats=None):
+        self.pairs = [(label, "-" if value in (None, "") else value) for label, value in pairs]
+        self.formats = formats
+
+
+class Images(Block):
+    """Image thumbnails with captions: [(path, caption), ...]."""
+
+    def __init__(self, title, images, formats=("pdf",)):
+        self.title = title
+        self.images = images
+        self.formats = formats
+
+
+# ---------------- Definition ----------------
+class ReportDefinition:
+    """
+    Base class of a downloadable report.
+
+    Subclasses set the metadata below and implement build(params), returning
+    the list of blocks to render. Register them with reports.definitions.register.
+    """
+    key = None
+    title = None
+    permission = None
+    list_url = None          # where to redirect on validation errors
+    filename = None
+    formats = ("xlsx", "pdf", "docx")
+    project_required = True
+
+    def build(self, params):
+        raise NotImplementedError
+
+    def get_title(self, params):
+        return self.title
+
+    def blocks_for(self, params, fmt):
+        """Title (documents only) followed by the blocks that apply to `fmt`."""
+        blocks = [Heading(self.get_title(params), level=1, formats=("pdf", "docx"))]
+        blocks += self.build(params)
+        return [block for block in blocks if block.renders_in(fmt)]
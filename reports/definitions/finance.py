@@ -0,0 +1,41 @@
+from finance.models import FundTransaction, PaymentCertificate
+from projects.archive import source
+
+from . import register
+from .base import Column, ReportDefinition, Section
+
+
+@register
+class FinanceReport(ReportDefinition):
+    key = "finance"
+    title = "FINANCE REPORT"
+    permission = "reports.view_financereport"
+    list_url = "reports:finance_report"
+    filename = "finance_report"
+
+    def build(self, params):
+        payments = params.scope(
+            PaymentCertificate.objects.filter(is_active=True), date_field="payment_date"
+        ).select_related("project").order_by("-payment_date")
+        transactions = params.scope(
+            source(FundTransaction, params.project_id).filter(is_active=True), date_field="date"
+        ).select_related("project").order_by("date", "id")
+
+        return [
+            Section("Payment Certificates", [
+                Column("Project", "project.project_name", width=0.2),
+                Column("Certificate No", "certificate_no", width=0.2),
+                Column("Certified Amount", "certified_amount", fmt="money", align="right", width=0.15),
+                Column("Amount Paid", "amount_paid", fmt="money", align="right", width=0.15),
+                Column("Payment Date", "payment_date", width=0.15),
+                Column("PV No", "pv_no", width=0.15),
+            ], payments),
+            Section("Fund Utilization", [
+                Column("Project", "project.project_name", width=0.2),
+                Column("Date", "date", width=0.15),
+                Column("Payee", "payee", width=0.25),
+                Column("Type", "type", width=0.1),
+                Column("Amount Paid", "amount_paid", fmt="money", align="right", width=0.15),
+                Column("Balance After", "balance_after", fmt="money", align="right", width=0.15),
+            ], transactions),
+        ]
@@ -0,0 +1,156 @@
+from itertools import groupby
+
+from progress.snapshots import find_snapshot, period_rows
+from projects.archive import source
+from projects.models import Project
+from sitemanage.asof import activities_as_of, parse_as_of
+from sitemanage.cpm import critical_path, forecast
+from sitemanage.models import Activity, ProgressLog, SiteProjectImage
+from sitemanage.wbs import group_by_level
+
+from . import register
+from .base import Column, Images, ReportDefinition, ReportError, Section, Text
+
+DOCUMENTS = ("pdf", "docx")
+SPREADSHEETS = ("xlsx", "csv")
+
+
+@register
+class ProgressReport(ReportDefinition):
+    key = "progress"
+    title = "PROJECT PROGRESS REPORT"
+    permission = "reports.view_progressreport"
+    list_url = "reports:progress_report"
+    filename = "progress_report"
+    formats = ("csv", "pdf", "docx")
+
+    def get_project(self, params):
+        project = params.scope(Project.objects.filter(is_active=True), project_field="id").first()
+        if project is None:
+            raise ReportError("No activities found for the selected project.")
+        return project
+
+    def get_title(self, params):
+        project = self.get_project(params)
+        return f"{project.project_name} ({project.project_code})"
+
+    def build(self, params):
+        project = self.get_project(params)
+        activities = (
+            Activity.objects.filter(project=project, is_active=True).leaves()
+            .select_related("project", "category")
+            .order_by("category__name", "name")
+        )
+        # A period report shows progress as it stood at the end of the period:
+        # from the period-close snapshot when one was taken, else rebuilt from the logs
+        as_of = parse_as_of(params.to_date)
+        snapshot = find_snapshot(project.id, as_of) if as_of else None
+        if snapshot:
+            activities = period_rows(snapshot)
+            activity_ids = [row.activity_id for row in activities if row.activity_id]
+        else:
+            activities = activities_as_of(activities, as_of) if as_of else list(activities)
+            for activity in activities:
+                activity.category_name = activity.category.name if activity.category else ""
+            activity_ids = [activity.id for activity in activities]
+        if not activities:
+            raise ReportError("No activities found for the selected project.")
+
+        # Grouped under their WBS ancestor at the requested level instead of by category
+        wbs_groups = []
+        if params.wbs_level:
+            key = (lambda row: row.activity_id) if snapshot else (lambda row: row.id)
+            wbs_groups = group_by_level(activities, params.wbs_level, key)
+            for name, rows, _percent in wbs_groups:
+                for row in rows:
+                    row.wbs_group = name
+
+        logs = params.scope(
+            source(ProgressLog, project.id).filter(is_active=True),
+            project_field="activity__project", date_field="date",
+        ).select_related("activity").order_by("date", "id")
+
+        blocks = []
+        if as_of:
+            blocks.append(Text(f"Progress as of {as_of:%d %B %Y}", formats=DOCUMENTS))
+        activity_columns = [
+            Column("Project", lambda row: project.project_name),
+            Column("Activity", "name"),
+            Column("Status", "status"),
+            Column("Progress %", "progress_percent"),
+            Column("Planned End", "planned_end"),
+        ]
+        if wbs_groups:
+            activity_columns.insert(1, Column("WBS Group", lambda row: getattr(row, "wbs_group", "")))
+        blocks += [
+            Section("Activities", activity_columns, activities, formats=SPREADSHEETS),
+            Section("Progress Logs", [
+                Column("Activity", "activity.name"),
+                Column("Date", "date"),
+                Column("Progress %", "progress_percent"),
+                Column("Remarks", "remarks"),
+            ], logs, formats=SPREADSHEETS),
+        ]
+
+        if snapshot:
+            blocks.append(Section("PROGRESS THIS PERIOD", [
+                Column("Activity", "name", width=0.43),
+                Column("Previous %", "previous_percent", fmt="percent", align="center", width=0.12),
+                Column("Progress %", "progress_percent", fmt="percent", align="center", width=0.12),
+                Column("Change", "change", align="center", width=0.11),
+                Column("Target Next Period", "target_percent", fmt="percent", align="center", width=0.15),
+            ], activities, numbered=True))
+
+        activity_table = [
+            Column("Activity Description", "name", width=0.58),
+            Column("Progress %", "progress_percent", fmt="percent", align="center", width=0.15),
+            Column("Remarks", "latest_remarks", align="center", width=0.20),
+        ]
+        if wbs_groups:
+            for name, rows, percent in wbs_groups:
+                blocks.append(Section(f"WBS: {name} ({percent}%)", activity_table, rows, numbered=True, formats=DOCUMENTS))
+        else:
+            for category_name, acts in groupby(activities, lambda a: a.category_name or "Uncategorized"):
+                blocks.append(Section(f"Category: {category_name}", activity_table, list(acts), numbered=True, formats=DOCUMENTS))
+
+        ongoing = [a for a in activities if a.status == Activity.STATUS_IN_PROGRESS]
+        blocks.append(Section("STATUS OF ON-GOING SITE WORKS", [
+            Column("Activity", "name", width=0.58),
+            Column("Status", "status", width=0.20),
+            Column("Progress %", "progress_percent", fmt="percent", align="center", width=0.15),
+        ], ongoing, numbered=True, empty_text="No activities currently in progress.", formats=DOCUMENTS))
+
+        # Today's forecast over the activity dependencies (sitemanage.cpm)
+        completion, slip = forecast(project)
+        if completion:
+            if slip > 0:
+                against = f"{slip} days after"
+            elif slip < 0:
+                against = f"{-slip} days before"
+            else:
+                against = "on"
+            blocks.append(Text(
+                f"Forecast completion: {completion:%d %B %Y} ({against} the practical completion date "
+                f"{project.practical_completion_date:%d %B %Y})",
+                formats=DOCUMENTS,
+            ))
+            blocks.append(Section("CRITICAL PATH", [
+                Column("Activity", "name", width=0.43),
+                Column("Early Start", "early_start", align="center", width=0.15),
+                Column("Early Finish", "early_finish", align="center", width=0.15),
+                Column("Float (days)", "total_float", align="center", width=0.10),
+                Column("Progress %", "progress_percent", fmt="percent", align="center", width=0.10),
+            ], list(critical_path(project)), numbered=True, empty_text="No activities on the critical path."))
+
+        order = {activity_id: index for index, activity_id in enumerate(activity_ids)}
+        images = sorted(
+            source(SiteProjectImage, project.id).filter(activity__in=activity_ids, is_active=True).select_related("activity"),
+            key=lambda image: (order[image.activity_id], image.id),
+        )
+        if images:
+            blocks.append(Images("SITE IMAGES FOR ACTIVITIES", [
+                (image.image.path, f"{image.activity.name} ({image.image_date or '-'})")
+                for image in images
+            ]))
+
+        return blocks
@@ -0,0 +1,110 @@
+from django.db.models import Prefetch
+
+from projects.models import Project, ProjectContractor, ProjectParticipant
+
+from . import register
+from .base import Column, Details, Heading, ReportDefinition, Section
+
+
+@register
+class ProjectReport(ReportDefinition):
+    key = "project"
+    title = "PROJECT OVERVIEW"
+    permission = "reports.view_projectreport"
+    list_url = "reports:project_report"
+    filename = "project_report"
+
+    columns = [
+        Column("Project Code", "project_code"),
+        Column("Project Name", "project_name"),
+        Column("Client", "client.name"),
+        Column("Location", "location"),
+        Column("Contract Sum", lambda p: float(p.contract_sum), fmt="money"),
+        Column("Contract Duration (Months)", "contract_duration_months"),
+        Column("Contract Signing Date", "contract_signing_date"),
+        Column("Mobilization Start", "mobilization_start"),
+        Column("Mobilization End", "mobilization_end"),
+        Column("Commencement Date", "commencement_date"),
+        Column("Practical Completion", "practical_completion_date"),
+        Column("Delay Status", "delay_status"),
+        Column("Defects Liability (Days)", "defects_liability_period_days"),
+        Column("Defects Start", "defects_start"),
+        Column("Defects End", "defects_end"),
+        Column("Participants", lambda p: ", ".join(
+            f"{part.user.get_full_name() or part.user.username} ({part.project_role.name})"
+            for part in p.active_participants
+        ) or "N/A"),
+        Column("Contractors", lambda p: ", ".join(
+            f"{c.contractor.name} ({c.contractor.contractor_type.name}) - {c.work_description}"
+            for c in p.active_contractors
+        ) or "N/A"),
+    ]
+
+    def get_projects(self, params):
+        return params.scope(
+            Project.objects.filter(is_active=True), project_field="id"
+        ).select_related("client").prefetch_related(
+            Prefetch(
+                "participants",
+                queryset=ProjectParticipant.objects.filter(is_active=True).select_related("user", "project_role"),
+                to_attr="active_participants",
+            ),
+            Prefetch(
+                "contractors",
+                queryset=ProjectContractor.objects.filter(is_active=True).select_related("contractor__contractor_type"),
+                to_attr="active_contractors",
+            ),
+        ).order_by("project_name")
+
+    def build(self, params):
+        projects = list(self.get_projects(params))
+
+        # Spreadsheets: one row per project
+        blocks = [Section("Project Report", self.columns, projects, formats=("xlsx", "csv"))]
+
+        # Documents: details, participants and contractors per project
+        documents = ("pdf", "docx")
+        for p in projects:
+            blocks += [
+                Heading(p.project_name, formats=documents),
+                Details([
+                    ("Project Code", p.project_code),
+                    ("Project Name", p.project_name),
+                    ("Client", p.client.name),
+                    ("Location", p.location),
+                    ("Contract Sum", f"{p.contract_sum:,.2f}"),
+                    ("Contract Duration (Months)", p.contract_duration_months),
+                    ("Contract Signing Date", p.contract_signing_date),
+                    ("Site Possession Date", p.site_possession_date),
+                    ("Mobilization Start", p.mobilization_start),
+                    ("Mobilization End", p.mobilization_end),
+                    ("Commencement Date", p.commencement_date),
+                    ("Practical Completion Date", p.practical_completion_date),
+                    ("Delay Status", p.delay_status),
+                    ("Defects Liability Period (Days)", p.defects_liability_period_days),
+                    ("Defects Start Date", p.defects_start),
+                    ("Defects End Date", p.defects_end),
+                ], formats=documents),
+                Section(
+                    "Project Participants",
+                    [
+                        Column("Name", lambda part: part.user.get_full_name() or part.user.username, width=0.6),
+                        Column("Role", "project_role.name", width=0.4),
+                    ],
+                    p.active_participants,
+                    empty_text="No participants assigned",
+                    formats=documents,
+                ),
+                Section(
+                    "Contractors",
+                    [
+                        Column("Contractor", "contractor.name", width=0.25),
+                        Column("Type", "contractor.contractor_type.name", width=0.20),
+                        Column("Work Description", "work_description", width=0.55),
+                    ],
+                    p.active_contractors,
+                    empty_text="No contractors assigned",
+                    formats=documents,
+                ),
+            ]
+        return blocks
@@ -0,0 +1,52 @@
+from compliance.models import Compliance
+from quality.models import MaterialTest, WorkApproval
+
+from . import register
+from .base import Column, ReportDefinition, Section
+
+
+@register
+class QualityReport(ReportDefinition):
+    key = "quality"
+    title = "QUALITY REPORT"
+    permission = "reports.view_qualityreport"
+    list_url = "reports:quality_report"
+    filename = "quality_report"
+    formats = ("csv", "pdf", "docx")
+
+    def build(self, params):
+        material_tests = params.scope(
+            MaterialTest.objects.filter(is_active=True), date_field="test_date"
+        ).select_related("project")
+        work_approvals = params.scope(
+            WorkApproval.objects.filter(is_active=True),
+            project_field="activity__project", date_field="approval_date",
+        ).select_related("activity__project", "approved_by")
+        compliances = params.scope(
+            Compliance.objects.filter(is_active=True), date_field="expiry_date"
+        ).select_related("project", "authority")
+
+        return [
+            Section("Material Tests", [
+                Column("Project", "project.project_name", width=0.25),
+                Column("Material Type", "material_type", width=0.15),
+                Column("Test Date", "test_date", align="right", width=0.15),
+                Column("Result", "result", width=0.10),
+                Column("Consultant", "consultant", width=0.35),
+            ], material_tests),
+            Section("Work Approvals", [
+                Column("Project", "activity.project.project_name", width=0.2),
+                Column("Activity", "activity.name", width=0.25),
+                Column("Approved By", lambda a: (a.approved_by.get_full_name() or a.approved_by.username)
+                       if a.approved_by else None, width=0.2),
+                Column("Approval Date", "approval_date", align="right", width=0.15),
+                Column("Remarks", "remarks", width=0.2),
+            ], work_approvals),
+            Section("Compliance", [
+                Column("Project", "project.project_name", width=0.25),
+                Column("Authority", "authority.name", width=0.25),
+                Column("Registration No", "registration_no", width=0.15),
+                Column("Status", "status", width=0.15),
+                Column("Expiry Date", "expiry_date", align="right", width=0.20),
+            ], compliances),
+        ]
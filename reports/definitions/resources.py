@@ -0,0 +1,38 @@
+from resources.models import Equipment, Manpower
+
+from . import register
+from .base import Column, ReportDefinition, Section
+
+
+@register
+class ResourcesReport(ReportDefinition):
+    key = "resources"
+    title = "RESOURCES REPORT"
+    permission = "reports.view_resourcesreport"
+    list_url = "reports:resources_report"
+    filename = "resources_report"
+
+    def build(self, params):
+        equipment = params.scope(
+            Equipment.objects.filter(is_active=True), date_field="delivery_date"
+        ).select_related("project").order_by("project", "name")
+        manpower = params.scope(
+            Manpower.objects.filter(is_active=True), date_field="start_date"
+        ).select_related("project").order_by("project", "role")
+
+        return [
+            Section("Equipment", [
+                Column("Project", "project.project_name", width=0.2),
+                Column("Name", "name", width=0.25),
+                Column("Category", "category", width=0.15),
+                Column("Quantity", "quantity", align="center", width=0.1),
+                Column("Condition", lambda e: e.condition.capitalize(), align="center", width=0.15),
+                Column("Delivery Date", "delivery_date", width=0.15),
+            ], equipment),
+            Section("Manpower", [
+                Column("Project", "project.project_name", width=0.3),
+                Column("Role", "role", width=0.4),
+                Column("Count", "count", align="center", width=0.1),
+                Column("Start Date", "start_date", width=0.2),
+            ], manpower),
+        ]
@@ -33,10 +33,9 @@ class ProgressReportCoverForm(forms.ModelForm):
         # Restrict projects to assigned projects
         if "project" in self.fields and user:
             if user.is_superuser or user.is_staff:
-                self.fields["project"].queryset = Project.objects.filter(is_active=True)
+                self.fields["project"].queryset = Project.active.all()
             else:
-                self.fields["project"].queryset = Project.objects.filter(
-                    is_active=True,
+                self.fields["project"].queryset = Project.active.filter(
                     participants__user=user,
                     participants__is_active=True,
                 ).distinct()
@@ -0,0 +1,220 @@
+"""
+Per-phase instrumentation of report generation.
+
+A ReportRecorder wraps one report download and stores a ReportRun row with,
+for each phase, the wall time, number of SQL queries and time spent in them,
+plus the peak traced memory, output size and row/image counts.
+
+Phases are marked with `phase(name)` wherever the work happens (views,
+definitions, renderers); outside a recorder it does nothing. Phases used:
+
+- import:    loading the format library, on the first download per process;
+- queries:   building the blocks and loading their rows;
+- images:    opening and reading site images (pdf);
+- layout:    drawing blocks into the document (sheets, tables, ReportLab
+             doc.build, which also writes the pdf bytes);
+- serialize: writing the finished workbook/document/csv to bytes.
+
+Time spent in a nested phase is not counted in the enclosing one.
+
+Successful runs are also observed in the report_render_duration_seconds
+Prometheus histogram (common.metrics).
+
+Settings:
+- REPORT_RUNS_ENABLED (default True): record ReportRun rows at all;
+- REPORT_RUNS_TRACE_MEMORY (default False): measure peak memory with
+  tracemalloc, which slows rendering down noticeably; turn it on while
+  investigating memory use.
+
+tracemalloc is process-global. Tracing starts with the first traced download
+and stops when the last one ends (a reference count under a lock), and the
+peak is only reset when no other download is being traced, so the peak of
+overlapping downloads in one process covers all of them.
+"""
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+from common.metrics import REPORT_RENDER
+from reports.definitions.base import Images, Section
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+# Downloads currently traced in this process, and whether tracing was started by them
+_tracing_lock = threading.Lock()
+_tracing = {"users": 0, "started": False}
+
+
+def _start_tracing():
+    with _tracing_lock:
+        if not _tracing["users"]:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                _tracing["started"] = True
+        _tracing["users"] += 1
+
+
+def _stop_tracing():
+    """Peak traced memory in KB since tracing (re)started; stops tracing after the last user."""
+    with _tracing_lock:
+        peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        _tracing["users"] -= 1
+        if not _tracing["users"] and _tracing["started"]:
+            tracemalloc.stop()
+            _tracing["started"] = False
+    return peak_kb
+
+
+def current_recorder():
+    return getattr(_state, "recorder", None)
+
+
+@contextmanager
+def phase(name):
+    """Attribute the enclosed work to `name` in the active recorder, if any."""
+    recorder = current_recorder()
+    if recorder is None:
+        yield
+        return
+    recorder.enter_phase(name)
+    try:
+        yield
+    finally:
+        recorder.exit_phase()
+
+
+class ReportRecorder:
+    """
+    Context manager measuring one report generation.
+
+        with ReportRecorder("progress", "pdf", request.user, project_id) as recorder:
+            with phase("queries"):
+                blocks = ...
+                recorder.count_blocks(blocks)
+            with phase("layout"):
+                content = renderer.render(blocks, name)
+            recorder.output_bytes = len(content)
+
+    A ReportRun is saved on exit, also when the block raised (succeeded=False).
+    Failing to save it is logged and never breaks the download.
+    """
+
+    def __init__(self, report, fmt, user=None, project_id=None):
+        self.report = report
+        self.fmt = fmt
+        self.user = user if user is not None and user.is_authenticated else None
+        self.project_id = int(project_id) if str(project_id or "").isdigit() else None
+        self.enabled = getattr(settings, "REPORT_RUNS_ENABLED", True)
+        self.trace_memory = self.enabled and getattr(settings, "REPORT_RUNS_TRACE_MEMORY", False)
+
+        self.phases = {}
+        self.row_count = 0
+        self.image_count = 0
+        self.output_bytes = 0
+        self._stack = []
+        self._wrapper = None
+
+    # ---------- Context ----------
+    def __enter__(self):
+        self._started = time.perf_counter()
+        if not self.enabled:
+            return self
+        if self.trace_memory:
+            _start_tracing()
+        self._wrapper = connection.execute_wrapper(self._execute)
+        self._wrapper.__enter__()
+        _state.recorder = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        total_ms = (time.perf_counter() - self._started) * 1000
+        if exc is None:
+            REPORT_RENDER.observe(total_ms / 1000, report=self.report, format=self.fmt)
+        if not self.enabled:
+            return False
+        while self._stack:
+            self.exit_phase()
+        _state.recorder = None
+        self._wrapper.__exit__(None, None, None)
+
+        peak_kb = None
+        if self.trace_memory:
+            peak_kb = _stop_tracing()
+
+        self._save(total_ms, peak_kb, exc)
+        return False
+
+    # ---------- Phases ----------
+    def enter_phase(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            self._stop_clock(self._stack[-1], now)
+        self._stack.append([name, now])
+
+    def exit_phase(self):
+        now = time.perf_counter()
+        self._stop_clock(self._stack.pop(), now)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def _stop_clock(self, frame, now):
+        self._phase(frame[0])["ms"] += (now - frame[1]) * 1000
+
+    def _phase(self, name):
+        return self.phases.setdefault(name, {"ms": 0.0, "sql_count": 0, "sql_ms": 0.0})
+
+    def _execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats = self._phase(self._stack[-1][0] if self._stack else "other")
+            stats["sql_count"] += 1
+            stats["sql_ms"] += (time.perf_counter() - start) * 1000
+
+    # ---------- Counters ----------
+    def count_blocks(self, blocks):
+        """Load the rows of every table now (inside the current phase) and count rows and images."""
+        for block in blocks:
+            if isinstance(block, Section):
+                block.rows = list(block.rows)
+                self.row_count += len(block.rows)
+            elif isinstance(block, Images):
+                self.image_count += len(block.images)
+
+    # ---------- Storage ----------
+    def _save(self, total_ms, peak_kb, exc):
+        from reports.models import ReportRun
+
+        phases = {
+            name: {key: round(value, 2) for key, value in stats.items()}
+            for name, stats in self.phases.items()
+        }
+        try:
+            ReportRun.objects.create(
+                report=self.report,
+                format=self.fmt,
+                project_id=self.project_id,
+                user=self.user,
+                succeeded=exc is None,
+                error=str(exc)[:255] if exc is not None else "",
+                total_ms=round(total_ms, 2),
+                sql_count=sum(stats["sql_count"] for stats in self.phases.values()),
+                sql_ms=round(sum(stats["sql_ms"] for stats in self.phases.values()), 2),
+                peak_memory_kb=peak_kb,
+                output_bytes=self.output_bytes,
+                row_count=self.row_count,
+                image_count=self.image_count,
+                phases=phases,
+            )
+        except Exception:
+            logger.exception("Could not record report run for %s (%s)", self.report, self.fmt)
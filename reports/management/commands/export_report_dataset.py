@@ -0,0 +1,40 @@
+import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import Project
+from reports.datasets import dataset_filename, export_dataset, manifest_path
+
+
+class Command(BaseCommand):
+    help = "Export a project's reporting data up to a period end into a standalone SQLite file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("project", type=int, help="Project id")
+        parser.add_argument("--from", dest="period_from", type=datetime.date.fromisoformat, required=True,
+                            help="Period start (YYYY-MM-DD)")
+        parser.add_argument("--to", dest="period_to", type=datetime.date.fromisoformat, required=True,
+                            help="Period end (YYYY-MM-DD)")
+        parser.add_argument("--output", help="Dataset file (default: <project code>_<period end>.sqlite3)")
+        parser.add_argument("--copy-media", action="store_true", help="Copy referenced media next to the dataset")
+
+    def handle(self, *args, **options):
+        project = Project.objects.filter(pk=options["project"]).first()
+        if project is None:
+            raise CommandError(f"Project {options['project']} not found")
+        if options["period_from"] > options["period_to"]:
+            raise CommandError("--from must not be after --to")
+
+        path = Path(options["output"] or dataset_filename(project, options["period_to"]))
+        try:
+            manifest = export_dataset(
+                project, options["period_from"], options["period_to"], path, copy_media=options["copy_media"],
+            )
+        except FileExistsError:
+            raise CommandError(f"{path} already exists")
+
+        missing = sum(1 for entry in manifest["media"] if not entry["present"])
+        self.stdout.write(f"{sum(manifest['rows'].values())} rows in {len(manifest['rows'])} tables, "
+                          f"{len(manifest['media'])} media files ({missing} missing)")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path} and {manifest_path(path)}"))
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.datasets import render_dataset_report
+from reports.definitions import ReportError
+
+
+class Command(BaseCommand):
+    help = "Render a report from an exported dataset file instead of the live database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", help="Dataset file written by export_report_dataset")
+        parser.add_argument("report", help="Report key, e.g. progress or finance")
+        parser.add_argument("format", help="pdf, docx, xlsx or csv")
+        parser.add_argument("--output", help="Output file (default: <dataset>_<report>.<format>)")
+        parser.add_argument("--from", dest="from_date", help="Override the dataset period start")
+        parser.add_argument("--to", dest="to_date", help="Override the dataset period end")
+        parser.add_argument("--media-root", help="Media directory (default: the copied <dataset>_media, else MEDIA_ROOT)")
+
+    def handle(self, *args, **options):
+        dataset = Path(options["dataset"])
+        try:
+            content, renderer = render_dataset_report(
+                dataset, options["report"], options["format"],
+                from_date=options["from_date"], to_date=options["to_date"],
+                media_root=options["media_root"],
+            )
+        except FileNotFoundError:
+            raise CommandError(f"{dataset} not found")
+        except (LookupError, ValueError, ReportError) as e:
+            raise CommandError(str(e))
+
+        output = Path(options["output"] or dataset.with_name(f"{dataset.stem}_{options['report']}.{renderer.extension}"))
+        output.write_bytes(content)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output} ({len(content)} bytes)"))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_projectparticipant_options_and_more'),
+        ('reports', '0010_progressreportcover'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report', models.CharField(max_length=50)),
+                ('format', models.CharField(max_length=10)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('succeeded', models.BooleanField(default=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('total_ms', models.FloatField()),
+                ('sql_count', models.PositiveIntegerField(default=0)),
+                ('sql_ms', models.FloatField(default=0)),
+                ('peak_memory_kb', models.PositiveIntegerField(blank=True, null=True)),
+                ('output_bytes', models.PositiveIntegerField(default=0)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('image_count', models.PositiveIntegerField(default=0)),
+                ('phases', models.JSONField(blank=True, default=dict)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='projects.project')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['report', 'started_at'], name='reportrun_report_started_idx')],
+            },
+        ),
+    ]
@@ -119,3 +119,41 @@ class QualityReport(models.Model):
 
     def __str__(self):
         return "Quality Report"
+
+
+# ---------------------------
+# REPORT RUNS (instrumentation)
+# ---------------------------
+class ReportRun(models.Model):
+    """
+    One report download with its timings, recorded by reports.instrumentation.
+
+    `phases` maps a phase name (import, queries, images, layout, serialize) to
+    {"ms": ..., "sql_count": ..., "sql_ms": ...}.
+    """
+    report = models.CharField(max_length=50)
+    format = models.CharField(max_length=10)
+    project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, blank=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+
+    succeeded = models.BooleanField(default=True)
+    error = models.CharField(max_length=255, blank=True)
+
+    total_ms = models.FloatField()
+    sql_count = models.PositiveIntegerField(default=0)
+    sql_ms = models.FloatField(default=0)
+    peak_memory_kb = models.PositiveIntegerField(null=True, blank=True)
+    output_bytes = models.PositiveIntegerField(default=0)
+    row_count = models.PositiveIntegerField(default=0)
+    image_count = models.PositiveIntegerField(default=0)
+    phases = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["report", "started_at"], name="reportrun_report_started_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.report} ({self.format}) {self.total_ms:.0f} ms"
@@ -0,0 +1,34 @@
+"""
+Lazily loaded export renderers.
+
+reportlab, openpyxl and python-docx are slow to import and heavy in memory,
+so nothing imports them at module load. Views ask for a backend with
+get_renderer("pdf") and only then is its module (and library) imported, once
+per process.
+
+Every backend module exposes `content_type`, `extension` and
+`render(blocks, name) -> bytes`, drawing the blocks produced by a report
+definition (see reports.definitions).
+"""
+from importlib import import_module
+
+RENDERERS = {
+    "csv": "reports.renderers.csv",
+    "xlsx": "reports.renderers.xlsx",
+    "pdf": "reports.renderers.pdf",
+    "docx": "reports.renderers.docx",
+}
+
+_loaded = {}
+
+
+def get_renderer(fmt):
+    """Return the backend module for an export format, importing it on first use."""
+    module = _loaded.get(fmt)
+    if module is None:
+        try:
+            path = RENDERERS[fmt]
+        except KeyError:
+            raise ValueError(f"Unknown report format: {fmt}")
+        module = _loaded[fmt] = import_module(path)
+    return module
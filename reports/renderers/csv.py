@@ -0,0 +1,31 @@
+"""CSV backend (standard library)."""
+import csv
+from io import StringIO
+
+from reports.definitions.base import Details, Heading, Section, Text
+from reports.instrumentation import phase
+
+content_type = "text/csv"
+extension = "csv"
+
+
+def render(blocks, name):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    for block in blocks:
+        if isinstance(block, Heading):
+            writer.writerow([block.text])
+        elif isinstance(block, Text):
+            writer.writerow([block.text])
+        elif isinstance(block, Details):
+            writer.writerows([label, value] for label, value in block.pairs)
+            writer.writerow([])
+        elif isinstance(block, Section):
+            writer.writerow([block.title.upper()])
+            writer.writerow([column.label for column in block.columns])
+            writer.writerows(block.raw_rows())
+            writer.writerow([])
+
+    with phase("serialize"):
+        return buffer.getvalue().encode("utf-8")
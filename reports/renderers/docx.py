@@ -0,0 +1,136 @@
+"""Word backend (python-docx) and shared table/paragraph helpers."""
+from io import BytesIO
+
+from docx import Document
+from docx.enum.table import WD_CELL_VERTICAL_ALIGNMENT, WD_TABLE_ALIGNMENT
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import OxmlElement, ns
+from docx.shared import Inches, Pt
+
+from reports.definitions.base import Details, Heading, Section, Text
+from reports.instrumentation import phase
+
+__all__ = [
+    "Document", "Inches", "OxmlElement", "Pt",
+    "WD_ALIGN_PARAGRAPH", "WD_CELL_VERTICAL_ALIGNMENT",
+    "WD_PARAGRAPH_ALIGNMENT", "WD_TABLE_ALIGNMENT", "ns",
+    "normalize_cell", "remove_paragraph_spacing",
+    "set_fixed_table_layout", "style_header_cell", "render",
+]
+
+content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+extension = "docx"
+
+ALIGNMENTS = {"center": WD_ALIGN_PARAGRAPH.CENTER, "right": WD_ALIGN_PARAGRAPH.RIGHT}
+
+
+def remove_paragraph_spacing(paragraph):
+    """Remove spacing before and after paragraph."""
+    p = paragraph._p
+    pPr = p.get_or_add_pPr()
+
+    spacing = OxmlElement("w:spacing")
+    spacing.set(ns.qn("w:before"), "0")
+    spacing.set(ns.qn("w:after"), "0")
+    spacing.set(ns.qn("w:line"), "240")
+    spacing.set(ns.qn("w:lineRule"), "auto")
+
+    pPr.append(spacing)
+
+
+def normalize_cell(cell, bold=False):
+    """Set cell text formatting and remove spacing."""
+    p = cell.paragraphs[0]
+    p.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    if p.runs:
+        p.runs[0].bold = bold
+    remove_paragraph_spacing(p)
+
+
+def style_header_cell(cell):
+    """Style table header cell (center + bold)."""
+    p = cell.paragraphs[0]
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = p.runs[0]
+    run.bold = True
+    run.font.size = Pt(10)
+
+
+def set_fixed_table_layout(table):
+    """Fix column widths for Table Grid."""
+    for row in table.rows:
+        for cell in row.cells:
+            cell.width = cell.width
+
+
+def render(blocks, name):
+    doc = Document()
+
+    # A4 with narrow margins
+    section = doc.sections[0]
+    section.page_height = Inches(11.69)
+    section.page_width = Inches(8.27)
+    for side in ("top_margin", "bottom_margin", "left_margin", "right_margin"):
+        setattr(section, side, Inches(0.5))
+
+    for block in blocks:
+        if isinstance(block, Heading):
+            heading = doc.add_heading(block.text, level=block.level)
+            if block.level == 1:
+                heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            elif heading.runs:
+                heading.runs[0].bold = True
+            remove_paragraph_spacing(heading)
+
+        elif isinstance(block, Text):
+            remove_paragraph_spacing(doc.add_paragraph(block.text))
+
+        elif isinstance(block, Details):
+            table = doc.add_table(rows=0, cols=2)
+            table.style = "Table Grid"
+            table.alignment = WD_TABLE_ALIGNMENT.CENTER
+            table.autofit = False
+            table.columns[0].width = Inches(2.5)
+            table.columns[1].width = Inches(4.77)
+            for label, value in block.pairs:
+                row = table.add_row().cells
+                row[0].text = str(label)
+                row[1].text = str(value)
+                normalize_cell(row[0], bold=True)
+                normalize_cell(row[1])
+            remove_paragraph_spacing(doc.paragraphs[-1])
+
+        elif isinstance(block, Section):
+            heading = doc.add_heading(block.title, level=2)
+            heading.runs[0].bold = True
+            remove_paragraph_spacing(heading)
+
+            table = doc.add_table(rows=1, cols=len(block.columns))
+            table.style = "Table Grid"
+            table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+            for i, column in enumerate(block.columns):
+                table.rows[0].cells[i].text = column.label
+                style_header_cell(table.rows[0].cells[i])
+
+            has_rows = False
+            for values in block.text_rows():
+                has_rows = True
+                row = table.add_row().cells
+                for i, (column, text) in enumerate(zip(block.columns, values)):
+                    row[i].text = text
+                    if column.align in ALIGNMENTS:
+                        row[i].paragraphs[0].alignment = ALIGNMENTS[column.align]
+
+            if not has_rows and block.empty_text:
+                row = table.add_row().cells
+                row[0].text = block.empty_text
+                for cell in row[1:]:
+                    cell.text = "-"
+
+            remove_paragraph_spacing(doc.paragraphs[-1])
+
+    buffer = BytesIO()
+    with phase("serialize"):
+        doc.save(buffer)
+    return buffer.getvalue()
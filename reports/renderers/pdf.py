@@ -0,0 +1,148 @@
+"""PDF backend (reportlab)."""
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from reportlab.platypus import (
+    Image,
+    PageBreak,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
+
+from reports.definitions.base import Details, Heading, Images, Section, Text
+from reports.instrumentation import phase
+
+__all__ = [
+    "A4", "Image", "PageBreak", "Paragraph", "ParagraphStyle",
+    "SimpleDocTemplate", "Spacer", "Table", "TableStyle",
+    "canvas", "cm", "colors", "getSampleStyleSheet", "render",
+]
+
+content_type = "application/pdf"
+extension = "pdf"
+
+ALIGNMENTS = {"left": "LEFT", "center": "CENTER", "right": "RIGHT"}
+
+
+def _styles():
+    styles = getSampleStyleSheet()
+    return {
+        1: ParagraphStyle("Title", parent=styles["Heading1"], alignment=1, spaceAfter=12),
+        2: ParagraphStyle(
+            "Section", parent=styles["Heading2"], textColor=colors.HexColor("#0F5391"),
+            spaceBefore=10, spaceAfter=5
+        ),
+        3: ParagraphStyle("SubSection", parent=styles["Heading3"], spaceBefore=8, spaceAfter=4),
+        "cell": ParagraphStyle("Cell", parent=styles["Normal"], fontSize=9, leading=12),
+        "caption": ParagraphStyle("ImgCaption", parent=styles["Normal"], fontSize=8, leading=10, alignment=1),
+    }
+
+
+def _section_table(block, width, cell_style):
+    rows = [[column.label for column in block.columns]]
+    rows += [
+        [Paragraph(escape(text), cell_style) for text in values]
+        for values in block.text_rows()
+    ]
+    if len(rows) == 1 and block.empty_text:
+        rows.append(
+            [Paragraph(escape(block.empty_text), cell_style)] + ["-"] * (len(block.columns) - 1)
+        )
+
+    if all(column.width for column in block.columns):
+        col_widths = [width * column.width for column in block.columns]
+    else:
+        col_widths = [width / len(block.columns)] * len(block.columns)
+
+    commands = [
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ]
+    for index, column in enumerate(block.columns):
+        if column.align != "left":
+            commands.append(("ALIGN", (index, 1), (index, -1), ALIGNMENTS[column.align]))
+
+    table = Table(rows, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle(commands))
+    return table
+
+
+def _image_rows(block, width, caption_style):
+    """Thumbnails three per row; unreadable images are skipped."""
+    img_width = (width - 40) / 3
+    img_height = img_width * 0.75
+    row_imgs = []
+    for path, caption in block.images:
+        try:
+            with phase("images"):
+                im = Image(path, width=img_width, height=img_height, kind="proportional")
+        except Exception:
+            continue
+        row_imgs.append([im, Spacer(1, 2), Paragraph(escape(caption), caption_style)])
+        if len(row_imgs) == 3:
+            yield row_imgs
+            row_imgs = []
+    if row_imgs:
+        yield row_imgs
+
+
+def render(blocks, name):
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=36,
+        rightMargin=36,
+        topMargin=36,
+        bottomMargin=36
+    )
+    styles = _styles()
+    elements = []
+
+    for block in blocks:
+        if isinstance(block, Heading):
+            elements.append(Paragraph(escape(block.text), styles[min(block.level, 3)]))
+
+        elif isinstance(block, Text):
+            elements.append(Paragraph(escape(block.text), styles["cell"]))
+
+        elif isinstance(block, Details):
+            table = Table(
+                [[Paragraph(escape(str(label)), styles["cell"]), Paragraph(escape(str(value)), styles["cell"])]
+                 for label, value in block.pairs],
+                colWidths=[200, doc.width - 200]
+            )
+            table.setStyle(TableStyle([
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]))
+            elements += [table, Spacer(1, 16)]
+
+        elif isinstance(block, Section):
+            elements.append(Paragraph(escape(block.title), styles[2]))
+            elements += [_section_table(block, doc.width, styles["cell"]), Spacer(1, 12)]
+
+        elif isinstance(block, Images):
+            elements += [PageBreak(), Paragraph(escape(block.title), styles[2])]
+            img_width = (doc.width - 40) / 3
+            for row_imgs in _image_rows(block, doc.width, styles["caption"]):
+                t = Table([row_imgs], colWidths=[img_width] * len(row_imgs))
+                t.setStyle(TableStyle([
+                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ]))
+                elements.append(t)
+
+    doc.build(elements)
+    return buffer.getvalue()
@@ -0,0 +1,71 @@
+"""Excel backend (openpyxl)."""
+from decimal import Decimal
+from io import BytesIO
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font
+from openpyxl.utils import get_column_letter
+
+from reports.definitions.base import Details, Heading, Section, Text
+from reports.instrumentation import phase
+
+__all__ = ["Alignment", "Font", "Workbook", "get_column_letter", "render"]
+
+content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+extension = "xlsx"
+
+
+def _cell_value(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def render(blocks, name):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = name[:31]
+    bold_font = Font(bold=True)
+    center_align = Alignment(horizontal="center")
+    widths = {}
+
+    def next_row():
+        # ws.max_row is 1 on an empty sheet
+        return 1 if ws.max_row == 1 and ws.cell(row=1, column=1).value is None else ws.max_row + 1
+
+    for block in blocks:
+        if isinstance(block, (Heading, Text)):
+            row = next_row()
+            ws.cell(row=row, column=1, value=block.text).font = (
+                Font(bold=True, size=14) if isinstance(block, Heading) else Font()
+            )
+
+        elif isinstance(block, Details):
+            for label, value in block.pairs:
+                row = next_row()
+                ws.cell(row=row, column=1, value=label).font = bold_font
+                ws.cell(row=row, column=2, value=_cell_value(value))
+
+        elif isinstance(block, Section):
+            row = next_row()
+            ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=max(len(block.columns), 1))
+            ws.cell(row=row, column=1, value=block.title).font = Font(bold=True, size=14)
+            row += 1
+
+            for col_num, column in enumerate(block.columns, 1):
+                cell = ws.cell(row=row, column=col_num, value=column.label)
+                cell.font = bold_font
+                cell.alignment = center_align
+                widths[col_num] = max(widths.get(col_num, 0), len(column.label) + 5, 15)
+
+            for values in block.raw_rows():
+                ws.append([_cell_value(value) for value in values])
+
+            # Two blank rows between sections
+            ws.cell(row=ws.max_row + 2, column=1, value=None)
+
+    for col_num, width in widths.items():
+        ws.column_dimensions[get_column_letter(col_num)].width = width
+
+    buffer = BytesIO()
+    with phase("serialize"):
+        wb.save(buffer)
+    return buffer.getvalue()
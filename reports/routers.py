@@ -0,0 +1,18 @@
+"""
+Database routing for report datasets (see reports.datasets).
+
+While a dataset is active in the current context, every query goes to its
+SQLite alias instead of the default database, so report definitions and
+renderers run unchanged against an exported file.
+"""
+from contextvars import ContextVar
+
+active_dataset = ContextVar("active_dataset", default=None)
+
+
+class DatasetRouter:
+    def db_for_read(self, model, **hints):
+        return active_dataset.get()
+
+    def db_for_write(self, model, **hints):
+        return active_dataset.get()
@@ -1,3 +1,161 @@
-from django.test import TestCase
+import base64
+import re
+import tempfile
+import zlib
+from datetime import date
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.urls import reverse
+from docx import Document
+from openpyxl import load_workbook
+
+from common.testing import TestCase, create_project
+from finance.models import EarnedValuePeriod, PaymentCertificate
+from projects.models import ProjectStats
+from quality.models import MaterialTest
+from resources.models import Equipment
+from sitemanage.models import Activity, ProgressLog
+
+from .datasets import export_dataset, open_dataset, render_dataset_report, using_dataset
+from .urls import urlpatterns
+
+
+class DatasetTests(TestCase):
+    """A dataset holds the project as it stood at the end of the period."""
+    nplusone_threshold = 30  # every activity save validates its foreign keys
+
+    def setUp(self):
+        super().setUp()
+        self.project = create_project("P-001")
+        self.user = User.objects.create_user("engineer")
+        self.blockwork = self.activity("Blockwork")
+        self.roofing = self.activity("Roofing")  # created today, no log by the period end
+        self.log = self.progress(self.blockwork, date(2025, 3, 10), 40, "Ground floor walls")
+        self.progress(self.blockwork, date(2025, 4, 10), 80, "First floor walls")
+        self.progress(self.roofing, date(2025, 4, 12), 10, "Trusses delivered")
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "P-001.sqlite3"
+        # The file is opened under an alias of its own
+        patcher = mock.patch.object(type(self), "databases", {*self.databases, open_dataset(self.path)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        export_dataset(self.project, date(2025, 3, 1), date(2025, 3, 31), self.path)
+
+    def activity(self, name):
+        return Activity.objects.create(
+            project=self.project, name=name, planned_start=date(2025, 3, 1), planned_end=date(2025, 4, 30),
+            created_by=self.user, updated_by=self.user,
+        )
+
+    def progress(self, activity, day, percent, remarks):
+        return ProgressLog.objects.create(activity=activity, date=day, progress_percent=percent, remarks=remarks)
+
+    def test_derived_values_as_of_the_period_end(self):
+        with using_dataset(self.path):
+            activities = list(Activity.objects.all())
+            self.assertEqual([activity.pk for activity in activities], [self.blockwork.pk])
+            blockwork = activities[0]
+            self.assertEqual((blockwork.progress_percent, blockwork.latest_log_id), (40, self.log.pk))
+            self.assertEqual(blockwork.latest_remarks, "Ground floor walls")
+            self.assertEqual(blockwork.rollup_percent, 40)
+
+            stats = ProjectStats.objects.get(pk=self.project.pk)
+            self.assertEqual((stats.activities_total, stats.progress_sum), (1, 40))
+            self.assertEqual(stats.last_progress_date, date(2025, 3, 10))
+            self.assertEqual(
+                list(EarnedValuePeriod.objects.values_list("period", "earned_value")),
+                [(date(2025, 3, 1), self.project.contract_sum * 40 / 100)],
+            )
+
+    def test_report_from_a_dataset(self):
+        content, renderer = render_dataset_report(self.path, "progress", "csv")
+        self.assertEqual(renderer.content_type, "text/csv")
+        text = content.decode("utf-8-sig")
+        self.assertIn("Ground floor walls", text)
+        self.assertNotIn("First floor walls", text)
+        self.assertNotIn("Roofing", text)
+        # Scheduled from the period end: 60% of 61 days left
+        self.assertIn("1,Blockwork,2025-03-10,2025-05-06,0,40", text)
+
+
+def pdf_text(content):
+    """The page streams of a reportlab PDF, decoded."""
+    streams = re.findall(rb"/ASCII85Decode /FlateDecode \].*?stream\r?\n(.*?)endstream", content, re.S)
+    return b"".join(zlib.decompress(base64.a85decode(stream.strip(), adobe=True)) for stream in streams).decode("latin-1")
+
+
+def docx_text(content):
+    document = Document(BytesIO(content))
+    cells = [cell.text for table in document.tables for row in table.rows for cell in row.cells]
+    return "\n".join([paragraph.text for paragraph in document.paragraphs] + cells)
+
+
+def xlsx_text(content):
+    workbook = load_workbook(BytesIO(content))
+    return "\n".join(
+        ",".join("" if value is None else str(value) for value in row)
+        for sheet in workbook for row in sheet.iter_rows(values_only=True)
+    )
+
+
+FORMATS = {
+    "csv": ("text/csv", lambda content: content.decode("utf-8-sig")),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", xlsx_text),
+    "pdf": ("application/pdf", pdf_text),
+    "docx": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", docx_text),
+}
+
+
+class ReportDownloadTests(TestCase):
+    """Every download URL renders its report for a seeded project."""
+    nplusone_threshold = 30  # every activity save validates its foreign keys
+
+    # A value each report shows in every format
+    KNOWN = {
+        "project": "P-001",
+        "progress": "Blockwork",
+        "resources": "Concrete mixer",
+        "finance": "IPC-01",
+        "quality": "Site Lab Ltd",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.project = create_project("P-001")
+        self.user = User.objects.create_superuser("admin")
+        activity = Activity.objects.create(
+            project=self.project, name="Blockwork", planned_start=date(2025, 3, 1), planned_end=date(2025, 4, 30),
+            created_by=self.user, updated_by=self.user,
+        )
+        ProgressLog.objects.create(activity=activity, date=date(2025, 3, 10), progress_percent=40)
+        Equipment.objects.create(
+            project=self.project, name="Concrete mixer", category="Plant", quantity=2,
+            condition="good", delivery_date=date(2025, 2, 1),
+        )
+        PaymentCertificate.objects.create(
+            project=self.project, certificate_no="IPC-01", certified_amount=250_000, date_certified=date(2025, 3, 20),
+            amount_paid=250_000, amount_from="Client", amount_to="Contractor", payment_date=date(2025, 3, 31),
+            pv_no="PV-1",
+        )
+        MaterialTest.objects.create(
+            project=self.project, material_type="Concrete", test_date=date(2025, 3, 15), result="Pass",
+            consultant="Site Lab Ltd", report_file="quality/tests/cubes.pdf",
+        )
+        self.client.force_login(self.user)
+
+    def test_every_download(self):
+        downloads = [pattern for pattern in urlpatterns if "_download_" in (pattern.name or "")]
+        self.assertEqual(len(downloads), 15)
+        for pattern in downloads:
+            report, fmt = pattern.default_args["report"], pattern.default_args["fmt"]
+            content_type, text = FORMATS[fmt]
+            with self.subTest(pattern.name):
+                response = self.client.get(reverse(f"reports:{pattern.name}"), {"project": self.project.pk})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["Content-Type"], content_type)
+                self.assertIn(self.KNOWN[report], text(response.content))
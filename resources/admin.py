@@ -1,10 +1,13 @@
 from django.contrib import admin
+
+from common.admin import ActiveListFilter, restore_selected, soft_delete_selected
 from .models import Equipment, Manpower
 
 @admin.register(Equipment)
 class EquipmentAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = ("name", "project_name", "category", "quantity", "condition", "is_active")
-    list_filter = ("condition", "category", "is_active")
+    list_filter = ("condition", "category", ActiveListFilter)
     search_fields = ("name", "project__project_name")
 
     def project_name(self, obj):
@@ -14,8 +17,9 @@ class EquipmentAdmin(admin.ModelAdmin):
 
 @admin.register(Manpower)
 class ManpowerAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = ("role", "count", "project_name", "start_date", "is_active")
-    list_filter = ("start_date", "is_active")
+    list_filter = ("start_date", ActiveListFilter)
     search_fields = ("role", "project__project_name")
 
     def project_name(self, obj):
@@ -36,7 +36,7 @@ class BaseResourceForm(forms.ModelForm):
 
         # Filter project field if it exists
         if "project" in self.fields:
-            self.fields["project"].queryset = Project.objects.filter(is_active=True)
+            self.fields["project"].queryset = Project.active.all()
 
 
 # ---------------- Equipment Form ----------------
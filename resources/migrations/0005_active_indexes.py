@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_archived_at'),
+        ('resources', '0004_alter_equipment_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['project', 'is_active', 'delivery_date'], name='equipment_proj_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manpower',
+            index=models.Index(fields=['project', 'is_active', 'start_date'], name='manpower_proj_active_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from projects.models import Project
 from django.contrib.auth.models import User
+from common.managers import ActiveManager, SoftDeleteManager
 
 class Equipment(models.Model):
     CONDITION_CHOICES = (
@@ -20,8 +21,14 @@ class Equipment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["project", "is_active", "delivery_date"], name="equipment_proj_active_idx"),
+        ]
         permissions = [
             # ("access_resources", "Can access resources"),
         ]
@@ -45,8 +52,14 @@ class Manpower(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["-start_date"]
+        indexes = [
+            models.Index(fields=["project", "is_active", "start_date"], name="manpower_proj_active_idx"),
+        ]
 
     def __str__(self):
         if self.project:
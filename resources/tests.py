@@ -1,3 +1,3 @@
-from django.test import TestCase
+from common.testing import TestCase
 
 # Create your tests here.
@@ -12,9 +12,8 @@ from .forms import EquipmentForm, ManpowerForm
 def get_allowed_projects(user):
     """Return active projects the user can access."""
     if user.is_superuser or user.is_staff:
-        return Project.objects.filter(is_active=True)
-    return Project.objects.filter(
-        is_active=True,
+        return Project.active.all()
+    return Project.active.filter(
         participants__user=user,
         participants__is_active=True
     ).distinct()
@@ -34,7 +33,7 @@ def equipment_list(request):
     search = request.GET.get("q", "").strip()
     page_number = request.GET.get("page")
 
-    equipment = Equipment.objects.select_related("project").filter(is_active=True)
+    equipment = Equipment.active.select_related("project")
     equipment = filter_by_allowed_projects(equipment, request.user).order_by("name")
 
     if search:
@@ -57,7 +56,7 @@ def equipment_list(request):
 @permission_required("resources.view_equipment", raise_exception=True)
 def equipment_detail(request, pk):
     equipment = get_object_or_404(
-        filter_by_allowed_projects(Equipment.objects.select_related("project").filter(is_active=True), request.user),
+        filter_by_allowed_projects(Equipment.active.select_related("project"), request.user),
         pk=pk
     )
     return render(request, "resources/equipment_detail.html", {"equipment": equipment})
@@ -90,7 +89,7 @@ def equipment_create(request):
 @permission_required("resources.change_equipment", raise_exception=True)
 def equipment_edit(request, pk):
     equipment = get_object_or_404(
-        filter_by_allowed_projects(Equipment.objects.select_related("project").filter(is_active=True), request.user),
+        filter_by_allowed_projects(Equipment.active.select_related("project"), request.user),
         pk=pk
     )
     allowed_projects = get_allowed_projects(request.user)
@@ -115,7 +114,7 @@ def equipment_edit(request, pk):
 @permission_required("resources.delete_equipment", raise_exception=True)
 def equipment_delete(request, pk):
     equipment = get_object_or_404(
-        filter_by_allowed_projects(Equipment.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(Equipment.active.all(), request.user),
         pk=pk
     )
     if request.method == "POST":
@@ -135,7 +134,7 @@ def manpower_list(request):
     search = request.GET.get("q", "").strip()
     page_number = request.GET.get("page")
 
-    manpower = Manpower.objects.select_related("project").filter(is_active=True)
+    manpower = Manpower.active.select_related("project")
     manpower = filter_by_allowed_projects(manpower, request.user).order_by("role")
 
     if search:
@@ -157,7 +156,7 @@ def manpower_list(request):
 @permission_required("resources.view_manpower", raise_exception=True)
 def manpower_detail(request, pk):
     manpower = get_object_or_404(
-        filter_by_allowed_projects(Manpower.objects.select_related("project").filter(is_active=True), request.user),
+        filter_by_allowed_projects(Manpower.active.select_related("project"), request.user),
         pk=pk
     )
     return render(request, "resources/manpower_detail.html", {"manpower": manpower})
@@ -190,7 +189,7 @@ def manpower_create(request):
 @permission_required("resources.change_manpower", raise_exception=True)
 def manpower_update(request, pk):
     manpower = get_object_or_404(
-        filter_by_allowed_projects(Manpower.objects.select_related("project").filter(is_active=True), request.user),
+        filter_by_allowed_projects(Manpower.active.select_related("project"), request.user),
         pk=pk
     )
     allowed_projects = get_allowed_projects(request.user)
@@ -215,7 +214,7 @@ def manpower_update(request, pk):
 @permission_required("resources.delete_manpower", raise_exception=True)
 def manpower_delete(request, pk):
     manpower = get_object_or_404(
-        filter_by_allowed_projects(Manpower.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(Manpower.active.all(), request.user),
         pk=pk
     )
     if request.method == "POST":
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from common.admin import ActiveListFilter, restore_selected, soft_delete_selected
 from .models import Authority, Client, ContractorType, Contractor, WorkCategory
 
 # -----------------------------
@@ -7,16 +8,16 @@ from .models import Authority, Client, ContractorType, Contractor, WorkCategory
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
     list_display = ('tin_number', 'name', 'postal_address', 'is_active')
-    list_filter = ('is_active',)
+    list_filter = (ActiveListFilter,)
     search_fields = ('name',)
     actions = ['make_active', 'make_inactive']
 
     def make_active(self, request, queryset):
-        queryset.update(is_active=True)
+        queryset.restore()
     make_active.short_description = "Mark selected clients as active"
 
     def make_inactive(self, request, queryset):
-        queryset.update(is_active=False)
+        queryset.soft_delete()
     make_inactive.short_description = "Mark selected clients as inactive"
 
 # -----------------------------
@@ -25,16 +26,16 @@ class ClientAdmin(admin.ModelAdmin):
 @admin.register(ContractorType)
 class ContractorTypeAdmin(admin.ModelAdmin):
     list_display = ('name', 'description', 'is_active')
-    list_filter = ('is_active',)
+    list_filter = (ActiveListFilter,)
     search_fields = ('name',)
     actions = ['make_active', 'make_inactive']
 
     def make_active(self, request, queryset):
-        queryset.update(is_active=True)
+        queryset.restore()
     make_active.short_description = "Mark selected contractor types as active"
 
     def make_inactive(self, request, queryset):
-        queryset.update(is_active=False)
+        queryset.soft_delete()
     make_inactive.short_description = "Mark selected contractor types as inactive"
 
 # -----------------------------
@@ -42,33 +43,35 @@ class ContractorTypeAdmin(admin.ModelAdmin):
 # -----------------------------
 @admin.register(Contractor)
 class ContractorAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = ('tin_number', 'name', 'contractor_type', 'city')
     search_fields = ('tin_number', 'name')
-    list_filter = ('contractor_type',)
+    list_filter = ('contractor_type', ActiveListFilter)
 
 
 #Work Category Admin can be added similarly when the model is defined
 @admin.register(WorkCategory)
 class WorkCategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'description', 'is_active')
-    list_filter = ('is_active',)
+    list_filter = (ActiveListFilter,)
     search_fields = ('name',)
     actions = ['make_active', 'make_inactive']
 
     def make_active(self, request, queryset):
-        queryset.update(is_active=True)
+        queryset.restore()
     make_active.short_description = "Mark selected work categories as active"
 
     def make_inactive(self, request, queryset):
-        queryset.update(is_active=False)
+        queryset.soft_delete()
     make_inactive.short_description = "Mark selected work categories as inactive"
     
 
 # ---------------- Authority Admin ----------------
 @admin.register(Authority)
 class AuthorityAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = ("name", "description", "is_active", "created_at", "updated_at")
-    list_filter = ("is_active",)
+    list_filter = (ActiveListFilter,)
     search_fields = ("name", "description")
     ordering = ("name",)
     readonly_fields = ("created_at", "updated_at")
\ No newline at end of file
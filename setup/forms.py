@@ -42,10 +42,7 @@ class UniqueActiveNameMixin:
     def clean_name(self):
         name = self.cleaned_data["name"]
 
-        qs = self._meta.model.objects.filter(
-            name__iexact=name,
-            is_active=True
-        )
+        qs = self._meta.model.active.filter(name__iexact=name)
 
         if self.instance.pk:
             qs = qs.exclude(pk=self.instance.pk)
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from common.managers import ActiveManager, SoftDeleteManager
 
 
 class Client(models.Model):
@@ -12,6 +13,9 @@ class Client(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ['name']
         permissions = [
@@ -34,6 +38,9 @@ class ContractorType(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ['name']
         permissions = [
@@ -55,6 +62,9 @@ class Contractor(models.Model):
     city = models.CharField(max_length=100)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ['name']
         permissions = [
@@ -82,6 +92,9 @@ class ProjectRole(models.Model):
     )
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["name"]
         constraints = [
@@ -111,6 +124,9 @@ class WorkCategory(models.Model):
     )
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["name"]
         constraints = [
@@ -140,6 +156,9 @@ class Authority(models.Model):
     )
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ["name"]
         constraints = [
@@ -15,7 +15,7 @@ def client_list(request):
     search = request.GET.get("q", "").strip()
     page_number = request.GET.get("page")
 
-    clients = Client.objects.filter(is_active=True).order_by("name")
+    clients = Client.active.order_by("name")
 
     if search:
         clients = clients.filter(
@@ -87,7 +87,7 @@ def contractor_type_list(request):
     search = request.GET.get("q", "").strip()
     page_number = request.GET.get("page")
 
-    types = ContractorType.objects.filter(is_active=True).order_by("name")
+    types = ContractorType.active.order_by("name")
 
     if search:
         types = types.filter(Q(name__icontains=search) | Q(description__icontains=search))
@@ -161,7 +161,7 @@ def contractor_list(request):
     search = request.GET.get("q", "").strip()
     page_number = request.GET.get("page")
 
-    contractors = Contractor.objects.filter(is_active=True).select_related("contractor_type").order_by("-tin_number")
+    contractors = Contractor.active.select_related("contractor_type").order_by("-tin_number")
 
     if search:
         contractors = contractors.filter(
@@ -251,7 +251,7 @@ def project_role_list(request):
     search = request.GET.get("q", "").strip()
     page_number = request.GET.get("page")
 
-    roles = ProjectRole.objects.filter(is_active=True).order_by("name")
+    roles = ProjectRole.active.order_by("name")
 
     if search:
         roles = roles.filter(
@@ -294,7 +294,7 @@ def project_role_create(request):
 @login_required
 @permission_required("setup.change_projectrole", raise_exception=True)
 def project_role_edit(request, pk):
-    role = get_object_or_404(ProjectRole, pk=pk, is_active=True)
+    role = get_object_or_404(ProjectRole.active, pk=pk)
 
     form = ProjectRoleForm(request.POST or None, instance=role)
 
@@ -315,7 +315,7 @@ def project_role_edit(request, pk):
 @login_required
 @permission_required("setup.delete_projectrole", raise_exception=True)
 def project_role_delete(request, pk):
-    role = get_object_or_404(ProjectRole, pk=pk, is_active=True)
+    role = get_object_or_404(ProjectRole.active, pk=pk)
 
     if request.method == "POST":
         role.is_active = False
@@ -340,7 +340,7 @@ def work_category_list(request):
     search = request.GET.get("q", "").strip()
     page_number = request.GET.get("page")
 
-    categories = WorkCategory.objects.filter(is_active=True).order_by("-id")
+    categories = WorkCategory.active.order_by("-id")
 
     if search:
         categories = categories.filter(
@@ -386,7 +386,7 @@ def work_category_create(request):
 @login_required
 @permission_required("setup.change_workcategory", raise_exception=True)
 def work_category_edit(request, pk):
-    category = get_object_or_404(WorkCategory, pk=pk, is_active=True)
+    category = get_object_or_404(WorkCategory.active, pk=pk)
 
     if request.method == "POST":
         form = WorkCategoryForm(request.POST, instance=category)
@@ -407,7 +407,7 @@ def work_category_edit(request, pk):
 @login_required
 @permission_required("setup.delete_workcategory", raise_exception=True)
 def work_category_delete(request, pk):
-    category = get_object_or_404(WorkCategory, pk=pk, is_active=True)
+    category = get_object_or_404(WorkCategory.active, pk=pk)
 
     if request.method == "POST":
         category.is_active = False
@@ -427,7 +427,7 @@ def authority_list(request):
     search = request.GET.get("q", "").strip()
     page_number = request.GET.get("page")
 
-    authorities = Authority.objects.filter(is_active=True)
+    authorities = Authority.active.all()
 
     if search:
         authorities = authorities.filter(
@@ -479,7 +479,7 @@ def authority_create(request):
 @login_required
 @permission_required("setup.change_authority", raise_exception=True)
 def authority_edit(request, pk):
-    authority = get_object_or_404(Authority, pk=pk, is_active=True)
+    authority = get_object_or_404(Authority.active, pk=pk)
 
     if request.method == "POST":
         form = AuthorityForm(request.POST, instance=authority)
@@ -504,7 +504,7 @@ def authority_edit(request, pk):
 @login_required
 @permission_required("setup.delete_authority", raise_exception=True)
 def authority_delete(request, pk):
-    authority = get_object_or_404(Authority, pk=pk, is_active=True)
+    authority = get_object_or_404(Authority.active, pk=pk)
 
     if request.method == "POST":
         authority.is_active = False
@@ -1,13 +1,27 @@
 from django.contrib import admin
+
+from common.admin import ActiveListFilter, restore_selected, soft_delete_selected
 from django.utils.html import format_html
-from .models import Activity, ProgressLog, SiteProjectImage, SiteVisitor
+from .models import Activity, ActivityDependency, ProgressLog, SiteProjectImage, SiteVisitor
 
 
 # ---------------------------
 # ACTIVITY ADMIN
 # ---------------------------
+class ActivityDependencyInline(admin.TabularInline):
+    model = ActivityDependency
+    fk_name = 'successor'
+    fields = ('predecessor', 'dependency_type', 'lag_days', 'is_active')
+    raw_id_fields = ('predecessor',)
+    extra = 0
+    verbose_name = 'predecessor'
+    verbose_name_plural = 'Predecessors'
+
+
 @admin.register(Activity)
 class ActivityAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
+    inlines = [ActivityDependencyInline]
     list_display = (
         'name',
         'project',
@@ -20,12 +34,13 @@ class ActivityAdmin(admin.ModelAdmin):
     )
 
     list_editable = ('is_active',)
+    raw_id_fields = ('parent',)
 
     list_filter = (
         'status',
         'category',
         'project',
-        'is_active',
+        ActiveListFilter,
     )
 
     search_fields = (
@@ -38,19 +53,29 @@ class ActivityAdmin(admin.ModelAdmin):
         'progress_percent',
         'actual_start',
         'actual_end',
+        'wbs_level',
+        'rollup_percent',
+        'early_start',
+        'early_finish',
+        'late_start',
+        'late_finish',
+        'total_float',
         'created_at',
         'updated_at',
     )
 
     fieldsets = (
         ('Activity Info', {
-            'fields': ('project', 'category', 'name', 'description', 'is_active')
+            'fields': ('project', 'category', 'parent', 'name', 'description', 'is_active')
         }),
         ('Planned Schedule', {
             'fields': ('planned_start', 'planned_end')
         }),
         ('System Controlled', {
-            'fields': ('progress_percent', 'status', 'actual_start', 'actual_end')
+            'fields': ('progress_percent', 'status', 'actual_start', 'actual_end', 'wbs_level', 'rollup_percent')
+        }),
+        ('Forecast Schedule', {
+            'fields': ('early_start', 'early_finish', 'late_start', 'late_finish', 'total_float')
         }),
         ('Audit', {
             'fields': ('created_at', 'updated_at', 'created_by', 'updated_by')
@@ -77,6 +102,7 @@ class ActivityAdmin(admin.ModelAdmin):
 # ---------------------------
 @admin.register(ProgressLog)
 class ProgressLogAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         'activity',
         'date',
@@ -88,6 +114,7 @@ class ProgressLogAdmin(admin.ModelAdmin):
     list_filter = (
         'activity__project',
         'date',
+        ActiveListFilter,
     )
 
     search_fields = (
@@ -106,6 +133,7 @@ class ProgressLogAdmin(admin.ModelAdmin):
 
 @admin.register(SiteVisitor)
 class SiteVisitorAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         "document_name",
         "project",
@@ -118,7 +146,7 @@ class SiteVisitorAdmin(admin.ModelAdmin):
     list_filter = (
         "project",
         "visit_date",
-        "is_active",
+        ActiveListFilter,
     )
 
     search_fields = (
@@ -164,6 +192,7 @@ class SiteVisitorAdmin(admin.ModelAdmin):
         
 @admin.register(SiteProjectImage)
 class SiteProjectImageAdmin(admin.ModelAdmin):
+    actions = [soft_delete_selected, restore_selected]
     list_display = (
         "id",
         "project_name",
@@ -174,7 +203,7 @@ class SiteProjectImageAdmin(admin.ModelAdmin):
         "created_by",
         "created_at",
     )
-    list_filter = ("project", "image_date", "is_active")
+    list_filter = ("project", "image_date", ActiveListFilter)
     search_fields = ("project__project_name", "figure_name")
     readonly_fields = ("created_by", "created_at", "image_preview")
     ordering = ("-image_date", "-created_at")
@@ -0,0 +1,83 @@
+"""
+Activity progress as it stood on a past date.
+
+progress_percent, status and latest_remarks on Activity are today's values.
+Period reports (a monthly report ending on the 31st) need them as they were
+at the end of the period:
+
+- one window-function query (index on activity, is_active, date) picks,
+  per activity, the latest active log dated on or before the date and the
+  first date with progress > 0 (sitemanage.reconcile.latest_logs);
+- Activity.apply_progress() then sets the derived fields in memory, with
+  the as-of date standing in for today, so the status rules are the same
+  as for live rows (an activity is Delayed when its planned end had passed
+  by then);
+- activities created after the date, with no log up to it, are left out.
+
+The returned objects carry past values and must never be saved.
+"""
+import datetime
+
+from projects.archive import archived_ids
+from projects.models import ProjectStats
+from projects.stats import STATUS_FIELDS
+
+from .models import Activity, ArchivedProgressLog
+from .reconcile import latest_logs
+
+
+def activities_as_of(activities, as_of):
+    """
+    Evaluate the `activities` queryset and return its rows with progress,
+    status, actual dates and latest remarks as of the end of `as_of`.
+    """
+    activities = list(activities)
+    archived = archived_ids({activity.project_id for activity in activities})
+    logs = latest_logs([a.pk for a in activities if a.project_id not in archived], as_of=as_of)
+    if archived:
+        logs.update(latest_logs(
+            [a.pk for a in activities if a.project_id in archived], as_of=as_of, model=ArchivedProgressLog,
+        ))
+
+    result = []
+    for activity in activities:
+        latest, first_started = logs.get(activity.pk, (None, None))
+        if latest is None and activity.created_at.date() > as_of:
+            continue
+        activity.actual_start = first_started
+        activity.apply_progress(latest, today=as_of)
+        result.append(activity)
+    return result
+
+
+def stats_as_of(project_ids, as_of):
+    """
+    {project id: unsaved ProjectStats} with the activity counts and progress
+    sum as of `as_of` (other fields left at zero).
+    """
+    project_ids = list(project_ids)
+    stats = {project_id: ProjectStats(project_id=project_id) for project_id in project_ids}
+    activities = Activity.objects.filter(project_id__in=project_ids, is_active=True).leaves().only(
+        "id", "project_id", "planned_end", "created_at", *Activity.PROGRESS_FIELDS
+    )
+    for activity in activities_as_of(activities, as_of):
+        project_stats = stats[activity.project_id]
+        project_stats.activities_total += 1
+        project_stats.progress_sum += activity.progress_percent
+        field = STATUS_FIELDS[activity.status]
+        setattr(project_stats, field, getattr(project_stats, field) + 1)
+        if activity.latest_log_date and (
+            project_stats.last_progress_date is None or activity.latest_log_date > project_stats.last_progress_date
+        ):
+            project_stats.last_progress_date = activity.latest_log_date
+    return stats
+
+
+def parse_as_of(value):
+    """A date from a query-string value (date or ISO string), or None when blank or invalid."""
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,369 @@
+"""
+Critical path scheduling of activities.
+
+ActivityDependency links two activities of a project finish-to-start or
+start-to-start, with a lag in days (negative: a lead). Every active leaf
+activity (sitemanage.wbs) is forecast from its plan, its progress and
+today's date (the data date):
+
+- a completed activity keeps its actual dates;
+- a started activity keeps its actual start and needs the remaining share of
+  its planned duration, counted from today; its predecessors no longer hold
+  it back, in either pass (progress override);
+- an activity not started begins no earlier than its planned start, today
+  and what its predecessors allow.
+
+The forward pass gives the early dates and the forecast completion (the
+latest early finish); the backward pass from that date gives the late dates.
+Total float is late start - early start; incomplete activities without float
+are the critical path, i.e. the ones whose delays push the completion date
+(Activity.total_float, .is_critical, forecast(), critical_path()).
+
+A summary activity is not scheduled itself: its dates span those of the
+leaves below it (earliest start, latest finish), and links to or from it
+are ignored (link its sub-activities instead).
+
+Every reschedule reloads the project (activities, links and closure rows)
+and rebuilds the graph: compact arrays of day numbers per activity and CSR
+adjacency lists (one offsets array, one array per link attribute), sorted
+topologically. Only the passes are limited: after a change to some
+activities only the activities downstream of them get new early dates and
+only those upstream new late dates, each visited in topological order; when
+the completion date moves, every late date shifts with one UPDATE. Only rows
+whose dates changed are written. The signals (sitemanage.signals) run one
+reschedule per project once the transaction commits
+(schedule_reschedule()). Dependency loops are refused by
+ActivityDependency.clean(); activities caught in one anyway are left
+unscheduled.
+
+The data date moves every day: run `manage.py schedule_projects` daily.
+"""
+import heapq
+from array import array
+from datetime import date, timedelta
+from threading import local
+
+from django.db import transaction
+from django.db.models import DateField, Exists, F, Max, OuterRef
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .models import Activity, ActivityClosure, ActivityDependency
+
+FIELDS = ["early_start", "early_finish", "late_start", "late_finish"]
+UNSCHEDULED = 0  # day number of an empty date (ordinals start at 1)
+
+
+def _day(value):
+    return value.toordinal() if value else UNSCHEDULED
+
+
+def _date(day):
+    return date.fromordinal(day) if day else None
+
+
+def _adjacency(size, links):
+    """CSR lists of (source, target, start-to-start, lag) links: offsets, targets, kinds, lags."""
+    offsets = array("i", [0]) * (size + 1)
+    for source, _target, _kind, _lag in links:
+        offsets[source + 1] += 1
+    for index in range(size):
+        offsets[index + 1] += offsets[index]
+    targets = array("i", [0]) * len(links)
+    kinds = array("b", [0]) * len(links)
+    lags = array("i", [0]) * len(links)
+    fill = array("i", offsets[:size])
+    for source, target, kind, lag in links:
+        slot = fill[source]
+        fill[source] += 1
+        targets[slot], kinds[slot], lags[slot] = target, kind, lag
+    return offsets, targets, kinds, lags
+
+
+class ProjectSchedule:
+    """The active leaf activities of a project and their links, in compact arrays."""
+
+    def __init__(self, project_id, today=None):
+        self.project_id = project_id
+        today = _day(today or timezone.localdate())
+        rows, summaries = [], []
+        activities = (
+            Activity.objects.filter(project_id=project_id, is_active=True)
+            .annotate(summary=Exists(Activity.objects.filter(parent=OuterRef("pk"), is_active=True)))
+            .order_by("pk").values_list(
+                "pk", "summary", "planned_start", "planned_end", "actual_start", "actual_end", "progress_percent",
+                *FIELDS,
+            )
+        )
+        for pk, summary, *values in activities:
+            (summaries if summary else rows).append((pk, *values))
+        size = self.size = len(rows)
+        self.ids = array("q", [row[0] for row in rows])
+        self.index = {pk: index for index, pk in enumerate(self.ids)}
+
+        # What the activity itself allows: the earliest start and the duration,
+        # fixed for started and completed activities (predecessors no longer move them)
+        self.floor = array("i", [0]) * size
+        self.duration = array("i", [0]) * size
+        self.fixed = array("b", [0]) * size
+        for index, (_pk, planned_start, planned_end, actual_start, actual_end, progress, *_dates) in enumerate(rows):
+            planned = max(_day(planned_end) - _day(planned_start) + 1, 1)
+            start = _day(actual_start or planned_start)
+            if progress >= 100:
+                finish = max(_day(actual_end or planned_end), start)
+                self.fixed[index] = 1
+            elif progress > 0 or actual_start:
+                remaining = max(-(-planned * (100 - progress) // 100), 1)
+                finish = max(start, today) + remaining - 1
+                self.fixed[index] = 1
+            else:
+                start, finish = max(start, today), max(start, today) + planned - 1
+            self.floor[index] = start
+            self.duration[index] = finish - start + 1
+
+        # Stored dates (what is in the database) and the dates being computed
+        self.stored = [array("i", [_day(row[6 + column]) for row in rows]) for column in range(len(FIELDS))]
+        self.early_start, self.early_finish, self.late_start, self.late_finish = (
+            array("i", column) for column in self.stored
+        )
+
+        links = []
+        dependencies = ActivityDependency.objects.filter(
+            predecessor__project_id=project_id, is_active=True,
+            predecessor__is_active=True, successor__is_active=True,
+        ).values_list("predecessor_id", "successor_id", "dependency_type", "lag_days")
+        for predecessor, successor, kind, lag in dependencies:
+            if predecessor in self.index and successor in self.index:
+                links.append((self.index[predecessor], self.index[successor], kind == ActivityDependency.START_TO_START, lag))
+        self.successors = _adjacency(size, links)
+        self.predecessors = _adjacency(size, [(target, source, kind, lag) for source, target, kind, lag in links])
+        self._sort()
+
+        # Summaries: stored dates and the leaves below each one
+        self.summary_ids = array("q", [row[0] for row in summaries])
+        self.summary_stored = [
+            array("i", [_day(row[6 + column]) for row in summaries]) for column in range(len(FIELDS))
+        ]
+        position = {pk: index for index, pk in enumerate(self.summary_ids)}
+        self.members = [array("i") for _row in summaries]
+        below = ActivityClosure.objects.filter(
+            ancestor__project_id=project_id, ancestor__is_active=True, depth__gt=0
+        ).values_list("ancestor_id", "descendant_id")
+        for ancestor, descendant in below:
+            if ancestor in position and descendant in self.index:
+                self.members[position[ancestor]].append(self.index[descendant])
+
+    def _sort(self):
+        """Topological order (Kahn); activities in a dependency loop get rank -1."""
+        offsets, targets, _kinds, _lags = self.successors
+        pred_offsets = self.predecessors[0]
+        waiting = array("i", (pred_offsets[index + 1] - pred_offsets[index] for index in range(self.size)))
+        order = array("i", (index for index in range(self.size) if not waiting[index]))
+        position = 0
+        while position < len(order):
+            node = order[position]
+            position += 1
+            for slot in range(offsets[node], offsets[node + 1]):
+                target = targets[slot]
+                waiting[target] -= 1
+                if not waiting[target]:
+                    order.append(target)
+        self.order = order
+        self.rank = array("i", [-1]) * self.size
+        for rank, node in enumerate(order):
+            self.rank[node] = rank
+
+    # ---------------- Passes ----------------
+    def _early(self, node):
+        start = self.floor[node]
+        if not self.fixed[node]:
+            offsets, sources, kinds, lags = self.predecessors
+            for slot in range(offsets[node], offsets[node + 1]):
+                source = sources[slot]
+                if self.rank[source] < 0:
+                    continue
+                if kinds[slot]:
+                    bound = self.early_start[source] + lags[slot]
+                else:
+                    bound = self.early_finish[source] + 1 + lags[slot]
+                if bound > start:
+                    start = bound
+        return start, start + self.duration[node] - 1
+
+    def _late(self, node, completion):
+        finish = completion
+        offsets, targets, kinds, lags = self.successors
+        for slot in range(offsets[node], offsets[node + 1]):
+            target = targets[slot]
+            if self.rank[target] < 0 or self.fixed[target]:
+                continue  # a started successor no longer waits for this one
+            if kinds[slot]:
+                bound = self.late_start[target] - lags[slot] + self.duration[node] - 1
+            else:
+                bound = self.late_start[target] - 1 - lags[slot]
+            if bound < finish:
+                finish = bound
+        return finish - self.duration[node] + 1, finish
+
+    def completion(self):
+        """Day number of the forecast completion (latest early finish of the scheduled activities)."""
+        return max((self.early_finish[node] for node in self.order), default=UNSCHEDULED)
+
+    def schedule(self, changed=None):
+        """
+        Compute the dates after a change to the `changed` activity ids (None:
+        everything). Returns the number of days every late date moved by.
+        """
+        seeds = None
+        if changed is not None and all(pk in self.index for pk in changed):
+            seeds = {self.index[pk] for pk in changed}
+            if any(not self.stored[column][node] for node in self.order for column in range(len(FIELDS))):
+                seeds = None  # new activities: nothing stored to start from
+        previous = self.completion() if seeds is not None else UNSCHEDULED
+        for node in range(self.size):
+            if self.rank[node] < 0:
+                self.early_start[node] = self.early_finish[node] = UNSCHEDULED
+                self.late_start[node] = self.late_finish[node] = UNSCHEDULED
+
+        # Forward: early dates, downstream of the change
+        moved = set()
+        if seeds is None:
+            for node in self.order:
+                self.early_start[node], self.early_finish[node] = self._early(node)
+        else:
+            moved = self._propagate(seeds, self._early, (self.early_start, self.early_finish), self.successors, 1)
+
+        completion = self.completion()
+        shift = completion - previous if seeds is not None and previous else 0
+        if shift:
+            for node in self.order:
+                self.late_start[node] += shift
+                self.late_finish[node] += shift
+
+        # Backward: late dates, upstream of the change (a seed that started or
+        # finished also releases its predecessors)
+        if seeds is None:
+            for node in reversed(self.order):
+                self.late_start[node], self.late_finish[node] = self._late(node, completion)
+        else:
+            offsets, sources, _kinds, _lags = self.predecessors
+            released = {sources[slot] for node in seeds for slot in range(offsets[node], offsets[node + 1])}
+            self._propagate(
+                seeds | moved | released, lambda node: self._late(node, completion),
+                (self.late_start, self.late_finish), self.predecessors, -1,
+            )
+        return shift
+
+    def _propagate(self, seeds, compute, columns, neighbours, direction):
+        """
+        Recompute `seeds` and, while their dates move, their neighbours, in
+        topological order (direction 1) or reverse order (-1). Returns the moved nodes.
+        """
+        first, second = columns
+        offsets, targets, _kinds, _lags = neighbours
+        queue = [(direction * self.rank[node], node) for node in seeds if self.rank[node] >= 0]
+        heapq.heapify(queue)
+        queued = {node for _rank, node in queue}
+        moved = set()
+        while queue:
+            _rank, node = heapq.heappop(queue)
+            dates = compute(node)
+            if dates == (first[node], second[node]):
+                continue
+            first[node], second[node] = dates
+            moved.add(node)
+            for slot in range(offsets[node], offsets[node + 1]):
+                target = targets[slot]
+                if target not in queued and self.rank[target] >= 0:
+                    queued.add(target)
+                    heapq.heappush(queue, (direction * self.rank[target], target))
+        return moved
+
+    def summary_dates(self, position):
+        """(early start, early finish, late start, late finish) of a summary: the span of its scheduled leaves."""
+        leaves = [node for node in self.members[position] if self.rank[node] >= 0]
+        if not leaves:
+            return (UNSCHEDULED,) * len(FIELDS)
+        return (
+            min(self.early_start[node] for node in leaves),
+            max(self.early_finish[node] for node in leaves),
+            min(self.late_start[node] for node in leaves),
+            max(self.late_finish[node] for node in leaves),
+        )
+
+    def changed_rows(self, shift=0):
+        """Activities whose computed dates differ from the stored ones (after a late-date shift)."""
+        computed = (self.early_start, self.early_finish, self.late_start, self.late_finish)
+        rows = []
+
+        def compare(pk, stored, dates):
+            if shift:
+                stored[2:] = [day + shift if day else day for day in stored[2:]]
+            if stored != list(dates):
+                rows.append(Activity(pk=pk, **{name: _date(day) for name, day in zip(FIELDS, dates)}))
+
+        for node in range(self.size):
+            compare(self.ids[node], [column[node] for column in self.stored], [column[node] for column in computed])
+        for position, pk in enumerate(self.summary_ids):
+            compare(pk, [column[position] for column in self.summary_stored], self.summary_dates(position))
+        return rows
+
+
+# ---------------- Storing ----------------
+def reschedule(project_id, activity_ids=None, today=None):
+    """
+    Recompute the project's schedule after a change to `activity_ids` (None:
+    the whole project) and store the dates that moved. Returns the number of
+    activities written.
+    """
+    schedule = ProjectSchedule(project_id, today=today)
+    shift = schedule.schedule(activity_ids)
+    rows = schedule.changed_rows(shift)
+    with transaction.atomic():
+        if shift:
+            Activity.objects.filter(project_id=project_id, is_active=True, late_start__isnull=False).update(
+                late_start=Cast(F("late_start") + timedelta(days=shift), DateField()),
+                late_finish=Cast(F("late_finish") + timedelta(days=shift), DateField()),
+            )
+        Activity.objects.bulk_update(rows, FIELDS, batch_size=500)
+    return len(rows)
+
+
+# project id: changed activity ids (None: the whole project), per thread
+_pending = local()
+
+
+def schedule_reschedule(project_id, activity_ids=None):
+    """
+    Reschedule the project once the current transaction commits. Calls made
+    in the same transaction are merged into one reschedule of all the
+    changed activities (None: the whole project).
+    """
+    pending = _pending.__dict__.setdefault("projects", {})
+    if project_id in pending:
+        earlier = pending[project_id]
+        activity_ids = None if activity_ids is None or earlier is None else earlier | set(activity_ids)
+    pending[project_id] = None if activity_ids is None else set(activity_ids)
+    transaction.on_commit(lambda: _run_pending_reschedule(project_id))
+
+
+def _run_pending_reschedule(project_id):
+    pending = _pending.__dict__.setdefault("projects", {})
+    if project_id in pending:
+        reschedule(project_id, pending.pop(project_id))
+
+
+# ---------------- Reading ----------------
+def forecast(project):
+    """(forecast completion date, days past the practical completion date); (None, None) when unscheduled."""
+    finish = Activity.objects.filter(project=project, is_active=True).aggregate(finish=Max("early_finish"))["finish"]
+    if finish is None:
+        return None, None
+    return finish, (finish - project.practical_completion_date).days
+
+
+def critical_path(project):
+    """Incomplete leaf activities without float, in forecast order."""
+    return Activity.objects.filter(
+        project=project, is_active=True, progress_percent__lt=100, late_start__lte=F("early_start"),
+    ).leaves().order_by("early_start", "pk")
@@ -1,9 +1,9 @@
 from django import forms
-from sitemanage.models import Activity, ProgressLog, SiteProjectImage, SiteVisitor
+from sitemanage.models import SUMMARY_LOG_ERROR, Activity, ProgressLog, SiteProjectImage, SiteVisitor
 from setup.models import WorkCategory
 from projects.models import Project
 from django.utils.safestring import mark_safe
-from django.core.exceptions import ValidationError
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
 from .services import get_allowed_projects 
 
 class RequiredFieldMixin:
@@ -93,11 +93,14 @@ class ActivityForm(RequiredFieldMixin, forms.ModelForm):
         fields = [
             "project",
             "category",
+            "parent",
             "name",
             "description",
             "planned_start",
             "planned_end",
+            "weight",
         ]
+        labels = {"parent": "Parent activity (WBS)"}
         widgets = {
             "planned_start": forms.DateInput(attrs={"type": "date"}),
             "planned_end": forms.DateInput(attrs={"type": "date"}),
@@ -105,8 +108,12 @@ class ActivityForm(RequiredFieldMixin, forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["project"].queryset = Project.objects.filter(is_active=True)
-        self.fields["category"].queryset = WorkCategory.objects.filter(is_active=True)
+        self.fields["project"].queryset = Project.active.all()
+        self.fields["category"].queryset = WorkCategory.active.all()
+        parents = Activity.active.filter(project__is_active=True).select_related("project")
+        if self.instance.pk:
+            parents = parents.exclude(pk__in=Activity.objects.subtree(self.instance).values("pk"))
+        self.fields["parent"].queryset = parents
 
     def clean(self):
         cleaned_data = super().clean()
@@ -130,6 +137,17 @@ class ProgressLogForm(RequiredFieldMixin, forms.ModelForm):
             "remarks": forms.Textarea(attrs={"rows": 3}),
         }
 
+    def clean(self):
+        cleaned_data = super().clean()
+        if self.instance.activity_id and self.instance.activity.has_active_children():
+            raise ValidationError(SUMMARY_LOG_ERROR, code="summary_activity")
+        return cleaned_data
+
+    def _post_clean(self):
+        # ProgressLog.clean() would repeat the summary error raised above
+        if not self.has_error(NON_FIELD_ERRORS, code="summary_activity"):
+            super()._post_clean()
+
 
 
 
@@ -163,7 +181,7 @@ class SiteVisitorForm(RequiredFieldMixin, forms.ModelForm):
         super().__init__(*args, **kwargs)
 
         # Optional: show only active projects
-        self.fields["project"].queryset = Project.objects.filter(is_active=True)
+        self.fields["project"].queryset = Project.active.all()
 
     def clean_document_file(self):
         file = self.cleaned_data.get("document_file")
@@ -210,16 +228,14 @@ class SiteProjectImageForm(RequiredFieldMixin, forms.ModelForm):
         if "project" in self.data:
             try:
                 project_id = int(self.data.get("project"))
-                self.fields["activity"].queryset = Activity.objects.filter(
+                self.fields["activity"].queryset = Activity.active.filter(
                     project_id=project_id,
-                    is_active=True
                 )
             except (ValueError, TypeError):
                 self.fields["activity"].queryset = Activity.objects.none()
         elif self.instance.pk and self.instance.project:
-            self.fields["activity"].queryset = Activity.objects.filter(
+            self.fields["activity"].queryset = Activity.active.filter(
                 project=self.instance.project,
-                is_active=True
             )
         else:
             self.fields["activity"].queryset = Activity.objects.none()
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from sitemanage.models import Activity, ProgressLog
+
+SNAPSHOT_FIELDS = ["latest_log", "latest_remarks", "latest_log_date"]
+
+
+class Command(BaseCommand):
+    help = "Fill the latest progress log snapshot (log, remarks, date) on every activity."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only backfill activities of this project id (repeatable)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        activities = Activity.objects.annotate(latest_id=Subquery(
+            ProgressLog.objects.filter(activity=OuterRef("pk"), is_active=True)
+            .order_by("-date", "-id").values("id")[:1]
+        ))
+        if options["projects"]:
+            activities = activities.filter(project_id__in=options["projects"])
+        activities = list(activities.only("id", *SNAPSHOT_FIELDS))
+
+        logs = ProgressLog.objects.only("id", "date", "remarks").in_bulk(
+            [activity.latest_id for activity in activities if activity.latest_id]
+        )
+        changed = []
+        for activity in activities:
+            log = logs.get(activity.latest_id)
+            snapshot = (log.pk, log.remarks, log.date) if log else (None, "", None)
+            if (activity.latest_log_id, activity.latest_remarks, activity.latest_log_date) != snapshot:
+                activity.latest_log_id, activity.latest_remarks, activity.latest_log_date = snapshot
+                changed.append(activity)
+
+        # Snapshot fields only: progress, status and the ProjectStats rollup are untouched
+        with transaction.atomic():
+            Activity.objects.bulk_update(changed, SNAPSHOT_FIELDS, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Latest log snapshot backfilled: {len(changed)} of {len(activities)} activities updated."
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from sitemanage.wbs import rebuild_wbs
+
+
+class Command(BaseCommand):
+    help = "Rebuild the WBS closure rows, levels and progress rollups of activities from their parents."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only rebuild activities of this project id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_wbs(options["projects"])
+        self.stdout.write(self.style.SUCCESS(f"WBS rebuilt for {count} activities."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from sitemanage.reconcile import reconcile_activities
+
+
+class Command(BaseCommand):
+    help = "Recompute activity progress, status, actual dates and latest log from progress logs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only reconcile activities of this project id (repeatable)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Show the differences without writing them")
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        result = reconcile_activities(
+            options["projects"], dry_run=options["dry_run"], chunk_size=options["chunk_size"],
+        )
+
+        if options["verbosity"] >= 1:
+            for activity, diff in result.changes:
+                changes = ", ".join(f"{name}: {old!r} -> {new!r}" for name, (old, new) in diff.items())
+                self.stdout.write(f"#{activity.pk} {activity.name} (project {activity.project_id}): {changes}")
+
+        timings = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in result.timings.items())
+        verb = "would change" if options["dry_run"] else "changed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.checked} activities checked, {len(result.changes)} {verb} "
+            f"in {len(result.projects)} project(s). {timings}"
+        ))
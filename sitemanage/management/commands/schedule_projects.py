@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from projects.models import Project
+from sitemanage.cpm import reschedule
+
+
+class Command(BaseCommand):
+    help = "Recompute the forecast schedule (early/late dates, float) of project activities as of today."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, action="append", dest="projects",
+            help="Only schedule this project id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.filter(is_active=True, archived_at__isnull=True)
+        if options["projects"]:
+            projects = projects.filter(pk__in=options["projects"])
+
+        count = written = 0
+        for project_id in projects.values_list("pk", flat=True):
+            written += reschedule(project_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Scheduled {count} projects ({written} activities updated)."))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_projectparticipant_options_and_more'),
+        ('setup', '0007_alter_authority_options_alter_workcategory_options_and_more'),
+        ('sitemanage', '0011_alter_sitemanage_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progresslog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='siteprojectimage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='sitevisitor',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['project', 'updated_at'], name='activity_proj_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='progresslog',
+            index=models.Index(fields=['updated_at'], name='progresslog_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='siteprojectimage',
+            index=models.Index(fields=['project', 'updated_at'], name='siteimage_project_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitevisitor',
+            index=models.Index(fields=['project', 'updated_at'], name='visitor_project_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sitemanage', '0012_sync_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='weight',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Relative weight in overall progress. Leave blank to weight by planned duration.', max_digits=12, null=True),
+        ),
+    ]
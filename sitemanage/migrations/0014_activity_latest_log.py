@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sitemanage', '0013_activity_weight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='latest_log',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='sitemanage.progresslog'),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='latest_log_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='latest_remarks',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_overdue_sweep'),
+        ('setup', '0007_alter_authority_options_alter_workcategory_options_and_more'),
+        ('sitemanage', '0014_activity_latest_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['project', 'status', 'planned_end'], name='activity_proj_status_end_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sitemanage', '0015_activity_overdue_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='progresslog',
+            index=models.Index(fields=['activity', 'is_active', 'date'], name='progresslog_act_date_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:58
+
+import django.db.models.deletion
+import sitemanage.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_archived_at'),
+        ('sitemanage', '0016_progresslog_activity_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProgressLog',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('progress_percent', models.PositiveSmallIntegerField()),
+                ('remarks', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('activity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sitemanage.activity')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['activity', 'is_active', 'date'], name='arch_progresslog_act_date_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedSiteProjectImage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('image', models.ImageField(upload_to=sitemanage.models.project_image_upload_path)),
+                ('image_date', models.DateField()),
+                ('figure_name', models.CharField(max_length=100)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('activity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sitemanage.activity')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-image_date', '-created_at'],
+                'indexes': [models.Index(fields=['project', 'image_date'], name='arch_siteimage_project_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_archived_at'),
+        ('setup', '0007_alter_authority_options_alter_workcategory_options_and_more'),
+        ('sitemanage', '0017_archive_tables'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['project', 'is_active', 'planned_start'], name='activity_proj_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='siteprojectimage',
+            index=models.Index(fields=['project', 'is_active', 'image_date'], name='siteimage_proj_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitevisitor',
+            index=models.Index(fields=['project', 'is_active', 'visit_date'], name='visitor_proj_active_idx'),
+        ),
+    ]
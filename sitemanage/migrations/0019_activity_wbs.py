@@ -0,0 +1,66 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:06
+
+import django.db.models.deletion
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def flat_wbs(apps, schema_editor):
+    """Existing activities are top-level leaves: a closure row with themselves and their own rollup."""
+    Activity = apps.get_model("sitemanage", "Activity")
+    ActivityClosure = apps.get_model("sitemanage", "ActivityClosure")
+    activities = list(Activity.objects.only("id", "weight", "planned_start", "planned_end", "progress_percent", "is_active"))
+    for activity in activities:
+        if activity.is_active:
+            weight = activity.weight or Decimal((activity.planned_end - activity.planned_start).days + 1)
+            activity.rollup_weight, activity.rollup_earned = weight, weight * activity.progress_percent
+    Activity.objects.bulk_update(activities, ["rollup_weight", "rollup_earned"], batch_size=500)
+    ActivityClosure.objects.bulk_create(
+        [ActivityClosure(ancestor_id=activity.pk, descendant_id=activity.pk, depth=0) for activity in activities],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sitemanage', '0018_active_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='sitemanage.activity'),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='rollup_earned',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='rollup_weight',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=16),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='wbs_level',
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.CreateModel(
+            name='ActivityClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='sitemanage.activity')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='sitemanage.activity')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor', 'depth', 'descendant'], name='wbs_closure_anc_depth_idx'), models.Index(fields=['descendant', 'depth'], name='wbs_closure_desc_depth_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='wbs_closure_pair_uniq')],
+            },
+        ),
+        migrations.RunPython(flat_wbs, migrations.RunPython.noop),
+    ]
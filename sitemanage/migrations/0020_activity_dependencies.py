@@ -0,0 +1,65 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sitemanage', '0019_activity_wbs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dependency_type', models.CharField(choices=[('FS', 'Finish to start'), ('SS', 'Start to start')], default='FS', max_length=2)),
+                ('lag_days', models.IntegerField(default=0, help_text="Days after the predecessor's finish (finish to start) or start (start to start). Negative for a lead.")),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'verbose_name_plural': 'activity dependencies',
+            },
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='early_finish',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='early_start',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='late_finish',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='late_start',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['project', 'is_active', 'early_finish'], name='activity_proj_early_fin_idx'),
+        ),
+        migrations.AddField(
+            model_name='activitydependency',
+            name='predecessor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='successor_links', to='sitemanage.activity'),
+        ),
+        migrations.AddField(
+            model_name='activitydependency',
+            name='successor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='predecessor_links', to='sitemanage.activity'),
+        ),
+        migrations.AddConstraint(
+            model_name='activitydependency',
+            constraint=models.UniqueConstraint(fields=('predecessor', 'successor'), name='activity_dep_pair_uniq'),
+        ),
+    ]
@@ -3,9 +3,11 @@ from django.utils.text import slugify
 import uuid
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.contrib.auth.models import User
 from projects.models import Project
 from setup.models import WorkCategory
+from common.managers import ActiveManager, SoftDeleteManager, SoftDeleteQuerySet
 
 
 # ---------------------------
@@ -31,6 +33,32 @@ class SiteManage(models.Model):
 # ---------------------------
 # ACTIVITY
 # ---------------------------
+class ActivityQuerySet(SoftDeleteQuerySet):
+    """Work breakdown structure lookups, each one indexed query on ActivityClosure."""
+
+    def subtree(self, node, max_depth=None, include_self=True):
+        """Activities under `node` (an activity or id), down to `max_depth` levels below it."""
+        links = {"ancestor_links__ancestor": node}
+        if max_depth is not None:
+            links["ancestor_links__depth__lte"] = max_depth
+        if not include_self:
+            links["ancestor_links__depth__gt"] = 0
+        return self.filter(**links)
+
+    def ancestors(self, node, include_self=False):
+        """Activities above `node`, nearest first."""
+        links = {"descendant_links__descendant": node}
+        if not include_self:
+            links["descendant_links__depth__gt"] = 0
+        return self.filter(**links).order_by("descendant_links__depth")
+
+    def leaves(self):
+        """Activities without active children (the ones progress is logged against)."""
+        return self.filter(
+            ~models.Exists(Activity.objects.filter(parent=models.OuterRef("pk"), is_active=True))
+        )
+
+
 class Activity(models.Model):
     STATUS_PENDING = 'Pending'
     STATUS_IN_PROGRESS = 'In Progress'
@@ -55,6 +83,15 @@ class Activity(models.Model):
         null=True,
         blank=True
     )
+    # Work breakdown structure: a summary activity groups its children
+    # (ancestors are kept in ActivityClosure by sitemanage.wbs)
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='children'
+    )
 
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -62,6 +99,14 @@ class Activity(models.Model):
     planned_start = models.DateField()
     planned_end = models.DateField()
 
+    weight = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Relative weight in overall progress. Leave blank to weight by planned duration."
+    )
+
     actual_start = models.DateField(null=True, blank=True)
     actual_end = models.DateField(null=True, blank=True)
 
@@ -73,6 +118,30 @@ class Activity(models.Model):
         editable=False
     )
 
+    # Snapshot of the latest active progress log, kept by ProgressLog.save()
+    latest_log = models.ForeignKey(
+        'ProgressLog',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    latest_remarks = models.TextField(blank=True, editable=False)
+    latest_log_date = models.DateField(null=True, blank=True, editable=False)
+
+    # WBS level (1 = top) and weighted progress of the active leaf activities
+    # in the subtree, kept by sitemanage.wbs
+    wbs_level = models.PositiveSmallIntegerField(default=1, editable=False)
+    rollup_weight = models.DecimalField(max_digits=16, decimal_places=2, default=0, editable=False)
+    rollup_earned = models.DecimalField(max_digits=18, decimal_places=2, default=0, editable=False)
+
+    # Forecast schedule over the dependency graph, kept by sitemanage.cpm
+    early_start = models.DateField(null=True, blank=True, editable=False)
+    early_finish = models.DateField(null=True, blank=True, editable=False)
+    late_start = models.DateField(null=True, blank=True, editable=False)
+    late_finish = models.DateField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -91,8 +160,17 @@ class Activity(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager.from_queryset(ActivityQuerySet)()
+    active = ActiveManager.from_queryset(ActivityQuerySet)()
+
     class Meta:
         ordering = ['planned_start']
+        indexes = [
+            models.Index(fields=['project', 'updated_at'], name='activity_proj_updated_idx'),
+            models.Index(fields=['project', 'status', 'planned_end'], name='activity_proj_status_end_idx'),
+            models.Index(fields=['project', 'is_active', 'planned_start'], name='activity_proj_active_idx'),
+            models.Index(fields=['project', 'is_active', 'early_finish'], name='activity_proj_early_fin_idx'),
+        ]
 
     def __str__(self):
         return f"{self.project} - {self.name}"
@@ -101,6 +179,37 @@ class Activity(models.Model):
     def is_delayed(self):
         return self.status == self.STATUS_DELAYED
 
+    @property
+    def effective_weight(self):
+        """Weight in rollups: `weight`, or the planned duration in days when blank."""
+        if self.weight:
+            return self.weight
+        if self.planned_start and self.planned_end:
+            return (self.planned_end - self.planned_start).days + 1
+        return 1
+
+    @property
+    def rollup_percent(self):
+        """Weighted progress of the subtree (the activity's own progress for a leaf)."""
+        if not self.rollup_weight:
+            return self.progress_percent
+        return round(self.rollup_earned / self.rollup_weight)
+
+    def has_active_children(self):
+        """A summary activity: its progress is rolled up from the children (sitemanage.wbs)."""
+        return bool(self.pk) and Activity.objects.filter(parent=self.pk, is_active=True).exists()
+
+    @property
+    def total_float(self):
+        """Days the activity can slip without moving the forecast completion (None: not scheduled)."""
+        if self.early_start is None or self.late_start is None:
+            return None
+        return (self.late_start - self.early_start).days
+
+    @property
+    def is_critical(self):
+        return self.progress_percent < 100 and self.total_float is not None and self.total_float <= 0
+
     def clean(self):
         if self.planned_start and self.planned_end:
             if self.planned_end < self.planned_start:
@@ -108,15 +217,179 @@ class Activity(models.Model):
                     "planned_end": "Planned end date cannot be before planned start date."
                 })
 
+        if self.parent_id:
+            if self.parent.project_id != self.project_id:
+                raise ValidationError({"parent": "The parent activity must belong to the same project."})
+            if self.pk and (
+                self.parent_id == self.pk
+                or ActivityClosure.objects.filter(ancestor_id=self.pk, descendant_id=self.parent_id).exists()
+            ):
+                raise ValidationError({"parent": "An activity cannot be placed under itself or its sub-activities."})
+
     def save(self, *args, **kwargs):
         self.full_clean()  # Enforces clean()
         super().save(*args, **kwargs)
-        
+
+    PROGRESS_FIELDS = [
+        'progress_percent',
+        'status',
+        'actual_start',
+        'actual_end',
+        'latest_log',
+        'latest_remarks',
+        'latest_log_date',
+        'updated_at',
+    ]
+
+    def apply_progress(self, latest, today=None):
+        """
+        Set progress, status, actual dates and the latest-log snapshot from
+        `latest`, the latest active progress log (None: no logs left).
+        `today` replaces the current date when rebuilding a past state
+        (sitemanage.asof). An ArchivedProgressLog (projects.archive) sets the
+        snapshot fields but leaves latest_log empty.
+        """
+        self.latest_log = latest if isinstance(latest, ProgressLog) else None
+        if latest is None:
+            self.progress_percent = 0
+            self.status = self.STATUS_DELAYED if self.is_overdue(today=today) else self.STATUS_PENDING
+            self.actual_start = None
+            self.actual_end = None
+            self.latest_remarks = ''
+            self.latest_log_date = None
+            return
+
+        self.progress_percent = latest.progress_percent
+        self.latest_remarks = latest.remarks
+        self.latest_log_date = latest.date
+
+        if latest.progress_percent == 100:
+            self.status = self.STATUS_COMPLETED
+            self.actual_end = latest.date
+        elif latest.progress_percent > 0:
+            self.status = self.STATUS_IN_PROGRESS
+            self.actual_end = None
+        else:
+            self.status = self.STATUS_PENDING
+            self.actual_end = None
+
+        if latest.progress_percent > 0 and not self.actual_start:
+            self.actual_start = latest.date
+
+        if latest.progress_percent < 100 and self.is_overdue(latest.date, today):
+            self.status = self.STATUS_DELAYED
+
+    def is_overdue(self, on=None, today=None):
+        """Planned end passed as of today, or of the later date `on`."""
+        today = today or timezone.localdate()
+        return bool(self.planned_end) and max(on or today, today) > self.planned_end
+
+    def sync_progress(self):
+        """
+        Re-read the latest active log and roll progress back to it; used when
+        a log is soft deleted, edited or removed.
+        """
+        logs = self.progress_logs.filter(is_active=True)
+        latest = logs.order_by('-date', '-id').first()
+        self.actual_start = (
+            logs.filter(progress_percent__gt=0).order_by('date', 'id')
+            .values_list('date', flat=True).first()
+        )
+        self.apply_progress(latest)
+        self.save(update_fields=self.PROGRESS_FIELDS)
+
+
+class ActivityClosure(models.Model):
+    """
+    One ancestor/descendant pair of the work breakdown structure, including
+    the activity with itself at depth 0 (kept by sitemanage.wbs).
+    """
+    ancestor = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='wbs_closure_pair_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['ancestor', 'depth', 'descendant'], name='wbs_closure_anc_depth_idx'),
+            models.Index(fields=['descendant', 'depth'], name='wbs_closure_desc_depth_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} > {self.descendant_id} ({self.depth})"
+
+
+class ActivityDependency(models.Model):
+    """A scheduling link between two activities of a project (sitemanage.cpm)."""
+    FINISH_TO_START = 'FS'
+    START_TO_START = 'SS'
+
+    TYPE_CHOICES = [
+        (FINISH_TO_START, 'Finish to start'),
+        (START_TO_START, 'Start to start'),
+    ]
+
+    predecessor = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='successor_links')
+    successor = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='predecessor_links')
+    dependency_type = models.CharField(max_length=2, choices=TYPE_CHOICES, default=FINISH_TO_START)
+    lag_days = models.IntegerField(
+        default=0,
+        help_text="Days after the predecessor's finish (finish to start) or start (start to start). Negative for a lead."
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    is_active = models.BooleanField(default=True)
+
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
+    class Meta:
+        verbose_name_plural = 'activity dependencies'
+        constraints = [
+            models.UniqueConstraint(fields=['predecessor', 'successor'], name='activity_dep_pair_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.predecessor_id} -> {self.successor_id} ({self.dependency_type}{self.lag_days:+d})"
+
+    def clean(self):
+        if not (self.predecessor_id and self.successor_id):
+            return
+        if self.predecessor_id == self.successor_id:
+            raise ValidationError({"successor": "An activity cannot depend on itself."})
+        if self.predecessor.project_id != self.successor.project_id:
+            raise ValidationError({"successor": "Both activities must belong to the same project."})
+
+        # A path from the successor back to the predecessor would close a loop
+        links = ActivityDependency.objects.filter(
+            predecessor__project_id=self.predecessor.project_id, is_active=True
+        ).exclude(pk=self.pk).values_list('predecessor_id', 'successor_id')
+        successors = {}
+        for predecessor, successor in links:
+            successors.setdefault(predecessor, []).append(successor)
+        pending, seen = [self.successor_id], set()
+        while pending:
+            node = pending.pop()
+            if node == self.predecessor_id:
+                raise ValidationError({"predecessor": "This dependency would create a loop in the schedule."})
+            if node not in seen:
+                seen.add(node)
+                pending.extend(successors.get(node, []))
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
 
 
 # ---------------------------
 # PROGRESS LOG
 # ---------------------------
+SUMMARY_LOG_ERROR = "This is a summary activity: log progress against its sub-activities."
+
+
 class ProgressLog(models.Model):
     activity = models.ForeignKey(
         Activity,
@@ -136,10 +409,18 @@ class ProgressLog(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    objects = SoftDeleteManager()
+    active = ActiveManager()
+
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['updated_at'], name='progresslog_updated_idx'),
+            models.Index(fields=['activity', 'is_active', 'date'], name='progresslog_act_date_idx'),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(progress_percent__gte=0, progress_percent__lte=100),
@@ -151,9 +432,18 @@ class ProgressLog(models.Model):
         return f"{self.activity} → {self.progress_percent}%"
 
     def clean(self):
+        from projects.archive import check_not_archived
+
+        if self.activity_id:
+            check_not_archived(self.activity.project_id)
+        if not self.is_active:
+            return  # soft delete: the activity is rolled back in save()
+        if self.activity.has_active_children():
+            raise ValidationError(SUMMARY_LOG_ERROR, code="summary_activity")
+
         last_log = (
             ProgressLog.objects
-            .filter(activity=self.activity)
+            .filter(activity=self.activity, is_active=True)
             .exclude(pk=self.pk)
             .order_by('-date', '-id')
             .first()
@@ -169,34 +459,32 @@ class ProgressLog(models.Model):
             if self.progress_percent == 0:
                 raise ValidationError({"progress_percent": "Progress cannot return to 0."})
 
+    def is_latest_for(self, activity):
+        """True if this active log is at least as recent as the activity's snapshot."""
+        if not self.is_active:
+            return False
+        if activity.latest_log_id is None:
+            return True
+        return (self.date, self.pk) >= (activity.latest_log_date, activity.latest_log_id)
+
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
 
         activity = self.activity
-        activity.progress_percent = self.progress_percent
-
-        if self.progress_percent == 100:
-            activity.status = Activity.STATUS_COMPLETED
-            activity.actual_end = self.date
-        elif self.progress_percent > 0:
-            activity.status = Activity.STATUS_IN_PROGRESS
-            if not activity.actual_start:
-                activity.actual_start = self.date
-
-        if (
-            activity.planned_end and
-            self.date > activity.planned_end and
-            self.progress_percent < 100
-        ):
-            activity.status = Activity.STATUS_DELAYED
-
-        activity.save(update_fields=[
-            'progress_percent',
-            'status',
-            'actual_start',
-            'actual_end'
-        ])
+        if self.is_latest_for(activity):
+            # New latest log: progress only moves forward from the snapshot
+            activity.apply_progress(self)
+            activity.save(update_fields=Activity.PROGRESS_FIELDS)
+        else:
+            # Soft deleted or an older log edited: roll back to the latest active log
+            activity.sync_progress()
+
+    def delete(self, *args, **kwargs):
+        activity = self.activity
+        result = super().delete(*args, **kwargs)
+        activity.sync_progress()
+        return result
 
 
 # ---------------------------
@@ -222,9 +510,17 @@ class SiteVisitor(models.Model):
         blank=True
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SoftDeleteManager()
+    active = ActiveManager()
 
     class Meta:
         ordering = ["-visit_date"]
+        indexes = [
+            models.Index(fields=["project", "updated_at"], name="visitor_project_updated_idx"),
+            models.Index(fields=["project", "is_active", "visit_date"], name="visitor_proj_active_idx"),
+        ]
         verbose_name = "Site Visitor"
         verbose_name_plural = "Site Visitors"
 
@@ -272,11 +568,72 @@ class SiteProjectImage(models.Model):
         blank=True
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SoftDeleteManager()
+    active = ActiveManager()
 
     class Meta:
         ordering = ["-image_date", "-created_at"]
+        indexes = [
+            models.Index(fields=["project", "updated_at"], name="siteimage_project_updated_idx"),
+            models.Index(fields=["project", "is_active", "image_date"], name="siteimage_proj_active_idx"),
+        ]
         verbose_name = "Site Project Image"
         verbose_name_plural = "Site Project Images"
 
     def __str__(self):
-        return f"{self.project.project_name} | {self.activity} | {self.figure_name}"
\ No newline at end of file
+        return f"{self.project.project_name} | {self.activity} | {self.figure_name}"
+
+    def clean(self):
+        from projects.archive import check_not_archived
+
+        check_not_archived(self.project_id)
+
+
+# ---------------------------
+# ARCHIVE (see projects.archive)
+# ---------------------------
+class ArchivedProgressLog(models.Model):
+    """ProgressLog row of an archived project, moved out of the live table with its id."""
+    id = models.BigIntegerField(primary_key=True)
+    activity = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    progress_percent = models.PositiveSmallIntegerField()
+    remarks = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['activity', 'is_active', 'date'], name='arch_progresslog_act_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.activity} → {self.progress_percent}%"
+
+
+class ArchivedSiteProjectImage(models.Model):
+    """SiteProjectImage row of an archived project; the file stays where it is."""
+    id = models.BigIntegerField(primary_key=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    activity = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='+')
+    image = models.ImageField(upload_to=project_image_upload_path)
+    image_date = models.DateField()
+    figure_name = models.CharField(max_length=100)
+    is_active = models.BooleanField(default=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-image_date", "-created_at"]
+        indexes = [
+            models.Index(fields=["project", "image_date"], name="arch_siteimage_project_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} | {self.activity_id} | {self.figure_name}"
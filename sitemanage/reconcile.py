@@ -0,0 +1,152 @@
+"""
+Set-based reconciliation of the fields an Activity derives from its logs.
+
+progress_percent, status, actual_start, actual_end and the latest-log
+snapshot are normally kept by ProgressLog.save(). Queryset updates, data
+fixes and older rows can leave them out of step; reconcile_activities()
+recomputes them for many activities at once:
+
+- one window-function query per chunk of activities picks the latest active
+  log (ROW_NUMBER over date, id) and the first date with progress > 0;
+- the rules of Activity.apply_progress() are applied in memory;
+- only activities whose values differ are written, with bulk_update;
+- ProjectStats rows of the affected projects, the WBS rollups above the
+  changed activities and their forecast schedule are rebuilt, since
+  bulk_update sends no signals.
+
+Run with `manage.py reconcile_activities` (nightly, or after bulk changes).
+"""
+import time
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Case, F, Min, When, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from projects.stats import rebuild_project_stats
+
+from .models import Activity, ProgressLog
+from .cpm import reschedule
+from .wbs import refresh_paths
+
+DERIVED_FIELDS = [name for name in Activity.PROGRESS_FIELDS if name != "updated_at"]
+
+
+@dataclass
+class Reconciliation:
+    """Outcome of one run: changed activities with their diffs, and timings in seconds."""
+    checked: int = 0
+    changes: list = field(default_factory=list)   # [(activity, {field: (old, new)})]
+    timings: dict = field(default_factory=dict)
+    projects: set = field(default_factory=set)
+
+    def timed(self, name, started):
+        self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def latest_logs(activity_ids, as_of=None, model=ProgressLog):
+    """
+    {activity id: (latest active log, first date with progress > 0)} in one
+    query, counting only logs dated `as_of` or earlier when given. `model`
+    is ProgressLog or, for archived projects, ArchivedProgressLog.
+    """
+    logs = model.objects.filter(activity_id__in=activity_ids, is_active=True)
+    if as_of is not None:
+        logs = logs.filter(date__lte=as_of)
+    logs = (
+        logs
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=[F("activity_id")],
+                order_by=[F("date").desc(), F("id").desc()],
+            ),
+            first_started=Window(
+                Min(Case(When(progress_percent__gt=0, then=F("date")))),
+                partition_by=[F("activity_id")],
+            ),
+        )
+        .filter(rank=1)
+        .only("id", "activity_id", "date", "progress_percent", "remarks")
+    )
+    return {log.activity_id: (log, log.first_started) for log in logs}
+
+
+def expected_values(activity, latest, first_started):
+    """Derived field values of `activity` according to its logs."""
+    expected = Activity(
+        pk=activity.pk,
+        planned_end=activity.planned_end,
+        actual_start=first_started,
+    )
+    expected.apply_progress(latest)
+    return {name: getattr(expected, name) for name in DERIVED_FIELDS}
+
+
+def _current(activity, name):
+    return activity.latest_log_id if name == "latest_log" else getattr(activity, name)
+
+
+def _expected(values, name):
+    value = values[name]
+    return value.pk if name == "latest_log" and value is not None else value
+
+
+def reconcile_activities(project_ids=None, dry_run=False, chunk_size=500):
+    """
+    Recompute derived activity fields from active progress logs.
+
+    Limited to `project_ids` when given. With `dry_run` nothing is written;
+    the returned Reconciliation lists what would change either way.
+    """
+    result = Reconciliation()
+    # Archived projects have no live logs (projects.archive)
+    activities = Activity.objects.filter(project__archived_at__isnull=True).order_by("pk")
+    if project_ids is not None:
+        activities = activities.filter(project_id__in=project_ids)
+    activities = activities.only("id", "project_id", "name", "planned_end", *DERIVED_FIELDS)
+
+    started = time.perf_counter()
+    ids = list(activities.values_list("pk", flat=True))
+    result.timed("load", started)
+
+    for offset in range(0, len(ids), chunk_size):
+        started = time.perf_counter()
+        chunk = list(activities.filter(pk__in=ids[offset:offset + chunk_size]))
+        logs = latest_logs([activity.pk for activity in chunk])
+        result.timed("load", started)
+
+        started = time.perf_counter()
+        changed = []
+        for activity in chunk:
+            values = expected_values(activity, *logs.get(activity.pk, (None, None)))
+            diff = {
+                name: (_current(activity, name), _expected(values, name))
+                for name in DERIVED_FIELDS
+                if _current(activity, name) != _expected(values, name)
+            }
+            if diff:
+                for name in DERIVED_FIELDS:
+                    setattr(activity, name, values[name])
+                activity.updated_at = timezone.now()
+                changed.append(activity)
+                result.changes.append((activity, diff))
+                result.projects.add(activity.project_id)
+        result.checked += len(chunk)
+        result.timed("compute", started)
+
+        if changed and not dry_run:
+            started = time.perf_counter()
+            with transaction.atomic():
+                Activity.objects.bulk_update(changed, Activity.PROGRESS_FIELDS)
+            result.timed("write", started)
+
+    if result.projects and not dry_run:
+        started = time.perf_counter()
+        rebuild_project_stats(result.projects)
+        refresh_paths([activity.pk for activity, _diff in result.changes])
+        for project_id in result.projects:
+            reschedule(project_id, [activity.pk for activity, _diff in result.changes if activity.project_id == project_id])
+        result.timed("stats", started)
+    return result
@@ -0,0 +1,166 @@
+"""
+Weighted S-curve engine.
+
+Planned and actual cumulative progress per week for a project, weighted by
+Activity.weight (or planned duration in days when no weight is set). Only
+leaf activities count: a WBS summary activity is the sum of its children
+(sitemanage.wbs).
+
+Everything is computed in memory from two flat queries (activities and
+progress logs) held in compact array columns:
+
+- planned: each activity contributes weight/duration per day between its
+  planned start and end; a difference array over the project's day range
+  turns that into a cumulative curve in O(activities + days);
+- actual: logs sorted by date become weighted progress deltas, whose running
+  sum is sampled at each week end with a binary search.
+
+Results are cached per project data version (see common.cache), which the
+sitemanage signals bump whenever activities or logs change.
+"""
+import datetime
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from common.cache import project_cache_key
+from projects.archive import source
+from .models import Activity, ProgressLog
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _week_start(ordinal):
+    return ordinal - datetime.date.fromordinal(ordinal).weekday()
+
+
+class ProgressColumns:
+    """
+    Daily planned and earned progress of a project as array columns.
+
+    `planned_at(day)` and `earned_at(day)` return the cumulative weighted
+    fraction (0..1) at the end of a given date ordinal. Shared by the S-curve
+    and the earned value engine (finance.evm).
+    """
+
+    def __init__(self, project_id):
+        rows = Activity.objects.filter(
+            project_id=project_id, is_active=True
+        ).leaves().values_list("id", "planned_start", "planned_end", "weight")
+
+        index = {}
+        starts = array("l")
+        ends = array("l")
+        weights = array("d")
+        for activity_id, planned_start, planned_end, weight in rows:
+            start = planned_start.toordinal()
+            end = max(planned_end.toordinal(), start)
+            index[activity_id] = len(weights)
+            starts.append(start)
+            ends.append(end)
+            weights.append(float(weight) if weight else float(end - start + 1))
+
+        self.total_weight = sum(weights)
+        self.log_days = array("l")
+        if not weights or self.total_weight <= 0:
+            self.first_day = self.last_day = None
+            return
+
+        logs = source(ProgressLog, project_id).filter(
+            activity__project_id=project_id,
+            activity__is_active=True,
+            is_active=True,
+        ).order_by("date", "id").values_list("activity_id", "date", "progress_percent")
+
+        # ---------- Actual: weighted progress deltas by date ----------
+        last_progress = array("d", bytes(8 * len(weights)))
+        log_deltas = array("d")
+        for activity_id, date, progress in logs:
+            i = index.get(activity_id)
+            if i is None:
+                continue  # logged against a summary activity
+            delta = weights[i] * (progress - last_progress[i]) / 100.0
+            last_progress[i] = progress
+            day = date.toordinal()
+            if self.log_days and self.log_days[-1] == day:
+                log_deltas[-1] += delta
+            else:
+                self.log_days.append(day)
+                log_deltas.append(delta)
+        self.earned = array("d", accumulate(log_deltas))
+
+        # ---------- Planned: difference array of daily rates ----------
+        self.first_day = min(starts)
+        self.last_day = max(ends)
+        span = self.last_day - self.first_day + 1
+        rate_changes = array("d", bytes(8 * (span + 1)))
+        for i in range(len(weights)):
+            rate = weights[i] / (ends[i] - starts[i] + 1)
+            rate_changes[starts[i] - self.first_day] += rate
+            rate_changes[ends[i] - self.first_day + 1] -= rate
+        self.planned = array("d", accumulate(accumulate(rate_changes[:span])))
+
+    def __bool__(self):
+        return self.first_day is not None
+
+    @property
+    def range_start(self):
+        return min(self.first_day, self.log_days[0]) if self.log_days else self.first_day
+
+    @property
+    def range_end(self):
+        return max(self.last_day, self.log_days[-1]) if self.log_days else self.last_day
+
+    def planned_at(self, day):
+        if day < self.first_day:
+            return 0.0
+        if day > self.last_day:
+            return 1.0
+        return self.planned[day - self.first_day] / self.total_weight
+
+    def earned_at(self, day):
+        position = bisect_right(self.log_days, day)
+        return self.earned[position - 1] / self.total_weight if position else 0.0
+
+
+def compute_s_curve(project_id, today=None):
+    """
+    Return {"weeks": [...], "planned": [...], "actual": [...]} in percent.
+
+    `weeks` holds the Monday of each week; values are sampled at the Sunday.
+    Actual values after the current week are None.
+    """
+    columns = ProgressColumns(project_id)
+    if not columns:
+        return {"weeks": [], "planned": [], "actual": []}
+
+    current_week = _week_start((today or timezone.localdate()).toordinal())
+
+    weeks, planned, actual = [], [], []
+    week = _week_start(columns.range_start)
+    while week <= columns.range_end:
+        week_end = week + 6
+        weeks.append(datetime.date.fromordinal(week).strftime("%Y-%m-%d"))
+        planned.append(round(columns.planned_at(week_end) * 100, 2))
+        actual.append(
+            None if week > current_week else round(columns.earned_at(week_end) * 100, 2)
+        )
+        week += 7
+
+    return {"weeks": weeks, "planned": planned, "actual": actual}
+
+
+def get_s_curve(project_id, version=None):
+    """
+    Cached S-curve for a project; recomputed when its data version changes
+    (`version`: already read, see common.cache.get_project_versions).
+    """
+    key = project_cache_key("s-curve", project_id, timezone.localdate().isoformat(), version=version)
+    curve = cache.get(key)
+    if curve is None:
+        curve = compute_s_curve(project_id)
+        cache.set(key, curve, CACHE_TIMEOUT)
+    return curve
@@ -1,14 +1,7 @@
-from django.db.models import Avg, Max
-from django.db.models.functions import TruncWeek
 from projects.models import Project
+from projects.stats import get_project_stats
 
-
-from .models import (
-    Activity,
-    ProgressLog,
-    SiteVisitor,
-    SiteProjectImage
-)
+from .scurve import get_s_curve
 
 
 def get_allowed_projects(user):
@@ -24,52 +17,34 @@ def get_allowed_projects(user):
 
 def get_project_site_overview(projects):
     """
-    Returns high-level overview data per project
+    Returns high-level overview data per project (read from ProjectStats)
     """
+    projects = list(projects)
+    stats = get_project_stats([project.id for project in projects])
     overview = []
 
     for project in projects:
-        activities = Activity.objects.filter(
-            project=project,
-            is_active=True
-        )
-
-        progress_avg = activities.aggregate(
-            avg=Avg("progress_percent")
-        )["avg"] or 0
-
+        project_stats = stats[project.id]
         overview.append({
             "project": project,
 
             # Activity stats
-            "total_activities": activities.count(),
-            "completed": activities.filter(status=Activity.STATUS_COMPLETED).count(),
-            "in_progress": activities.filter(status=Activity.STATUS_IN_PROGRESS).count(),
-            "delayed": activities.filter(status=Activity.STATUS_DELAYED).count(),
+            "total_activities": project_stats.activities_total,
+            "completed": project_stats.activities_completed,
+            "in_progress": project_stats.activities_in_progress,
+            "delayed": project_stats.activities_delayed,
 
             # Progress
-            "overall_progress": round(progress_avg, 1),
+            "overall_progress": project_stats.average_progress,
 
             # Latest updates
-            "last_activity_update": activities.aggregate(
-                last=Max("updated_at")
-            )["last"],
+            "last_activity_update": project_stats.last_activity_update,
+            "last_progress_date": project_stats.last_progress_date,
 
             # Visitors & media
-            "visitor_docs": SiteVisitor.objects.filter(
-                project=project,
-                is_active=True
-            ).count(),
-
-            "images_count": SiteProjectImage.objects.filter(
-                project=project,
-                is_active=True
-            ).count(),
-
-            "latest_image_date": SiteProjectImage.objects.filter(
-                project=project,
-                is_active=True
-            ).aggregate(last=Max("image_date"))["last"],
+            "visitor_docs": project_stats.visitors_count,
+            "images_count": project_stats.images_count,
+            "latest_image_date": project_stats.latest_image_date,
         })
 
     return overview
@@ -77,24 +52,10 @@ def get_project_site_overview(projects):
 
 def get_weekly_progress_trend(project):
     """
-    Returns latest progress per week for a project
+    Returns weighted planned vs actual cumulative progress per week (S-curve)
     """
-    logs = (
-        ProgressLog.objects
-        .filter(
-            activity__project=project,
-            is_active=True
-        )
-        .annotate(week=TruncWeek("date"))
-        .values("week")
-        .annotate(progress=Max("progress_percent"))
-        .order_by("week")
-    )
-
+    curve = get_s_curve(project.id)
     return [
-        {
-            "week": log["week"].strftime("%Y-%m-%d"),
-            "progress": log["progress"],
-        }
-        for log in logs if log["week"]
+        {"week": week, "planned": planned, "progress": actual}
+        for week, planned, actual in zip(curve["weeks"], curve["planned"], curve["actual"])
     ]
@@ -0,0 +1,124 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from common.cache import bump_project_version
+from common.managers import active_changed, changed_project_ids
+from . import cpm, wbs
+from .models import Activity, ActivityDependency, ProgressLog, SiteProjectImage, SiteVisitor
+
+# Activity fields the forecast schedule depends on (sitemanage.cpm)
+SCHEDULE_FIELDS = ("planned_start", "planned_end", "actual_start", "actual_end", "progress_percent", "is_active")
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+@receiver(post_save, sender=SiteProjectImage)
+@receiver(post_delete, sender=SiteProjectImage)
+@receiver(post_save, sender=SiteVisitor)
+@receiver(post_delete, sender=SiteVisitor)
+def bump_version_for_project_rows(sender, instance, **kwargs):
+    """Invalidate cached project results (S-curve, ...) when site data changes."""
+    bump_project_version(instance.project_id)
+
+
+@receiver(post_save, sender=ProgressLog)
+@receiver(post_delete, sender=ProgressLog)
+def bump_version_for_progress_log(sender, instance, **kwargs):
+    bump_project_version(instance.activity.project_id)
+
+
+@receiver(active_changed, sender=Activity)
+@receiver(active_changed, sender=SiteProjectImage)
+@receiver(active_changed, sender=SiteVisitor)
+def bump_version_on_active_change(sender, pks, **kwargs):
+    for project_id in changed_project_ids(sender, pks):
+        bump_project_version(project_id)
+
+
+@receiver(active_changed, sender=ProgressLog)
+def sync_activities_on_active_change(sender, pks, **kwargs):
+    """Roll each activity to its latest active log (the save bumps the project version)."""
+    for activity in Activity.objects.filter(progress_logs__pk__in=pks).distinct():
+        activity.sync_progress()
+
+
+# ---------------- Work breakdown structure ----------------
+@receiver(pre_save, sender=Activity)
+def remember_stored_row(sender, instance, raw=False, **kwargs):
+    """The stored WBS and schedule fields, to tell what the save changes."""
+    instance._stored_row = (
+        Activity.objects.filter(pk=instance.pk).values("parent_id", *SCHEDULE_FIELDS).first()
+        if instance.pk and not raw else None
+    )
+
+
+@receiver(post_save, sender=Activity)
+def update_wbs_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_stored_row", None)
+    if created or before is None:
+        wbs.link(instance)
+        wbs.refresh_paths([instance.pk])
+    elif update_fields and set(update_fields) <= set(Activity.PROGRESS_FIELDS):
+        wbs.add_progress(instance, before["progress_percent"])
+    else:
+        if before["parent_id"] != instance.parent_id:
+            wbs.move(instance)
+        wbs.refresh_paths([instance.pk, before["parent_id"], instance.parent_id])
+
+
+@receiver(post_delete, sender=Activity)
+def refresh_wbs_on_delete(sender, instance, **kwargs):
+    wbs.refresh_paths([instance.parent_id])
+
+
+@receiver(active_changed, sender=Activity)
+def refresh_wbs_on_active_change(sender, pks, **kwargs):
+    parents = Activity.objects.filter(pk__in=pks).values_list("parent_id", flat=True)
+    wbs.refresh_paths([*pks, *parents])
+
+
+# ---------------- Critical path ----------------
+# Each change schedules one reschedule of its project after the commit: it
+# reloads the project and rebuilds the whole graph (sitemanage.cpm).
+@receiver(post_save, sender=Activity)
+def reschedule_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_stored_row", None)
+    if (
+        created or before is None
+        or before["is_active"] != instance.is_active or before["parent_id"] != instance.parent_id
+    ):
+        cpm.schedule_reschedule(instance.project_id)  # the set of leaves may have changed
+    elif any(before[name] != getattr(instance, name) for name in SCHEDULE_FIELDS):
+        cpm.schedule_reschedule(instance.project_id, [instance.pk])
+
+
+@receiver(active_changed, sender=Activity)
+def reschedule_on_active_change(sender, pks, **kwargs):
+    for project_id in changed_project_ids(sender, pks):
+        cpm.schedule_reschedule(project_id)
+
+
+@receiver(post_save, sender=ActivityDependency)
+@receiver(post_delete, sender=ActivityDependency)
+def reschedule_on_dependency_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    project_id = Activity.objects.filter(pk=instance.successor_id).values_list("project_id", flat=True).first()
+    if project_id:
+        cpm.schedule_reschedule(project_id, [instance.predecessor_id, instance.successor_id])
+
+
+@receiver(active_changed, sender=ActivityDependency)
+def reschedule_on_dependency_active_change(sender, pks, **kwargs):
+    links = ActivityDependency.objects.filter(pk__in=pks).values_list(
+        "successor__project_id", "predecessor_id", "successor_id"
+    )
+    changed = {}
+    for project_id, predecessor, successor in links:
+        changed.setdefault(project_id, set()).update((predecessor, successor))
+    for project_id, activity_ids in changed.items():
+        cpm.schedule_reschedule(project_id, activity_ids)
@@ -1,3 +1,170 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils import timezone
+
+from common.testing import TestCase, create_project
+
+from . import cpm, wbs
+from .forms import ProgressLogForm
+from .models import SUMMARY_LOG_ERROR, Activity, ActivityDependency, ProgressLog
+
+
+class CriticalPathTests(TestCase):
+    """
+    Plans start a month from today, so the data date holds nothing back:
+
+        A (5 days) -> B (3 days)      C (2 days), unlinked
+    """
+    nplusone_threshold = 30  # every activity save validates its foreign keys
+
+    def setUp(self):
+        super().setUp()
+        self.project = create_project("P-001")
+        self.user = User.objects.create_user("planner")
+        self.day0 = timezone.localdate() + timedelta(days=30)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a = self.activity("A", 0, 4)
+            self.b = self.activity("B", 0, 2)
+            self.c = self.activity("C", 0, 1)
+            self.link(self.a, self.b)
+
+    def day(self, offset):
+        return self.day0 + timedelta(days=offset)
+
+    def activity(self, name, start, end, **fields):
+        return Activity.objects.create(
+            project=self.project, name=name, planned_start=self.day(start), planned_end=self.day(end),
+            created_by=self.user, updated_by=self.user, **fields,
+        )
+
+    def link(self, predecessor, successor, **fields):
+        return ActivityDependency.objects.create(predecessor=predecessor, successor=successor, **fields)
+
+    def dates(self, activity):
+        activity.refresh_from_db()
+        return tuple(
+            (getattr(activity, field) - self.day0).days if getattr(activity, field) else None
+            for field in cpm.FIELDS
+        )
+
+    def test_forward_and_backward_pass(self):
+        self.assertEqual(self.dates(self.a), (0, 4, 0, 4))
+        self.assertEqual(self.dates(self.b), (5, 7, 5, 7))
+        self.assertEqual(self.dates(self.c), (0, 1, 6, 7))
+        self.assertEqual(list(cpm.critical_path(self.project)), [self.a, self.b])
+        self.assertEqual(cpm.forecast(self.project)[0], self.day(7))
+
+    def test_start_to_start_with_lag(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.link(self.a, self.c, dependency_type=ActivityDependency.START_TO_START, lag_days=2)
+        self.assertEqual(self.dates(self.c), (2, 3, 6, 7))
+
+    def test_started_activity_ignores_its_predecessors(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ProgressLog.objects.create(activity=self.b, date=timezone.localdate(), progress_percent=50)
+        # Half of 3 days left, counted from today
+        self.b.refresh_from_db()
+        self.assertEqual(self.b.early_start, timezone.localdate())
+        self.assertEqual(self.b.early_finish, timezone.localdate() + timedelta(days=1))
+
+    def test_incremental_passes_match_a_full_schedule(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            d = self.activity("D", 0, 9)  # longer than A -> B: the completion moves
+            self.link(self.c, d)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a.refresh_from_db()
+            self.a.planned_end = self.day(6)
+            self.a.save()
+        incremental = {activity.pk: self.dates(activity) for activity in (self.a, self.b, self.c, d)}
+        Activity.objects.update(early_start=None, early_finish=None, late_start=None, late_finish=None)
+        cpm.reschedule(self.project.pk)
+        self.assertEqual(incremental, {activity.pk: self.dates(activity) for activity in (self.a, self.b, self.c, d)})
+        self.assertEqual(incremental[d.pk], (2, 11, 2, 11))
+
+    def test_summary_spans_its_leaves(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            summary = self.activity("Substructure", 0, 100)  # its own plan is not scheduled
+            for child in (self.a, self.c):
+                child.refresh_from_db()
+                child.parent = summary
+                child.save()
+        self.assertEqual(self.dates(summary), (0, 4, 0, 7))
+        self.assertEqual(cpm.forecast(self.project)[0], self.day(7))
+        self.assertNotIn(summary, cpm.critical_path(self.project))
+
+    def test_reschedule_runs_once_after_the_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.a.refresh_from_db()
+            self.a.planned_end = self.day(5)
+            self.a.save()
+            self.c.refresh_from_db()
+            self.c.planned_end = self.day(3)
+            self.c.save()
+            self.assertEqual(self.dates(self.b), (5, 7, 5, 7))  # not yet
+        with mock.patch("sitemanage.cpm.reschedule", wraps=cpm.reschedule) as reschedule:
+            for callback in callbacks:
+                callback()
+        reschedule.assert_called_once_with(self.project.pk, {self.a.pk, self.c.pk})
+        self.assertEqual(self.dates(self.b), (6, 8, 6, 8))
+        self.assertEqual(self.dates(self.c), (0, 3, 5, 8))
+
+
+class WbsRollupTests(TestCase):
+    """Rollups kept by delta must match rebuild_wbs()."""
+    nplusone_threshold = 30  # every activity save validates its foreign keys
+
+    def setUp(self):
+        super().setUp()
+        self.project = create_project("P-001")
+        self.user = User.objects.create_superuser("planner")
+        # Building > Substructure > Footings
+        self.building = self.activity("Building")
+        self.substructure = self.activity("Substructure", parent=self.building)
+        self.footings = self.activity("Footings", parent=self.substructure)
+
+    def activity(self, name, **fields):
+        return Activity.objects.create(
+            project=self.project, name=name, planned_start=date(2025, 2, 1), planned_end=date(2025, 2, 10),
+            created_by=self.user, updated_by=self.user, **fields,
+        )
+
+    def rollups(self):
+        return {
+            activity.pk: (activity.rollup_weight, activity.rollup_earned, activity.wbs_level)
+            for activity in Activity.objects.filter(project=self.project)
+        }
+
+    def assertMatchesRebuild(self):
+        kept = self.rollups()
+        wbs.rebuild_wbs([self.project.pk])
+        self.assertEqual(kept, self.rollups())
+
+    def test_progress_under_a_deactivated_summary(self):
+        Activity.objects.filter(pk=self.substructure.pk).soft_delete()
+        ProgressLog.objects.create(activity=self.footings, date=date(2025, 2, 5), progress_percent=40)
+        self.assertMatchesRebuild()
+        self.building.refresh_from_db()
+        self.assertLessEqual(self.building.rollup_percent, 100)
+
+    def test_deleting_a_summary_deletes_its_sub_activities(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("sitemanage:activity_delete", args=[self.substructure.pk]))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            set(Activity.objects.filter(is_active=False).values_list("pk", flat=True)),
+            {self.substructure.pk, self.footings.pk},
+        )
+        self.assertMatchesRebuild()
+
+    def test_progress_refused_on_a_summary(self):
+        with self.assertRaises(ValidationError):
+            ProgressLog.objects.create(activity=self.substructure, date=date(2025, 2, 5), progress_percent=40)
+        form = ProgressLogForm(
+            {"date": "2025-02-05", "progress_percent": 40}, instance=ProgressLog(activity=self.substructure)
+        )
+        self.assertEqual(form.errors.get("__all__"), [SUMMARY_LOG_ERROR])
+        self.assertFalse(ProgressLog.objects.exists())
@@ -3,12 +3,11 @@ from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.core.paginator import Paginator
+from common.pagination import KeysetPaginator
 from django.db.models import Max, Q
 from django.contrib.auth.decorators import login_required, permission_required
-import io
+from django.utils import timezone
 from django.http import HttpResponse
-from django.template.loader import get_template
-from weasyprint import CSS, HTML
 from django.template.loader import render_to_string
 from projects.models import Project
 from sitemanage.models import Activity, ProgressLog, SiteProjectImage, SiteVisitor
@@ -21,9 +20,8 @@ logger = logging.getLogger(__name__)
 def get_allowed_projects(user):
     """Return queryset of projects the user is allowed to see."""
     if user.is_superuser or user.is_staff:
-        return Project.objects.filter(is_active=True)
-    return Project.objects.filter(
-        is_active=True,
+        return Project.active.all()
+    return Project.active.filter(
         participants__user=user,
         participants__is_active=True
     ).distinct()
@@ -52,10 +50,14 @@ def site_overview(request):
             status = form.cleaned_data.get('status')
 
             projects = [selected_project] if selected_project else []
+            summaries = {
+                summary["project"].id: summary
+                for summary in get_project_site_overview(projects)
+            }
 
             for project in projects:
                 # Filter activities
-                activities = project.activities.filter(is_active=True)
+                activities = project.activities.active()
                 if activity_start:
                     activities = activities.filter(planned_start__gte=activity_start)
                 if activity_end:
@@ -63,26 +65,17 @@ def site_overview(request):
                 if status:
                     activities = activities.filter(status=status)
 
-                # Attach latest log to each activity
-                activities_with_logs = []
-                for a in activities:
-                    latest_log = a.progress_logs.filter(is_active=True).order_by('-date').first()
-                    activities_with_logs.append({
-                        'activity': a,
-                        'latest_log': latest_log
-                    })
-
                 # Visitors & images
-                visitors = project.site_visitors.filter(is_active=True)
-                images = project.project_images.filter(
+                visitors = project.site_visitors.active()
+                images = project.project_images.active().filter(
                     project=project,
                     activity__in=activities,
-                    is_active=True
                 ).select_related("activity")
 
                 project_data.append({
                     'project': project,
-                    'activities': activities_with_logs,
+                    'summary': summaries[project.id],
+                    'activities': activities,
                     'visitors': visitors,
                     'images': images
                 })
@@ -116,9 +109,9 @@ def site_overview(request):
 def activity_list(request):
     search = request.GET.get('q', '').strip()
     status = request.GET.get('status', '').strip()
-    page_number = request.GET.get('page')
+    cursor = request.GET.get('cursor')
 
-    activities = Activity.objects.filter(is_active=True).select_related('project', 'category')
+    activities = Activity.active.select_related('project', 'category')
     activities = filter_by_allowed_projects(activities, request.user)
 
     if search:
@@ -130,8 +123,8 @@ def activity_list(request):
     if status:
         activities = activities.filter(status=status)
 
-    paginator = Paginator(activities.order_by('-id'), 10)
-    page_obj = paginator.get_page(page_number)
+    paginator = KeysetPaginator(activities, ('-id',), 10)
+    page_obj = paginator.get_page(cursor)
 
     return render(request, 'sitemanage/activity_list.html', {
         "activities": page_obj,
@@ -143,7 +136,7 @@ def activity_list(request):
 @login_required
 @permission_required('sitemanage.view_activity', raise_exception=True)
 def activity_detail(request, pk):
-    activity = get_object_or_404(filter_by_allowed_projects(Activity.objects.filter(is_active=True), request.user), pk=pk)
+    activity = get_object_or_404(filter_by_allowed_projects(Activity.active.all(), request.user), pk=pk)
     return render(request, 'sitemanage/activity_detail.html', {
         "page_title": f"Activity Detail: {activity.name}",
         "activity": activity
@@ -176,7 +169,7 @@ def activity_create(request):
 @login_required
 @permission_required('sitemanage.change_activity', raise_exception=True)
 def activity_update(request, pk):
-    activity = get_object_or_404(filter_by_allowed_projects(Activity.objects.filter(is_active=True), request.user), pk=pk)
+    activity = get_object_or_404(filter_by_allowed_projects(Activity.active.all(), request.user), pk=pk)
     allowed_projects = get_allowed_projects(request.user)
     form = ActivityForm(request.POST or None, instance=activity)
     form.fields['project'].queryset = allowed_projects
@@ -198,15 +191,17 @@ def activity_update(request, pk):
 @login_required
 @permission_required('sitemanage.delete_activity', raise_exception=True)
 def activity_delete(request, pk):
-    activity = get_object_or_404(filter_by_allowed_projects(Activity.objects.filter(is_active=True), request.user), pk=pk)
+    activity = get_object_or_404(filter_by_allowed_projects(Activity.active.all(), request.user), pk=pk)
+    # A summary activity goes with its sub-activities
+    subtree = Activity.active.subtree(activity)
     if request.method == "POST":
-        activity.is_active = False  # soft delete
-        activity.save()
+        subtree.soft_delete()
         messages.success(request, f"Activity {activity.name} deleted successfully!")
         return redirect('sitemanage:activity_list')
 
     return render(request, 'sitemanage/activity_confirm_delete.html', {
         "activity": activity,
+        "sub_activities": subtree.exclude(pk=activity.pk).count(),
         "page_title": f"Delete Activity: {activity.name}"
     })
 
@@ -215,16 +210,16 @@ def activity_delete(request, pk):
 @login_required
 @permission_required('sitemanage.view_progresslog', raise_exception=True)
 def progress_log_list(request, activity_id):
-    activity = get_object_or_404(filter_by_allowed_projects(Activity.objects.filter(is_active=True), request.user), pk=activity_id)
-    logs = activity.progress_logs.filter(is_active=True)
+    activity = get_object_or_404(filter_by_allowed_projects(Activity.active.all(), request.user), pk=activity_id)
+    logs = activity.progress_logs.active()
 
-    last_log = logs.order_by('-date').first()
-    is_completed = last_log and last_log.progress_percent == 100
+    is_completed = activity.progress_percent == 100
 
     return render(request, 'sitemanage/progress_log_list.html', {
         'activity': activity,
         'logs': logs.order_by('-date'),
         'is_completed': is_completed,
+        'is_summary': activity.has_active_children(),
     })
 
 
@@ -232,7 +227,7 @@ def progress_log_list(request, activity_id):
 @permission_required('sitemanage.add_progresslog', raise_exception=True)
 def progress_log_create(request, activity_id):
     activity = get_object_or_404(
-        filter_by_allowed_projects(Activity.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(Activity.active.all(), request.user),
         pk=activity_id
     )
 
@@ -262,7 +257,7 @@ def progress_log_create(request, activity_id):
 def progress_log_update(request, pk):
     # Only get logs for activities the user has access to
     log = get_object_or_404(
-        ProgressLog.objects.filter(is_active=True),
+        ProgressLog.active,
         pk=pk
     )
 
@@ -299,13 +294,12 @@ def progress_log_update(request, pk):
 def progress_log_delete(request, pk):
     log = get_object_or_404(
     filter_by_allowed_projects(
-        ProgressLog.objects.filter(is_active=True),
+        ProgressLog.active.all(),
         request.user
     ),
     pk=pk
     )
-    last_log = log.activity.progress_logs.filter(is_active=True).order_by('-date').first()
-    if last_log and last_log.progress_percent == 100:
+    if log.activity.progress_percent == 100:
         messages.error(request, "Completed activities cannot be deleted.")
         return redirect('sitemanage:progress_log_list', activity_id=log.activity.id)
 
@@ -327,7 +321,7 @@ def site_visitor_list(request):
     search = request.GET.get("q", "").strip()
 
     # Base queryset with project access control
-    qs = SiteVisitor.objects.filter(is_active=True).select_related("project")
+    qs = SiteVisitor.active.select_related("project")
     qs = filter_by_allowed_projects(qs, request.user)
 
     if search:
@@ -336,8 +330,8 @@ def site_visitor_list(request):
             Q(project__project_name__icontains=search)
         )
 
-    paginator = Paginator(qs.order_by("-visit_date"), 10)
-    visitors = paginator.get_page(request.GET.get("page"))
+    paginator = KeysetPaginator(qs, ("-visit_date", "-id"), 10)
+    visitors = paginator.get_page(request.GET.get("cursor"))
 
     return render(request, "sitemanage/site_visitor_list.html", {
         "visitors": visitors,
@@ -383,7 +377,7 @@ def site_visitor_edit(request, pk):
     # Secure object access
     visitor = get_object_or_404(
         filter_by_allowed_projects(
-            SiteVisitor.objects.filter(is_active=True),
+            SiteVisitor.active.all(),
             request.user
         ),
         pk=pk
@@ -419,7 +413,7 @@ def site_visitor_edit(request, pk):
 def site_visitor_delete(request, pk):
     visitor = get_object_or_404(
         filter_by_allowed_projects(
-            SiteVisitor.objects.filter(is_active=True),
+            SiteVisitor.active.all(),
             request.user
         ),
         pk=pk
@@ -427,7 +421,7 @@ def site_visitor_delete(request, pk):
 
     if request.method == "POST":
         visitor.is_active = False
-        visitor.save(update_fields=["is_active"])
+        visitor.save(update_fields=["is_active", "updated_at"])
 
         messages.success(
             request,
@@ -447,9 +441,7 @@ def site_visitor_delete(request, pk):
 def site_project_image_list(request):
     search = request.GET.get("q", "").strip()
 
-    qs = SiteProjectImage.objects.filter(
-        is_active=True
-    ).select_related("project", "activity")
+    qs = SiteProjectImage.active.select_related("project", "activity")
 
     qs = filter_by_allowed_projects(qs, request.user)
 
@@ -497,15 +489,14 @@ def site_project_image_list(request):
 @permission_required("sitemanage.view_siteprojectimage", raise_exception=True)
 def site_project_image_detail(request, pk):
     image_obj = get_object_or_404(
-        SiteProjectImage.objects.filter(is_active=True),
+        SiteProjectImage.active,
         pk=pk
     )
 
-    images = SiteProjectImage.objects.filter(
+    images = SiteProjectImage.active.filter(
         project=image_obj.project,
         activity=image_obj.activity,
         image_date=image_obj.image_date,
-        is_active=True
     ).order_by("-created_at")
 
     return render(request, "sitemanage/site_project_image_detail.html", {
@@ -579,9 +570,8 @@ def ajax_load_activities(request):
     project_id = request.GET.get("project_id")
     selected_activity = request.GET.get("selected_activity")
 
-    activities = Activity.objects.filter(
+    activities = Activity.active.filter(
         project_id=project_id,
-        is_active=True
     ).order_by("planned_start")
 
     return render(
@@ -597,15 +587,14 @@ def ajax_load_activities(request):
 @login_required
 @permission_required("sitemanage.change_siteprojectimage", raise_exception=True)
 def site_project_image_edit(request, pk):
-    image_obj = get_object_or_404(SiteProjectImage.objects.filter(is_active=True), pk=pk)
+    image_obj = get_object_or_404(SiteProjectImage.active, pk=pk)
     allowed_projects = get_allowed_projects(request.user)
 
-    batch_images = SiteProjectImage.objects.filter(
+    batch_images = SiteProjectImage.active.filter(
         project=image_obj.project,
         activity=image_obj.activity,
         figure_name=image_obj.figure_name,
         image_date=image_obj.image_date,
-        is_active=True
     )
 
     if request.method == "POST":
@@ -619,7 +608,7 @@ def site_project_image_edit(request, pk):
                 "figure_name": form.cleaned_data["figure_name"],
                 "image_date": form.cleaned_data["image_date"],
             }
-            batch_images.update(**batch_data)
+            batch_images.update(**batch_data, updated_at=timezone.now())
 
             success_count = 0
             for img in new_images:
@@ -663,22 +652,21 @@ def site_project_image_edit(request, pk):
 def site_project_image_delete(request, pk):
     # Get the selected image
     image_obj = get_object_or_404(
-        filter_by_allowed_projects(SiteProjectImage.objects.filter(is_active=True), request.user),
+        filter_by_allowed_projects(SiteProjectImage.active.all(), request.user),
         pk=pk
     )
 
     # Find all images in the same batch (project + figure_name + image_date)
-    batch_images = SiteProjectImage.objects.filter(
+    batch_images = SiteProjectImage.active.filter(
         project=image_obj.project,
         activity=image_obj.activity,
         figure_name=image_obj.figure_name,
         image_date=image_obj.image_date,
-        is_active=True
     )
 
     if request.method == "POST":
         # Soft-delete all images in the batch
-        batch_images.update(is_active=False)
+        batch_images.soft_delete()
         messages.success(request, f'All images for "{image_obj.figure_name}" in project "{image_obj.project.project_name}" on {image_obj.image_date} were deleted successfully.')
         return redirect("sitemanage:site_project_image_list")
 
@@ -0,0 +1,210 @@
+"""
+Work breakdown structure (WBS) of activities.
+
+Activity.parent builds the tree. ActivityClosure holds one row per
+ancestor/descendant pair (and each activity with itself at depth 0), so a
+subtree, a depth-limited listing or the path to the top is one indexed
+query (Activity.objects.subtree(), .ancestors()).
+
+Progress is logged against leaf activities (no active children). Every
+activity keeps the weighted progress of the active leaves below it:
+rollup_weight is the sum of their effective weights and rollup_earned the
+sum of weight x progress, so rollup_percent of any node is read from its own
+row:
+
+- a progress change on a leaf (a log added, edited or removed) adds
+  weight x change to the leaf and all its ancestors with one UPDATE through
+  the closure table (its path is recomputed instead when an ancestor is
+  deactivated);
+- any other save of an activity (created, moved, re-weighted, re-planned,
+  deactivated or restored) relinks its closure rows when the parent changed
+  and recomputes the rollups on the old and new paths;
+- bulk updates that bypass save() call refresh_paths() with the changed ids;
+  rebuild_wbs() recomputes everything from the parent pointers
+  (manage.py rebuild_wbs).
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Sum
+
+from .models import Activity, ActivityClosure
+
+ZERO = Decimal("0")
+
+
+def _active_children(ref="pk"):
+    return Exists(Activity.objects.filter(parent=OuterRef(ref), is_active=True))
+
+
+def own_rollup(activity):
+    """(weight, weight x progress) of an activity counted as a leaf."""
+    if not activity.is_active:
+        return ZERO, ZERO
+    weight = Decimal(activity.effective_weight)
+    return weight, weight * activity.progress_percent
+
+
+# ---------------- Closure rows ----------------
+def link(activity):
+    """Closure rows of a new activity: itself and every ancestor of its parent."""
+    above = list(
+        ActivityClosure.objects.filter(descendant_id=activity.parent_id).values_list("ancestor_id", "depth")
+    ) if activity.parent_id else []
+    ActivityClosure.objects.bulk_create(
+        [ActivityClosure(ancestor_id=activity.pk, descendant_id=activity.pk, depth=0)]
+        + [ActivityClosure(ancestor_id=ancestor, descendant_id=activity.pk, depth=depth + 1) for ancestor, depth in above]
+    )
+
+
+def move(activity):
+    """Relink the activity's subtree under its (new) parent and shift the levels below it."""
+    subtree = list(ActivityClosure.objects.filter(ancestor_id=activity.pk).values_list("descendant_id", "depth"))
+    subtree_ids = [descendant for descendant, _depth in subtree]
+    old_level = ActivityClosure.objects.filter(descendant_id=activity.pk).count()
+    above = list(
+        ActivityClosure.objects.filter(descendant_id=activity.parent_id).values_list("ancestor_id", "depth")
+    ) if activity.parent_id else []
+
+    with transaction.atomic():
+        ActivityClosure.objects.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+        ActivityClosure.objects.bulk_create([
+            ActivityClosure(ancestor_id=ancestor, descendant_id=descendant, depth=up + down + 1)
+            for ancestor, up in above
+            for descendant, down in subtree
+        ])
+        shift = len(above) + 1 - old_level
+        if shift:
+            Activity.objects.filter(pk__in=subtree_ids).update(wbs_level=F("wbs_level") + shift)
+
+
+# ---------------- Rollups ----------------
+def add_progress(activity, previous_percent):
+    """Leaf progress moved from `previous_percent`: one UPDATE of the leaf and its ancestors."""
+    change = activity.progress_percent - previous_percent
+    if not change or not activity.is_active:
+        return
+    if Activity.objects.filter(parent=activity.pk, is_active=True).exists():
+        return  # a summary activity: its own progress is not rolled up
+    above = ActivityClosure.objects.filter(descendant_id=activity.pk)
+    if above.filter(depth__gt=0, ancestor__is_active=False).exists():
+        # Under a deactivated summary: an ancestor above it may count as a
+        # leaf, so the path is recomputed instead of taking the delta
+        refresh_paths([activity.pk])
+        return
+    Activity.objects.filter(pk__in=above.values("ancestor_id")).update(
+        rollup_earned=F("rollup_earned") + Decimal(activity.effective_weight) * change
+    )
+
+
+def refresh_rollups(activities):
+    """
+    Recompute level and rollup of the given activities (a queryset): leaves
+    from their own progress first, then the others from the leaves below.
+    """
+    nodes = list(activities.annotate(has_children=_active_children()).only(
+        "id", "weight", "planned_start", "planned_end", "progress_percent", "is_active",
+    ))
+    if not nodes:
+        return 0
+    ids = [node.pk for node in nodes]
+    levels = dict(
+        ActivityClosure.objects.filter(descendant_id__in=ids).values_list("descendant_id")
+        .annotate(count=Count("id")).order_by()
+    )
+    leaves = [node for node in nodes if not node.has_children]
+    for node in leaves:
+        node.rollup_weight, node.rollup_earned = own_rollup(node)
+        node.wbs_level = levels.get(node.pk, 1)
+
+    with transaction.atomic():
+        Activity.objects.bulk_update(leaves, ["rollup_weight", "rollup_earned", "wbs_level"], batch_size=500)
+
+        summaries = [node for node in nodes if node.has_children]
+        sums = {
+            ancestor: (weight or ZERO, earned or ZERO)
+            for ancestor, weight, earned in ActivityClosure.objects.filter(
+                ancestor_id__in=[node.pk for node in summaries], depth__gt=0, descendant__is_active=True,
+            ).filter(~_active_children("descendant_id")).values_list("ancestor_id").annotate(
+                weight=Sum("descendant__rollup_weight"), earned=Sum("descendant__rollup_earned"),
+            ).order_by()
+        }
+        for node in summaries:
+            node.rollup_weight, node.rollup_earned = sums.get(node.pk, (ZERO, ZERO))
+            node.wbs_level = levels.get(node.pk, 1)
+        Activity.objects.bulk_update(summaries, ["rollup_weight", "rollup_earned", "wbs_level"], batch_size=500)
+    return len(nodes)
+
+
+def refresh_paths(activity_ids):
+    """Recompute the rollups of the given activities and of all their ancestors."""
+    activity_ids = {activity_id for activity_id in activity_ids if activity_id}
+    if not activity_ids:
+        return 0
+    on_paths = ActivityClosure.objects.filter(descendant_id__in=activity_ids).values("ancestor_id")
+    return refresh_rollups(Activity.objects.filter(pk__in=on_paths))
+
+
+# ---------------- Full rebuild ----------------
+def rebuild_wbs(project_ids=None):
+    """
+    Rebuild closure rows, levels and rollups from Activity.parent for the
+    given projects (all by default). Returns the number of activities.
+    """
+    activities = Activity.objects.all()
+    if project_ids is not None:
+        activities = activities.filter(project_id__in=project_ids)
+    parents = dict(activities.values_list("pk", "parent_id"))
+
+    rows = []
+    for activity_id in parents:
+        node, depth, seen = activity_id, 0, set()
+        while node and node not in seen:
+            seen.add(node)
+            rows.append(ActivityClosure(ancestor_id=node, descendant_id=activity_id, depth=depth))
+            node, depth = parents.get(node), depth + 1
+
+    with transaction.atomic():
+        ActivityClosure.objects.filter(descendant_id__in=list(parents)).delete()
+        ActivityClosure.objects.bulk_create(rows, batch_size=1000)
+        refresh_rollups(activities)
+    return len(parents)
+
+
+# ---------------- Report grouping ----------------
+def group_by_level(rows, level, key=lambda row: row.id):
+    """
+    Group report rows (activities, as-of activities or snapshot rows) under
+    their WBS ancestor at `level`; an activity above that level heads its own
+    group. Returns [(heading, leaf rows, weighted progress %)] in planned
+    order. The progress is rolled up from the rows' own progress_percent, so
+    past values (sitemanage.asof, progress snapshots) roll up the same way.
+    """
+    ids = [key(row) for row in rows if key(row)]
+    heads = {}
+    links = (
+        ActivityClosure.objects.filter(descendant_id__in=ids, ancestor__wbs_level__lte=level)
+        .select_related("ancestor").order_by("descendant_id", "-ancestor__wbs_level")
+    )
+    for link_row in links:
+        heads.setdefault(link_row.descendant_id, link_row.ancestor)
+    weights = {
+        activity.pk: Decimal(activity.effective_weight)
+        for activity in Activity.objects.filter(pk__in=ids).leaves().only("id", "weight", "planned_start", "planned_end")
+    }
+
+    groups = {}
+    for row in rows:
+        activity_id = key(row)
+        if activity_id and activity_id not in weights:
+            continue  # a summary activity: shown through its group's rollup
+        head = heads.get(activity_id)
+        groups.setdefault(head, []).append(row)
+
+    result = []
+    for head in sorted(groups, key=lambda head: (head is None, head and head.planned_start, head and head.name)):
+        members = groups[head]
+        total = sum(weights.get(key(row), Decimal(1)) for row in members)
+        earned = sum(weights.get(key(row), Decimal(1)) * row.progress_percent for row in members)
+        result.append((head.name if head else "Removed activities", members, round(earned / total) if total else 0))
+    return result
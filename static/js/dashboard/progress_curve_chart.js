@@ -0,0 +1,32 @@
+const curves = JSON.parse(document.getElementById("progress-curves").textContent);
+const projectSelect = document.getElementById("progressCurveProject");
+
+const progressCurveChart = new Chart(document.getElementById("progressCurveChart"), {
+  type: "line",
+  data: {
+    labels: [],
+    datasets: [
+      { label: "Planned %", data: [], borderColor: "#2563eb", pointRadius: 0, tension: 0.2 },
+      { label: "Actual %", data: [], borderColor: "#16a34a", pointRadius: 0, tension: 0.2 }
+    ]
+  },
+  options: {
+    responsive: true,
+    scales: { y: { min: 0, max: 100 } },
+    plugins: {
+      legend: { position: "bottom" }
+    }
+  }
+});
+
+function showCurve(index) {
+  const curve = curves[index];
+  if (!curve) return;
+  progressCurveChart.data.labels = curve.weeks;
+  progressCurveChart.data.datasets[0].data = curve.planned;
+  progressCurveChart.data.datasets[1].data = curve.actual;
+  progressCurveChart.update();
+}
+
+projectSelect.addEventListener("change", () => showCurve(projectSelect.value));
+showCurve(0);